@@ -1,18 +1,43 @@
+import atexit
+import os
 import streamlit as st
 import numpy as np
 import pandas as pd
-import folium
 import time
-import math
-import random
 from datetime import datetime, timedelta
-from streamlit_folium import folium_static
 import matplotlib.pyplot as plt
 import base64
 from io import BytesIO
 import altair as alt
+import streamlit.components.v1 as components
 from PIL import Image
-from geopy.distance import geodesic
+from fisherlink.alerts import EMERGENCY, INFO, SEVERITIES, WARNING, AlertEngine, AlertStore
+from fisherlink.archive import TrackArchive
+from fisherlink.broadcast import Broadcaster, FakeVessels
+from fisherlink.cards import CARDS_PER_PAGE, HtmlCache, card_grid_html, card_html, page_count
+from fisherlink.deckmap import fleet_deck, selected_vessel
+from fisherlink.forecast import forecast_fleet
+from fisherlink.livemap import MapDeltaFeed, live_map
+from fisherlink.geo import COASTAL_COORDS
+from fisherlink.geofence import default_geofence
+from fisherlink.fleet import risk_band
+from fisherlink.fleetindex import RISK_BANDS, FleetIndex, NameIndex
+from fisherlink.mapview import (
+    MINI_MAP_ZOOM,
+    TRAIL_LENGTH,
+    base_map_html,
+    compose_map_html,
+    popup_html,
+    trajectory_map_html,
+    vessel_layer_script,
+)
+from fisherlink.refresh import REFRESH_WAIT_S, RefreshMonitor
+from fisherlink.regions import CoastalSegment, PolygonRegion, RadiusRegion, VesselIndex
+from fisherlink.risk import load_risk_model
+from fisherlink.service import FleetService
+from fisherlink.simplify import TrackCache
+from fisherlink.stats import RISK_CATEGORIES
+from fisherlink.telemetry import FakeTransport, MqttTransport, TelemetryIngestor
 
 # Set page configuration
 st.set_page_config(
@@ -217,448 +242,234 @@ with col2:
     logo_url = "https://cdn-icons-png.flaticon.com/128/1397/1397519.png"
     st.image(logo_url, width=100)
 
-# Coastal coordinates (refined to better match OpenStreetMap purple boundary)
-COASTAL_COORDS = [
-    (13.1600, 80.3000), # Northern point near Chennai
-    (13.0827, 80.2707), # Chennai
-    (13.0500, 80.2800),
-    (13.0000, 80.2900),
-    (12.9500, 80.3000),
-    (12.9000, 80.3100),
-    (12.8500, 80.3200),
-    (12.8000, 80.3300),
-    (12.7500, 80.3400),
-    (12.7000, 80.3500),
-    (12.6500, 80.3600),
-    (12.6000, 80.3700),
-    (12.5500, 80.3800),
-    (12.5000, 80.3900),
-    (12.4500, 80.3900),
-    (12.4000, 80.3800),
-    (12.3500, 80.3600),
-    (12.3000, 80.3400),
-    (12.2500, 80.3200),
-    (12.2000, 80.3000),
-    (12.1500, 80.2800),
-    (12.1000, 80.2600),
-    (12.0500, 80.2400),
-    (12.0000, 80.2200),
-    (11.9500, 80.1000),
-    (11.9300, 79.8300), # Pondicherry
-]
-
-# Calculate geofence points (30km from shore)
-def calculate_geofence_point(lat, lon, distance_km, bearing_deg):
-    earth_radius = 6371.0  # Earth radius in kilometers
-    
-    # Convert to radians
-    lat_rad = math.radians(lat)
-    lon_rad = math.radians(lon)
-    bearing_rad = math.radians(bearing_deg)
-    
-    # Calculate new latitude
-    new_lat_rad = math.asin(
-        math.sin(lat_rad) * math.cos(distance_km / earth_radius) +
-        math.cos(lat_rad) * math.sin(distance_km / earth_radius) * math.cos(bearing_rad)
-    )
-    
-    # Calculate new longitude
-    new_lon_rad = lon_rad + math.atan2(
-        math.sin(bearing_rad) * math.sin(distance_km / earth_radius) * math.cos(lat_rad),
-        math.cos(distance_km / earth_radius) - math.sin(lat_rad) * math.sin(new_lat_rad)
-    )
-    
-    # Convert back to degrees
-    new_lat = math.degrees(new_lat_rad)
-    new_lon = math.degrees(new_lon_rad)
-    
-    return (new_lat, new_lon)
-
-# Calculate geofence boundaries
-def calculate_geofence_boundaries():
-    geofence_points = []
-    
-    for coord in COASTAL_COORDS:
-        # For the eastern coast of India, the sea is generally to the east (90°)
-        sea_bearing = 90  # East
-        
-        # Calculate point 30km out to sea
-        geofence_point = calculate_geofence_point(coord[0], coord[1], 30, sea_bearing)
-        geofence_points.append(geofence_point)
-    
-    return geofence_points
-
-# Get geofence points
-GEOFENCE_POINTS = calculate_geofence_boundaries()
+# Track archive on disk, shared by every session. Compaction and retention run on the archive's
+# own maintenance thread, off the simulation tick; buffered rows are flushed on exit.
+@st.cache_resource
+def get_track_archive():
+    archive = TrackArchive().start()
+    atexit.register(archive.close)
+    return archive
 
-# Generate sample boats with realistic names
-def generate_boats(num_boats=10):
-    boat_names = [
-        "Sea Explorer", "Coastal Fisher", "Ocean Voyager", "Bay Catcher", 
-        "Wave Rider", "Deep Blue", "Sea Harvester", "Marine Master",
-        "Aqua Venture", "Tide Chaser", "Chennai Fisher", "Tamil Mariner",
-        "Gulf Voyager", "Bay Watcher", "Seaside Worker", "Coastal Guard",
-        "Blue Waters", "Marina Fisher", "Bay Navigator", "Sea Pearl"
-    ]
-    
-    boats = []
-    for i in range(num_boats):
-        # Generate initial positions close to shore
-        shore_idx = random.randint(0, len(COASTAL_COORDS) - 1)
-        shore_point = COASTAL_COORDS[shore_idx]
-        
-        # Random distance from shore (0-25 km)
-        distance = random.uniform(0, 25)
-        # Random bearing (45-135 degrees, roughly east with variation)
-        bearing = random.uniform(45, 135)
-        
-        initial_pos = calculate_geofence_point(shore_point[0], shore_point[1], distance, bearing)
-        
-        speed = random.uniform(5, 15)
-        heading = random.uniform(0, 360)
-        crew_size = random.randint(3, 10)
-        operation_time = random.randint(1, 12)
-        fish_caught = random.uniform(0, 1000)
-        risk_level = random.uniform(0, 0.5)  # Start with low to medium risk
-        fuel_level = random.uniform(50, 100)
-        
-        boat = {
-            "id": i + 1,
-            "name": boat_names[i % len(boat_names)] + f"-{i+1}",
-            "lat": initial_pos[0],
-            "lon": initial_pos[1],
-            "speed": speed,
-            "heading": heading,
-            "crew_size": crew_size,
-            "operation_time": operation_time,
-            "fish_caught": fish_caught,
-            "risk_level": risk_level,
-            "fuel_level": fuel_level,
-            "engine_status": "Normal",
-            "communication_status": "Active",
-            "safety_status": "Safe",
-            "last_update": datetime.now().strftime("%H:%M:%S"),
-            "history": {
-                "positions": [(initial_pos[0], initial_pos[1])],
-                "risk_levels": [risk_level],
-                "timestamps": [datetime.now().strftime("%H:%M:%S")],
-            }
-        }
-        boats.append(boat)
-    
-    return boats
+# One bounded alert log per process: vessel alerts from the engine plus SOS and operator alerts
+@st.cache_resource
+def get_alert_store():
+    return AlertStore()
 
-# Calculate distance to nearest shore point
-def distance_to_shore(lat, lon):
-    min_distance = float('inf')
-    for coord in COASTAL_COORDS:
-        distance = geodesic((lat, lon), coord).kilometers
-        if distance < min_distance:
-            min_distance = distance
-    return min_distance
+# Broker connection shared by telemetry and alert broadcasts; None unless FISHERLINK_MQTT_HOST is set
+@st.cache_resource
+def get_mqtt_transport():
+    mqtt_host = os.environ.get("FISHERLINK_MQTT_HOST")
+    if not mqtt_host:
+        return None
+    transport = MqttTransport(mqtt_host, int(os.environ.get("FISHERLINK_MQTT_PORT", 1883))).start()
+    atexit.register(transport.close)
+    return transport
 
-# Calculate distance to geofence
-def distance_to_geofence(lat, lon):
-    # Find closest shore point
-    closest_shore_idx = 0
-    min_distance = float('inf')
-    
-    for i, coord in enumerate(COASTAL_COORDS):
-        distance = geodesic((lat, lon), coord).kilometers
-        if distance < min_distance:
-            min_distance = distance
-            closest_shore_idx = i
-            
-    # Get corresponding geofence point
-    if closest_shore_idx < len(GEOFENCE_POINTS):
-        geofence_point = GEOFENCE_POINTS[closest_shore_idx]
-        shore_point = COASTAL_COORDS[closest_shore_idx]
-        
-        # If boat is between shore and geofence point
-        boat_to_shore = geodesic((lat, lon), shore_point).kilometers
-        geofence_to_shore = geodesic(geofence_point, shore_point).kilometers
-        
-        if boat_to_shore <= geofence_to_shore:
-            # Return distance to geofence boundary (negative is inside, positive is outside)
-            return geofence_to_shore - boat_to_shore
-    
-    # If we can't determine it precisely, use the closest shore point + 30km as approximation
-    return 30 - min_distance
+# One simulation per process, ticking in the background; sessions only read its snapshots.
+# Set FISHERLINK_MQTT_HOST to drive the fleet from vessel telemetry instead of the simulator.
+# The fleet holds vessels 1..FISHERLINK_FLEET_SIZE; telemetry from any other id is counted as unknown.
+@st.cache_resource
+def get_fleet_service():
+    fleet_size = int(os.environ.get("FISHERLINK_FLEET_SIZE", 15))
+    alerts = AlertEngine(get_alert_store())
+    # "baseline" (the weighted formula), "logistic" (the shipped trained model) or a model JSON path.
+    # The risk bands, safety and engine rules and alert thresholds are calibrated for the baseline
+    # score; the logistic model outputs an incident probability on a different scale.
+    risk_model = load_risk_model(os.environ.get("FISHERLINK_RISK_MODEL", "baseline"))
+    transport = get_mqtt_transport()
+    if transport is not None:
+        service = FleetService(fleet_size, archive=get_track_archive(), ingestor=TelemetryIngestor(transport),
+                               simulate=False, interval_s=1.0, risk_model=risk_model, alerts=alerts)
+    else:
+        service = FleetService(fleet_size, archive=get_track_archive(), risk_model=risk_model,
+                               alerts=alerts)
+    atexit.register(service.stop)
+    return service.start()
 
-# Update boat positions with natural movement patterns
-def update_boat_positions(boats):
-    for boat in boats:
-        # Update heading with small random changes to simulate natural drift and steering
-        heading_change = random.uniform(-15, 15)
-        boat["heading"] = (boat["heading"] + heading_change) % 360
-        
-        # Update speed with small random changes
-        speed_change = random.uniform(-0.5, 0.5)
-        boat["speed"] = max(0.5, min(20, boat["speed"] + speed_change))
-        
-        # Calculate new position based on heading and speed
-        speed_kmh = boat["speed"] * 1.852
-        
-        # Distance traveled in 1 minute (assuming update interval is 1 minute)
-        distance_km = speed_kmh / 60
-        
-        # Update position
-        new_pos = calculate_geofence_point(boat["lat"], boat["lon"], distance_km, boat["heading"])
-        boat["lat"], boat["lon"] = new_pos
-        
-        # Update operation time
-        boat["operation_time"] += 1/60  # Add 1 minute
-        
-        # Update fish caught with some randomness
-        if random.random() < 0.3:  # 30% chance of catching fish in this update
-            boat["fish_caught"] += random.uniform(0, 5)  # 0-5 kg per catch
-            
-        # Update fuel level (decreasing over time)
-        fuel_decrease = random.uniform(0.05, 0.15)  # 0.05-0.15% decrease per minute
-        boat["fuel_level"] = max(0, boat["fuel_level"] - fuel_decrease)
-        
-        # Calculate distance to boundary
-        geofence_distance = distance_to_geofence(boat["lat"], boat["lon"])
-        
-        # Update risk level based on various factors
-        # 1. Distance to geofence (higher risk when closer to or beyond geofence)
-        distance_risk = max(0, min(1, 1 - ((geofence_distance + 5) / 35)))
-        
-        # 2. Fuel level (higher risk with lower fuel)
-        fuel_risk = max(0, min(1, (100 - boat["fuel_level"]) / 100))
-        
-        # 3. Operation time (higher risk with longer operation time)
-        time_risk = max(0, min(1, boat["operation_time"] / 24))  # Assuming max 24 hours
-        
-        # 4. Random environmental factors (weather, sea condition)
-        env_risk = random.uniform(0, 0.3)
-        
-        # Calculate combined risk with different weights
-        boat["risk_level"] = (
-            0.4 * distance_risk +
-            0.25 * fuel_risk +
-            0.25 * time_risk +
-            0.1 * env_risk
-        )
-        
-        # Update engine status based on risk and random factors
-        if boat["risk_level"] > 0.7 or (boat["risk_level"] > 0.5 and random.random() < 0.1):
-            boat["engine_status"] = "Warning"
-        elif boat["risk_level"] > 0.9 or (boat["risk_level"] > 0.7 and random.random() < 0.05):
-            boat["engine_status"] = "Critical"
-        else:
-            boat["engine_status"] = "Normal"
-            
-        # Update communication status
-        if boat["risk_level"] > 0.8 and random.random() < 0.1:
-            boat["communication_status"] = "Intermittent"
-        elif boat["risk_level"] > 0.9 and random.random() < 0.05:
-            boat["communication_status"] = "Lost"
-        else:
-            boat["communication_status"] = "Active"
-            
-        # Update safety status
-        if geofence_distance < -5:  # More than 5km beyond geofence
-            boat["safety_status"] = "Danger"
-        elif geofence_distance < 0:  # Beyond geofence but within 5km
-            boat["safety_status"] = "Warning"
-        elif boat["risk_level"] > 0.7:  # High risk but within geofence
-            boat["safety_status"] = "Caution"
-        else:
-            boat["safety_status"] = "Safe"
-            
-        # Update last update time
-        boat["last_update"] = datetime.now().strftime("%H:%M:%S")
-        
-        # Update history
-        boat["history"]["positions"].append((boat["lat"], boat["lon"]))
-        boat["history"]["risk_levels"].append(boat["risk_level"])
-        boat["history"]["timestamps"].append(boat["last_update"])
-        
-        # Limit history length to prevent memory issues
-        if len(boat["history"]["positions"]) > 100:
-            boat["history"]["positions"] = boat["history"]["positions"][-100:]
-            boat["history"]["risk_levels"] = boat["history"]["risk_levels"][-100:]
-            boat["history"]["timestamps"] = boat["history"]["timestamps"][-100:]
-    
-    return boats
+# Alert fan-out to vessels over MQTT; without a broker, simulated vessels ack over an in-process transport
+@st.cache_resource
+def get_broadcaster():
+    transport = get_mqtt_transport()
+    if transport is None:
+        transport = FakeTransport()
+        FakeVessels(transport, get_fleet_service().snapshot().fleet.ids, loss=0.05, latency_s=0.2, jitter_s=1.5)
+    broadcaster = Broadcaster(transport)
+    atexit.register(broadcaster.close)
+    return broadcaster
 
-# Create the interactive map
-def create_map(boats):
-    # Create map centered between Chennai and Pondicherry
-    center_lat = (13.0827 + 11.9300) / 2
-    center_lon = (80.2707 + 79.8300) / 2
-    
-    # Use a dark map tile for the base map
-    m = folium.Map(
-        location=[center_lat, center_lon],
-        zoom_start=9,
-        tiles="CartoDB dark_matter",  # Use dark theme map
-        scrollWheelZoom=True
-    )
-    
-    # Add additional map layers
-    folium.TileLayer(
-        'CartoDB dark_matter',
-        name='Dark Map (Default)',
-        attr='&copy; <a href="http://www.openstreetmap.org/copyright">OpenStreetMap</a> &copy; <a href="http://cartodb.com/attributions">CartoDB</a>'
-    ).add_to(m)
-    
-    folium.TileLayer(
-        'CartoDB positron',
-        name='Light Map',
-        attr='&copy; <a href="http://www.openstreetmap.org/copyright">OpenStreetMap</a> &copy; <a href="http://cartodb.com/attributions">CartoDB</a>'
-    ).add_to(m)
-    
-    folium.TileLayer(
-        'OpenStreetMap',
-        name='Standard Map',
-        attr='&copy; <a href="http://www.openstreetmap.org/copyright">OpenStreetMap</a>'
-    ).add_to(m)
-    
-    folium.TileLayer(
-        'Stamen Terrain',
-        name='Terrain Map',
-        attr='Map tiles by <a href="http://stamen.com">Stamen Design</a>, under <a href="http://creativecommons.org/licenses/by/3.0">CC BY 3.0</a>. Data by <a href="http://openstreetmap.org">OpenStreetMap</a>, under <a href="http://www.openstreetmap.org/copyright">ODbL</a>'
-    ).add_to(m)
-    
-    folium.TileLayer(
-        'Stamen Watercolor',
-        name='Watercolor Map',
-        attr='Map tiles by <a href="http://stamen.com">Stamen Design</a>, under <a href="http://creativecommons.org/licenses/by/3.0">CC BY 3.0</a>. Data by <a href="http://openstreetmap.org">OpenStreetMap</a>, under <a href="http://www.openstreetmap.org/copyright">ODbL</a>'
-    ).add_to(m)
-    
-    # Add layer control
-    folium.LayerControl().add_to(m)
-    
-    # Add coastal line (following the OpenStreetMap purple boundary)
-    coastal_line = folium.PolyLine(
-        locations=COASTAL_COORDS,
-        color='#BB86FC',  # Light purple for better visibility on dark background
-        weight=3,
-        opacity=0.8,
-        tooltip='Coastline (OSM boundary)'
-    )
-    coastal_line.add_to(m)
-    
-    # Create geofence boundary line 30km from shore
-    folium.PolyLine(
-        locations=GEOFENCE_POINTS,
-        color='#FF4444',  # Bright red for visibility on dark background
-        weight=3,
-        opacity=0.8,
-        tooltip='30km Geofence Boundary (Signal Limit)'
-    ).add_to(m)
-    
-    # Connect coastal points to geofence points to show the 30km distance
-    for i in range(len(COASTAL_COORDS)):
-        folium.PolyLine(
-            locations=[COASTAL_COORDS[i], GEOFENCE_POINTS[i]],
-            color='#FFAB40',  # Orange
-            weight=1,
-            opacity=0.5,
-            dash_array='5',
-            tooltip='30km Distance'
-        ).add_to(m)
-    
-    # Add boats to the map
-    for boat in boats:
-        # Determine marker color based on risk level
-        if boat["risk_level"] < 0.3:
-            color = 'green'
-            icon = 'ship'
-        elif boat["risk_level"] < 0.7:
-            color = 'orange'
-            icon = 'ship'
-        else:
-            color = 'red'
-            icon = 'warning'
-        
-        # Create popup content with dark mode styling
-        popup_html = f"""
-        <div style="width: 250px; background-color: #1E1E1E; color: white; border-radius: 5px; padding: 5px;">
-            <h3 style="text-align: center; color: #90CAF9;">{boat['name']}</h3>
-            <table style="width: 100%; color: white;">
-                <tr><td><b>Speed:</b></td><td>{boat['speed']:.1f} knots</td></tr>
-                <tr><td><b>Heading:</b></td><td>{boat['heading']:.1f}°</td></tr>
-                <tr><td><b>Crew:</b></td><td>{boat['crew_size']} persons</td></tr>
-                <tr><td><b>Operation Time:</b></td><td>{boat['operation_time']:.1f} hours</td></tr>
-                <tr><td><b>Fish Caught:</b></td><td>{boat['fish_caught']:.1f} kg</td></tr>
-                <tr><td><b>Fuel Level:</b></td><td>{boat['fuel_level']:.1f}%</td></tr>
-                <tr><td><b>Engine Status:</b></td><td>{boat['engine_status']}</td></tr>
-                <tr><td><b>Communication:</b></td><td>{boat['communication_status']}</td></tr>
-                <tr><td><b>Safety Status:</b></td><td>{boat['safety_status']}</td></tr>
-                <tr><td><b>Risk Level:</b></td><td>{boat['risk_level']:.2f}</td></tr>
-                <tr><td><b>Last Update:</b></td><td>{boat['last_update']}</td></tr>
-            </table>
-        </div>
-        """
-        
-        # Add marker
-        folium.Marker(
-            location=[boat["lat"], boat["lon"]],
-            popup=folium.Popup(popup_html, max_width=300),
-            tooltip=f"{boat['name']} - Risk: {boat['risk_level']:.2f}",
-            icon=folium.Icon(color=color, icon=icon, prefix='fa')
-        ).add_to(m)
-        
-        # Add trail (recent movement history)
-        if len(boat["history"]["positions"]) > 1:
-            folium.PolyLine(
-                locations=boat["history"]["positions"][-10:],  # Last 10 positions
-                color=color,
-                weight=2,
-                opacity=0.6
-            ).add_to(m)
-    
-    return m
+# Show the latest shared snapshot in this session
+def refresh_snapshot():
+    st.session_state.snapshot = get_fleet_service().snapshot()
 
 # Configure matplotlib for dark mode
 plt.style.use('dark_background')
 
+# With auto-update off the session keeps the snapshot it last saw until "Update Now".
+# A timed refresh passes wait_s to take the simulation's next tick if it is due within that time.
+def current_snapshot(wait_s=0):
+    if 'snapshot' not in st.session_state:
+        refresh_snapshot()
+    elif st.session_state.get('auto_update', True):
+        st.session_state.snapshot = get_fleet_service().fresh_snapshot(wait_s)
+    return st.session_state.snapshot
+
 # Initialize session state
-if 'boats' not in st.session_state:
-    st.session_state.boats = generate_boats(15)  # Generate 15 boats
-    
-if 'alerts' not in st.session_state:
-    st.session_state.alerts = []
-    
-if 'last_update' not in st.session_state:
-    st.session_state.last_update = datetime.now()
-    
-if 'update_count' not in st.session_state:
-    st.session_state.update_count = 0
+snapshot = current_snapshot()
     
+alert_store = get_alert_store()
+
+# Cursors of the alert pages the operator paged through; the last one is the page shown
+if 'alert_cursors' not in st.session_state:
+    st.session_state.alert_cursors = []
+
 if 'sos_alert' not in st.session_state:
     st.session_state.sos_alert = None
     
 if 'sos_time' not in st.session_state:
     st.session_state.sos_time = None
 
+if 'sos_delivery' not in st.session_state:
+    st.session_state.sos_delivery = None
+
+if 'map_feed' not in st.session_state:
+    st.session_state.map_feed = MapDeltaFeed()
+
+# Static map layers are rendered once per process and shared by every session
+@st.cache_resource
+def get_base_map():
+    return base_map_html()
+
+# Vessel layer for one snapshot version, built once and shared by every session
+@st.cache_resource(max_entries=2)
+def get_map_html(version, _snapshot):
+    base_html, map_name = get_base_map()
+    return compose_map_html(base_html, vessel_layer_script(map_name, _snapshot.boats, _snapshot.history))
+
+# Risk forecast for one snapshot version, computed once and shared by every session
+@st.cache_resource(max_entries=2)
+def get_forecast(version, _fleet):
+    return forecast_fleet(_fleet)
+
+# Longest list offered by the detail selector; more matches are reached by searching
+MAX_DETAIL_OPTIONS = 1000
+
+# Rendered vessel HTML shared by every session, reused until the vessel's row changes
+@st.cache_resource
+def get_html_cache(kind):
+    return HtmlCache({"card": card_html, "popup": popup_html, "trajectory": trajectory_map_html}[kind])
+
+# Name search index; names never change after the fleet is generated, so it is built once per fleet size.
+# Under telemetry a snapshot only holds vessels that have reported, a set that only grows, so its size
+# identifies it.
+@st.cache_resource(max_entries=2)
+def get_name_index(vessels, _names):
+    return NameIndex(_names)
+
+# Id lookup and filter bitmaps for one snapshot version, shared by every session
+@st.cache_resource(max_entries=2)
+def get_fleet_index(version, _fleet):
+    return FleetIndex(_fleet, get_name_index(len(_fleet), _fleet.names))
+
+# Simplified tracks and downsampled risk series per vessel and history version, shared by every session
+@st.cache_resource
+def get_track_cache():
+    return TrackCache()
+
+# Spatial index over vessel positions for one snapshot version, shared by every session
+@st.cache_resource(max_entries=2)
+def get_vessel_index(version, _fleet):
+    return VesselIndex(_fleet)
+
+# Refresh statistics per live view, kept for the session
+if 'refresh_monitors' not in st.session_state:
+    st.session_state.refresh_monitors = {}
+
+# Run render(snapshot) as a fragment that reruns itself every refresh_s seconds while auto-update is on.
+# Only the fragment reruns, so the page setup, CSS and other views are not rebuilt on a refresh.
+def live_view(render, key, refresh_s, report=True):
+    monitor = st.session_state.refresh_monitors.get(key)
+    if monitor is None or monitor.target_s != refresh_s:
+        monitor = st.session_state.refresh_monitors[key] = RefreshMonitor(refresh_s)
+    
+    # The first call is part of the full script run; only the fragment's own reruns wait for a tick
+    full_run = True
+    
+    def refresh():
+        nonlocal full_run
+        timed = not full_run and st.session_state.get('auto_update', True) and monitor.due()
+        full_run = False
+        snapshot = current_snapshot(REFRESH_WAIT_S if timed else 0)
+        began = time.monotonic()
+        render(snapshot)
+        if timed:
+            monitor.record(snapshot.published, time.monotonic() - began)
+        if report and st.session_state.get('auto_update', True):
+            st.caption(monitor.describe())
+    
+    st.fragment(refresh, run_every=refresh_s if st.session_state.get('auto_update', True) else None)()
+
+# Live sidebar widgets: SOS delivery progress, fleet metrics and risk summary
+def render_status(snapshot):
+    service = get_fleet_service()
+    if not service.healthy:
+        age = time.time() - snapshot.published
+        reason = f": {service.last_error!r}" if service.last_error is not None else ""
+        st.error(f"Fleet feed stalled, data is {age:.0f}s old{reason}")
+
+    delivery = get_broadcaster().delivery(st.session_state.sos_delivery)
+    if delivery is not None:
+        if delivery.reach_all_s is not None:
+            st.caption(f"Delivered to all {len(delivery)} vessels in {delivery.reach_all_s:.1f}s")
+        else:
+            st.caption(f"Acknowledged by {delivery.acked}/{len(delivery)} vessels"
+                       + (" (delivery ended)" if delivery.done.is_set() else ""))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Active Boats", snapshot.stats.vessels)
+    with col2:
+        st.metric("Alerts", len(alert_store))
+    # Telemetry mode: vessels only appear once they report
+    if snapshot.unreported:
+        st.caption(f"{snapshot.unreported} vessels have not reported yet")
+    
+    # Risk level summary
+    low_risk, medium_risk, high_risk = snapshot.stats.risk_counts
+    vessels = max(snapshot.stats.vessels, 1)
+    
+    st.markdown("#### Risk Summary")
+    st.progress(high_risk/vessels, "High Risk: " + str(high_risk))
+    st.progress(medium_risk/vessels, "Medium Risk: " + str(medium_risk))
+    st.progress(low_risk/vessels, "Low Risk: " + str(low_risk))
+
 # Create SOS alert function
 def send_sos_alert():
     alert_type = st.session_state.sos_type
     st.session_state.sos_alert = alert_type
     st.session_state.sos_time = datetime.now()
     
-    # Add to alerts list
-    st.session_state.alerts.append({
-        "type": alert_type,
-        "time": datetime.now().strftime("%H:%M:%S"),
-        "message": f"EMERGENCY ALERT: {alert_type} warning issued to all vessels"
-    })
+    message = f"EMERGENCY ALERT: {alert_type} warning issued to all vessels"
+    get_alert_store().add(alert_type, message, severity=EMERGENCY)
+    # Every vessel listens on the fleet topic, so one publish reaches the whole fleet
+    st.session_state.sos_delivery = get_broadcaster().send(
+        alert_type, message, snapshot.fleet.ids, severity=EMERGENCY, fleet_wide=True
+    ).id
 
 # Main layout
 # Sidebar for controls
 with st.sidebar:
     st.markdown('<div class="sub-header">Control Panel</div>', unsafe_allow_html=True)
     
-    auto_update = st.checkbox("Auto-update (5s)", value=True)
+    auto_update = st.checkbox("Auto-update (5s)", value=True, key="auto_update")
     
-    if st.button("Update Now"):
-        st.session_state.boats = update_boat_positions(st.session_state.boats)
-        st.session_state.last_update = datetime.now()
-        st.session_state.update_count += 1
+    map_mode = st.radio(
+        "Map Mode",
+        ["Live updates", "Full render", "Large fleet"],
+        help="Live updates keep one map open and only send vessels that changed. "
+             "Large fleet draws every vessel as one GPU point layer; click a vessel for details."
+    )
+    
+    st.button("Update Now", on_click=refresh_snapshot)
     
     st.markdown('<div class="sub-header">SOS Alerts</div>', unsafe_allow_html=True)
     
@@ -679,44 +490,36 @@ with st.sidebar:
             st.session_state.sos_alert = None
     
     st.markdown('<div class="sub-header">System Status</div>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric("Active Boats", len(st.session_state.boats))
-    with col2:
-        st.metric("Alerts", len(st.session_state.alerts))
-    
-    # Risk level summary
-    high_risk = sum(1 for boat in st.session_state.boats if boat["risk_level"] > 0.7)
-    medium_risk = sum(1 for boat in st.session_state.boats if 0.3 <= boat["risk_level"] <= 0.7)
-    low_risk = sum(1 for boat in st.session_state.boats if boat["risk_level"] < 0.3)
-    
-    st.markdown("#### Risk Summary")
-    st.progress(high_risk/len(st.session_state.boats), "High Risk: " + str(high_risk))
-    st.progress(medium_risk/len(st.session_state.boats), "Medium Risk: " + str(medium_risk))
-    st.progress(low_risk/len(st.session_state.boats), "Low Risk: " + str(low_risk))
-
-# Auto-update logic
-if auto_update and (datetime.now() - st.session_state.last_update).total_seconds() > 5:
-    st.session_state.boats = update_boat_positions(st.session_state.boats)
-    st.session_state.last_update = datetime.now()
-    st.session_state.update_count += 1
+    live_view(render_status, "status", get_fleet_service().interval_s, report=False)
 
 # Main content
-# Create tabs for different views
-tab1, tab2, tab3, tab4 = st.tabs(["Map View", "Boat Details", "Alerts & Notifications", "Analytics"])
-
-with tab1:
+# Each view is a function rendered only while it is selected, so hidden views cost nothing per tick
+def render_map_view(snapshot):
     st.markdown('<div class="sub-header">Real-time Monitoring Map</div>', unsafe_allow_html=True)
     
-    # Create map
-    m = create_map(st.session_state.boats)
-    
-    # Display the map
-    folium_static(m, width=1200, height=600)
+    if map_mode == "Live updates":
+        # Long-lived map that only receives vessels that changed
+        live_map(snapshot.fleet, st.session_state.map_feed, height=600)
+    elif map_mode == "Large fleet":
+        # One point layer for the whole fleet; details only for the clicked vessel
+        vessel_id = selected_vessel(st.session_state.get("fleet_deck"))
+        row = get_fleet_index(snapshot.version, snapshot.fleet).row(vessel_id)
+        selected = snapshot.boats[row] if row is not None else None
+        trail = snapshot.history.positions(row, TRAIL_LENGTH) if selected else None
+        st.pydeck_chart(
+            fleet_deck(snapshot.fleet, trail=trail, height=600),
+            on_select="rerun",
+            selection_mode="single-object",
+            key="fleet_deck",
+        )
+        if selected:
+            st.markdown(get_html_cache("popup").html(snapshot.fleet, row), unsafe_allow_html=True)
+    else:
+        # Display the map: cached base layers plus the current vessel layer
+        components.html(get_map_html(snapshot.version, snapshot), width=1200, height=610)
     
     # Display last update time
-    st.markdown(f"<p style='text-align:right; color:#BBBBBB;'>Last updated: {st.session_state.last_update.strftime('%H:%M:%S')}</p>", unsafe_allow_html=True)
+    st.markdown(f"<p style='text-align:right; color:#BBBBBB;'>Last updated: {datetime.fromtimestamp(snapshot.published).strftime('%H:%M:%S')}</p>", unsafe_allow_html=True)
     
     # Display active SOS alert if any
     if st.session_state.sos_alert:
@@ -724,7 +527,7 @@ with tab1:
         if elapsed < 60:  # Show for 60 seconds
             st.markdown(f'<div class="alert">⚠️ EMERGENCY ALERT: {st.session_state.sos_alert} ⚠️</div>', unsafe_allow_html=True)
 
-with tab2:
+def render_boat_details(snapshot):
     st.markdown('<div class="sub-header">Vessel Status and Details</div>', unsafe_allow_html=True)
     
     # Filter options
@@ -732,86 +535,60 @@ with tab2:
     with col1:
         risk_filter = st.selectbox(
             "Filter by Risk Level",
-            ["All", "High Risk", "Medium Risk", "Low Risk"]
+            ["All", "High Risk", "Medium Risk", "Low Risk"],
+            on_change=lambda: st.session_state.pop("card_page", None)
         )
     with col2:
         status_filter = st.selectbox(
             "Filter by Status",
-            ["All", "Safe", "Caution", "Warning", "Danger"]
+            ["All", "Safe", "Caution", "Warning", "Danger"],
+            on_change=lambda: st.session_state.pop("card_page", None)
         )
     with col3:
-        search_term = st.text_input("Search by Boat Name or ID")
+        search_term = st.text_input("Search by Boat Name or ID",
+                                    on_change=lambda: st.session_state.pop("card_page", None))
     
     # Apply filters
-    filtered_boats = st.session_state.boats
-    
-    if risk_filter == "High Risk":
-        filtered_boats = [b for b in filtered_boats if b["risk_level"] > 0.7]
-    elif risk_filter == "Medium Risk":
-        filtered_boats = [b for b in filtered_boats if 0.3 <= b["risk_level"] <= 0.7]
-    elif risk_filter == "Low Risk":
-        filtered_boats = [b for b in filtered_boats if b["risk_level"] < 0.3]
-        
-    if status_filter != "All":
-        filtered_boats = [b for b in filtered_boats if b["safety_status"] == status_filter]
-        
-    if search_term:
-        filtered_boats = [b for b in filtered_boats if search_term.lower() in b["name"].lower() or 
-                         search_term == str(b["id"])]
+    fleet = snapshot.fleet
+    fleet_index = get_fleet_index(snapshot.version, fleet)
+    filtered_rows = fleet_index.query(
+        risk=None if risk_filter == "All" else risk_filter,
+        status=None if status_filter == "All" else status_filter,
+        search=search_term or None,
+    )
     
-    # Create boat cards
-    if not filtered_boats:
+    # Create boat cards, one page at a time
+    if not len(filtered_rows):
         st.write("No boats match the selected filters.")
     else:
-        for i in range(0, len(filtered_boats), 3):
-            cols = st.columns(3)
-            for j in range(3):
-                if i + j < len(filtered_boats):
-                    boat = filtered_boats[i + j]
-                    with cols[j]:
-                        if boat["risk_level"] < 0.3:
-                            st.markdown(f"""
-                            <div class="boat-card-low">
-                                <h3>{boat['name']}</h3>
-                                <p>Risk Level: {boat['risk_level']:.2f}</p>
-                                <p>Status: {boat['safety_status']}</p>
-                                <p>Position: ({boat['lat']:.4f}, {boat['lon']:.4f})</p>
-                                <p>Last Update: {boat['last_update']}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        elif boat["risk_level"] < 0.7:
-                            st.markdown(f"""
-                            <div class="boat-card-medium">
-                                <h3>{boat['name']}</h3>
-                                <p>Risk Level: {boat['risk_level']:.2f}</p>
-                                <p>Status: {boat['safety_status']}</p>
-                                <p>Position: ({boat['lat']:.4f}, {boat['lon']:.4f})</p>
-                                <p>Last Update: {boat['last_update']}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        else:
-                            st.markdown(f"""
-                            <div class="boat-card-high">
-                                <h3>{boat['name']}</h3>
-                                <p>Risk Level: {boat['risk_level']:.2f}</p>
-                                <p>Status: {boat['safety_status']}</p>
-                                <p>Position: ({boat['lat']:.4f}, {boat['lon']:.4f})</p>
-                                <p>Last Update: {boat['last_update']}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
+        pages = page_count(len(filtered_rows))
+        if st.session_state.get("card_page", 1) > pages:
+            st.session_state.card_page = pages  # the vessels moved out of the filter since the last page
+        page = st.session_state.get("card_page", 1)
+        first = (page - 1) * CARDS_PER_PAGE
+        page_rows = filtered_rows[first:first + CARDS_PER_PAGE]
+        st.markdown(card_grid_html(get_html_cache("card").many(fleet, page_rows)), unsafe_allow_html=True)
+        if pages > 1:
+            col1, col2 = st.columns([1, 3])
+            col1.number_input("Page", min_value=1, max_value=pages, key="card_page")
+            col2.caption(f"Showing {first + 1}-{first + len(page_rows)} of {len(filtered_rows)} vessels")
     
     # Detailed boat info
     st.markdown('<div class="sub-header">Detailed Vessel Information</div>', unsafe_allow_html=True)
     
-    selected_boat = st.selectbox(
+    # Offers the vessels matching the filters; the value is the vessel id, looked up in the index
+    boat_id = st.selectbox(
         "Select Boat for Details",
-        options=[f"{boat['name']} (ID: {boat['id']})" for boat in st.session_state.boats],
+        options=fleet.ids[filtered_rows[:MAX_DETAIL_OPTIONS]].tolist(),
+        format_func=lambda vessel_id: f"{fleet.names[fleet_index.row(vessel_id)]} (ID: {vessel_id})",
         key="selected_boat_details"
     )
+    if len(filtered_rows) > MAX_DETAIL_OPTIONS:
+        st.caption(f"Listing the first {MAX_DETAIL_OPTIONS} of {len(filtered_rows)} matching vessels; "
+                   "search to narrow them down")
     
-    # Extract boat ID from selection
-    boat_id = int(selected_boat.split("(ID: ")[1].split(")")[0])
-    boat = next((b for b in st.session_state.boats if b["id"] == boat_id), None)
+    boat_row = fleet_index.row(boat_id) if boat_id is not None else None
+    boat = snapshot.boats[boat_row] if boat_row is not None else None
     
     if boat:
         col1, col2 = st.columns(2)
@@ -833,12 +610,9 @@ with tab2:
             st.write(f"**Risk Level:** {boat['risk_level']:.2f}")
             
             # Risk level indicator
-            if boat['risk_level'] < 0.3:
-                st.markdown('<div class="safe">Low Risk</div>', unsafe_allow_html=True)
-            elif boat['risk_level'] < 0.7:
-                st.markdown('<div class="warning">Medium Risk</div>', unsafe_allow_html=True)
-            else:
-                st.markdown('<div class="alert">High Risk</div>', unsafe_allow_html=True)
+            band = risk_band(boat['risk_level'])
+            st.markdown(f'<div class="{("safe", "warning", "alert")[band]}">{RISK_BANDS[band]}</div>',
+                        unsafe_allow_html=True)
                 
             st.write(f"**Safety Status:** {boat['safety_status']}")
             st.write(f"**Engine Status:** {boat['engine_status']}")
@@ -853,10 +627,11 @@ with tab2:
             st.markdown('<div class="data-container">', unsafe_allow_html=True)
             st.markdown("#### Risk Level History")
             
-            # Create DataFrame for chart
+            # Create DataFrame for chart, downsampled so it stays small however long the history
+            times, risk_levels = get_track_cache().risk_series(snapshot.history, boat_row, boat_id)
             risk_df = pd.DataFrame({
-                'Time': boat['history']['timestamps'],
-                'Risk Level': boat['history']['risk_levels']
+                'Time': [datetime.fromtimestamp(t).strftime("%H:%M:%S") for t in times],
+                'Risk Level': risk_levels
             })
             
             # Create chart
@@ -883,33 +658,16 @@ with tab2:
             st.markdown('<div class="data-container">', unsafe_allow_html=True)
             st.markdown("#### Movement Trajectory")
             
-            # Create mini map
-            mini_map = folium.Map(
-                location=[boat["lat"], boat["lon"]],
-                zoom_start=10,
-                tiles="CartoDB dark_matter"
+            # Mini map for this vessel state, rendered once and reused until the vessel moves
+            track = get_track_cache().track(snapshot.history, boat_row, boat_id, MINI_MAP_ZOOM)
+            components.html(
+                get_html_cache("trajectory").html(snapshot.fleet, boat_row, track),
+                width=500,
+                height=310,
             )
-            
-            # Add trajectory
-            folium.PolyLine(
-                locations=boat["history"]["positions"],
-                color='cyan',
-                weight=3,
-                opacity=0.8
-            ).add_to(mini_map)
-            
-            # Add marker for current position
-            folium.Marker(
-                location=[boat["lat"], boat["lon"]],
-                tooltip=f"{boat['name']} - Current Position",
-                icon=folium.Icon(color='red', icon='ship', prefix='fa')
-            ).add_to(mini_map)
-            
-            # Display the mini map
-            folium_static(mini_map, width=500, height=300)
             st.markdown('</div>', unsafe_allow_html=True)
 
-with tab3:
+def render_alerts(snapshot):
     st.markdown('<div class="sub-header">Alert Management System</div>', unsafe_allow_html=True)
     
     # Display current alerts
@@ -923,11 +681,7 @@ with tab3:
     st.markdown("#### Alert Summary")
     
     # Count alerts by type
-    alert_types = {}
-    for alert in st.session_state.alerts:
-        if alert["type"] not in alert_types:
-            alert_types[alert["type"]] = 0
-        alert_types[alert["type"]] += 1
+    alert_types = alert_store.type_counts()
     
     # Display alert summary
     if not alert_types:
@@ -959,6 +713,8 @@ with tab3:
         with col2:
             for alert_type, count in alert_types.items():
                 st.markdown(f"**{alert_type}:** {count} alerts")
+            severity_counts = alert_store.severity_counts()
+            st.markdown(" · ".join(f"{SEVERITIES[code]}: {severity_counts[code]}" for code in reversed(range(len(SEVERITIES)))))
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -966,17 +722,32 @@ with tab3:
     st.markdown('<div class="data-container">', unsafe_allow_html=True)
     st.markdown("#### Recent Alerts")
     
-    if not st.session_state.alerts:
+    severity_filter = st.selectbox(
+        "Severity",
+        ["All"] + list(reversed(SEVERITIES)),
+        key="alert_severity",
+        on_change=lambda: st.session_state.alert_cursors.clear()
+    )
+    cursors = st.session_state.alert_cursors
+    alert_page = alert_store.page(
+        cursor=cursors[-1] if cursors else None,
+        severity=None if severity_filter == "All" else SEVERITIES.index(severity_filter)
+    )
+    
+    if not alert_page.alerts:
         st.write("No recent alerts to display.")
     else:
-        # Display recent alerts (most recent first)
-        for alert in reversed(st.session_state.alerts[-10:]):  # Last 10 alerts
-            if "EMERGENCY" in alert["message"]:
-                st.markdown(f'<div class="alert">{alert["time"]}: {alert["message"]}</div>', unsafe_allow_html=True)
-            elif "Warning" in alert["message"]:
-                st.markdown(f'<div class="warning">{alert["time"]}: {alert["message"]}</div>', unsafe_allow_html=True)
-            else:
-                st.markdown(f'<div class="safe">{alert["time"]}: {alert["message"]}</div>', unsafe_allow_html=True)
+        # Display alerts (most recent first), styled by severity
+        alert_styles = {EMERGENCY: "alert", WARNING: "warning", INFO: "safe"}
+        for alert in alert_page.alerts:
+            st.markdown(f'<div class="{alert_styles[alert.severity]}">{alert.clock}: {alert.message}</div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("Newer", disabled=not cursors, on_click=cursors.pop)
+    with col2:
+        st.button("Older", disabled=alert_page.next_cursor is None,
+                  on_click=cursors.append, args=(alert_page.next_cursor,))
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -984,7 +755,7 @@ with tab3:
     st.markdown('<div class="data-container">', unsafe_allow_html=True)
     st.markdown("#### High Risk Vessels")
     
-    high_risk_boats = [b for b in st.session_state.boats if b["risk_level"] > 0.7]
+    high_risk_boats = [snapshot.boats[i] for i in snapshot.stats.high_risk_rows]
     if not high_risk_boats:
         st.markdown('<div class="safe">No high risk vessels detected.</div>', unsafe_allow_html=True)
     else:
@@ -1005,12 +776,37 @@ with tab3:
     # Custom alert form
     st.markdown('<div class="sub-header">Send Custom Alert</div>', unsafe_allow_html=True)
     
+    # Outside the form so the region inputs below switch as soon as the target changes
+    target = st.radio("Target", ["Vessels", "Radius", "Polygon", "Coastal Segment"], horizontal=True,
+                      key="alert_target")
+    
     with st.form("custom_alert_form"):
         alert_msg = st.text_area("Alert Message")
-        alert_recipients = st.multiselect(
-            "Recipients",
-            options=["All Vessels"] + [boat["name"] for boat in st.session_state.boats]
-        )
+        region = None
+        if target == "Vessels":
+            alert_recipients = st.multiselect(
+                "Recipients",
+                options=["All Vessels"] + [boat["name"] for boat in snapshot.boats]
+            )
+        elif target == "Radius":
+            col1, col2, col3 = st.columns(3)
+            center_lat = col1.number_input("Latitude", value=12.6, format="%.4f")
+            center_lon = col2.number_input("Longitude", value=80.5, format="%.4f")
+            radius_km = col3.number_input("Radius (km)", min_value=0.1, value=10.0)
+            region = RadiusRegion(center_lat, center_lon, radius_km)
+        elif target == "Polygon":
+            polygon_text = st.text_area("Polygon vertices (one 'lat, lon' per line)",
+                                        "12.5, 80.4\n12.7, 80.4\n12.7, 80.7\n12.5, 80.7")
+        else:
+            coast_start, coast_end = st.select_slider(
+                "Coastline between",
+                options=list(range(len(COASTAL_COORDS))),
+                value=(0, 5),
+                format_func=lambda i: f"{i}: {COASTAL_COORDS[i][0]:.2f}, {COASTAL_COORDS[i][1]:.2f}"
+            )
+            band_km = st.number_input("Distance from shore (km)", min_value=1.0, value=30.0)
+        if target != "Vessels":
+            within_minutes = st.slider("Include vessels entering the region within (minutes)", 0, 120, 30, 10)
         
         alert_type = st.selectbox(
             "Alert Type",
@@ -1019,19 +815,56 @@ with tab3:
         
         submitted = st.form_submit_button("Send Alert")
         
-        if submitted and alert_msg and alert_recipients:
+        if submitted and target == "Polygon":
+            try:
+                region = PolygonRegion.parse(polygon_text)
+            except ValueError as error:
+                st.error(f"Invalid polygon: {error}")
+        elif submitted and target == "Coastal Segment":
+            if coast_start == coast_end:
+                st.error("Pick two different coastal points")
+            else:
+                region = CoastalSegment(coast_start, coast_end, band_km)
+        
+        if submitted and alert_msg and region is not None:
+            try:
+                recipient_ids = get_vessel_index(snapshot.version, snapshot.fleet).recipients(region, within_minutes)
+            except ValueError as error:
+                st.error(str(error))
+            else:
+                recipients_str = region.describe()
+                if within_minutes:
+                    recipients_str += f" or entering it within {within_minutes} min"
+                severity = {"Information": INFO, "Warning": WARNING, "Emergency": EMERGENCY}[alert_type]
+                message = f"{alert_type.upper()}: {alert_msg} (To: vessels {recipients_str})"
+                
+                alert_store.add(alert_type, message, severity=severity)
+                delivery = get_broadcaster().send(alert_type, message, recipient_ids, severity=severity)
+                
+                st.success(f"Alert sent to vessels {recipients_str} ({len(delivery)} vessels)")
+        elif submitted and alert_msg and target == "Vessels" and alert_recipients:
             recipients_str = ", ".join(alert_recipients) if alert_recipients else "No recipients selected"
+            severity = {"Information": INFO, "Warning": WARNING, "Emergency": EMERGENCY}[alert_type]
+            message = f"{alert_type.upper()}: {alert_msg} (To: {recipients_str})"
             
-            # Add to alerts list
-            st.session_state.alerts.append({
-                "type": alert_type,
-                "time": datetime.now().strftime("%H:%M:%S"),
-                "message": f"{alert_type.upper()}: {alert_msg} (To: {recipients_str})"
-            })
+            alert_store.add(alert_type, message, severity=severity)
+            fleet_wide = "All Vessels" in alert_recipients
+            recipient_ids = snapshot.fleet.ids if fleet_wide else \
+                snapshot.fleet.ids[np.isin(snapshot.fleet.names, alert_recipients)]
+            delivery = get_broadcaster().send(alert_type, message, recipient_ids, severity=severity,
+                                              fleet_wide=fleet_wide)
             
-            st.success(f"Alert sent to {recipients_str}")
+            st.success(f"Alert sent to {recipients_str} ({len(delivery)} vessels)")
+    
+    # Delivery status of recent broadcasts
+    deliveries = get_broadcaster().recent(5)
+    if deliveries:
+        st.markdown("#### Broadcast Delivery")
+        st.dataframe(pd.DataFrame([delivery.summary() for delivery in deliveries])[
+            ["type", "recipients", "acked", "unreached", "max_attempts_used", "ack_p95_s", "reach_all_s"]
+        ], hide_index=True)
 
-with tab4:
+def render_analytics(snapshot):
     st.markdown('<div class="sub-header">Analytics Dashboard</div>', unsafe_allow_html=True)
     
     # Create analytics dashboard
@@ -1043,11 +876,7 @@ with tab4:
         st.markdown("#### Risk Level Distribution")
         
         # Create risk level categories
-        risk_categories = {
-            "Low Risk (0.0-0.3)": len([b for b in st.session_state.boats if b["risk_level"] < 0.3]),
-            "Medium Risk (0.3-0.7)": len([b for b in st.session_state.boats if 0.3 <= b["risk_level"] <= 0.7]),
-            "High Risk (0.7-1.0)": len([b for b in st.session_state.boats if b["risk_level"] > 0.7])
-        }
+        risk_categories = snapshot.stats.risk_categories
         
         # Create DataFrame
         risk_df = pd.DataFrame({
@@ -1058,7 +887,7 @@ with tab4:
         # Create chart
         colors = ['#4CAF50', '#FF9800', '#F44336']
         chart = alt.Chart(risk_df).mark_bar().encode(
-            x=alt.X('Risk Category:N', sort=['Low Risk (0.0-0.3)', 'Medium Risk (0.3-0.7)', 'High Risk (0.7-1.0)']),
+            x=alt.X('Risk Category:N', sort=list(RISK_CATEGORIES)),
             y='Count:Q',
             color=alt.Color('Risk Category:N', scale=alt.Scale(domain=list(risk_categories.keys()), range=colors))
         ).properties(
@@ -1077,12 +906,7 @@ with tab4:
         st.markdown("#### Fuel Level Analysis")
         
         # Create fuel level categories
-        fuel_cats = {
-            "Critical (<10%)": len([b for b in st.session_state.boats if b["fuel_level"] < 10]),
-            "Low (10-30%)": len([b for b in st.session_state.boats if 10 <= b["fuel_level"] < 30]),
-            "Medium (30-60%)": len([b for b in st.session_state.boats if 30 <= b["fuel_level"] < 60]),
-            "High (60-100%)": len([b for b in st.session_state.boats if b["fuel_level"] >= 60])
-        }
+        fuel_cats = snapshot.stats.fuel_categories
         
         # Create DataFrame
         fuel_df = pd.DataFrame({
@@ -1109,12 +933,7 @@ with tab4:
         st.markdown("#### Safety Status Summary")
         
         # Create safety status categories
-        safety_cats = {
-            "Safe": len([b for b in st.session_state.boats if b["safety_status"] == "Safe"]),
-            "Caution": len([b for b in st.session_state.boats if b["safety_status"] == "Caution"]),
-            "Warning": len([b for b in st.session_state.boats if b["safety_status"] == "Warning"]),
-            "Danger": len([b for b in st.session_state.boats if b["safety_status"] == "Danger"])
-        }
+        safety_cats = snapshot.stats.safety_categories
         
         # Create DataFrame
         safety_df = pd.DataFrame({
@@ -1143,18 +962,16 @@ with tab4:
         st.markdown('<div class="data-container">', unsafe_allow_html=True)
         st.markdown("#### Distance from Shore Analysis")
         
-        # Calculate distances
-        distances = []
-        for boat in st.session_state.boats:
-            dist = distance_to_shore(boat["lat"], boat["lon"])
-            distances.append({
-                "boat_name": boat["name"],
-                "distance": dist,
-                "risk_level": boat["risk_level"]
-            })
+        # Distance to the coastline itself, as the simulation and geofence measure it
+        fleet = snapshot.fleet
+        distances = default_geofence().shore_distance(fleet.lat, fleet.lon)
         
         # Create DataFrame
-        dist_df = pd.DataFrame(distances)
+        dist_df = pd.DataFrame({
+            "boat_name": fleet.names,
+            "distance": distances,
+            "risk_level": fleet.risk_level
+        })
         
         # Create chart
         dist_chart = alt.Chart(dist_df).mark_circle(size=60).encode(
@@ -1180,20 +997,16 @@ with tab4:
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        avg_risk = sum(boat["risk_level"] for boat in st.session_state.boats) / len(st.session_state.boats)
-        st.metric("Average Risk Level", f"{avg_risk:.2f}")
+        st.metric("Average Risk Level", f"{snapshot.stats.mean_risk:.2f}")
     
     with col2:
-        avg_fuel = sum(boat["fuel_level"] for boat in st.session_state.boats) / len(st.session_state.boats)
-        st.metric("Average Fuel Level", f"{avg_fuel:.1f}%")
+        st.metric("Average Fuel Level", f"{snapshot.stats.mean_fuel:.1f}%")
     
     with col3:
-        total_fish = sum(boat["fish_caught"] for boat in st.session_state.boats)
-        st.metric("Total Fish Caught", f"{total_fish:.1f} kg")
+        st.metric("Total Fish Caught", f"{snapshot.stats.total_fish:.1f} kg")
     
     with col4:
-        total_crew = sum(boat["crew_size"] for boat in st.session_state.boats)
-        st.metric("Total Crew at Sea", total_crew)
+        st.metric("Total Crew at Sea", snapshot.stats.total_crew)
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -1203,41 +1016,24 @@ with tab4:
     st.markdown('<div class="data-container">', unsafe_allow_html=True)
     st.markdown("#### Risk Forecast (Next 2 Hours)")
     
-    # Generate simple forecast
+    # Dead-reckoned forecast for the whole fleet, shared by every session
+    forecast = get_forecast(snapshot.version, snapshot.fleet)
     current_time = datetime.now()
-    forecast_times = [(current_time + timedelta(minutes=30*i)).strftime("%H:%M") for i in range(5)]
-    
-    # Create forecast for each boat
-    forecast_data = []
-    for boat in st.session_state.boats:
-        # Simple trend-based forecast with some randomness
-        current_risk = boat["risk_level"]
-        risk_trend = 0.05  # Base risk increase over time
-        
-        # Adjust trend based on current factors
-        if boat["fuel_level"] < 30:
-            risk_trend += 0.03  # Lower fuel increases risk faster
-        if boat["operation_time"] > 10:
-            risk_trend += 0.02  # Longer operation increases risk faster
-        
-        # Generate forecast points
-        for i, time_point in enumerate(forecast_times):
-            # Add some randomness to the forecast
-            random_factor = random.uniform(-0.02, 0.02)
-            forecasted_risk = min(1.0, current_risk + (risk_trend * (i+1)) + random_factor)
-            
-            forecast_data.append({
-                "boat_name": boat["name"],
-                "time": time_point,
-                "forecasted_risk": forecasted_risk
-            })
+    forecast_times = [current_time.strftime("%H:%M")] + [
+        (current_time + timedelta(minutes=int(m))).strftime("%H:%M") for m in forecast.minutes
+    ]
     
-    # Create DataFrame
-    forecast_df = pd.DataFrame(forecast_data)
+    # Long-format frame: the current risk followed by each forecast point, per boat
+    risk_grid = np.column_stack([snapshot.fleet.risk_level, forecast.risk])
+    forecast_df = pd.DataFrame({
+        "boat_name": np.repeat(snapshot.fleet.names, len(forecast_times)),
+        "time": np.tile(forecast_times, len(snapshot.fleet)),
+        "forecasted_risk": risk_grid.ravel()
+    })
     
     # Create chart
     forecast_chart = alt.Chart(forecast_df).mark_line().encode(
-        x='time:N',
+        x=alt.X('time:N', sort=forecast_times),
         y=alt.Y('forecasted_risk:Q', scale=alt.Scale(domain=[0, 1])),
         color='boat_name:N',
         tooltip=['boat_name', 'time', 'forecasted_risk']
@@ -1254,28 +1050,38 @@ with tab4:
     # Show high risk boat forecasts
     st.markdown("#### High Risk Forecast Alerts")
     
-    high_risk_forecast = forecast_df[forecast_df["forecasted_risk"] > 0.7]
-    high_risk_boats = high_risk_forecast["boat_name"].unique()
+    high_risk_rows = forecast.high_risk_rows
     
-    if not len(high_risk_boats):
+    if not len(high_risk_rows):
         st.markdown('<div class="safe">No high risk forecasts detected.</div>', unsafe_allow_html=True)
     else:
-        for boat_name in high_risk_boats:
-            boat_forecast = high_risk_forecast[high_risk_forecast["boat_name"] == boat_name]
-            first_high_risk_time = boat_forecast.iloc[0]["time"]
-            max_risk = boat_forecast["forecasted_risk"].max()
+        max_risk = forecast.max_risk
+        for i in high_risk_rows:
+            first_high_risk_time = forecast_times[forecast.first_high[i] + 1]
             
             st.markdown(f"""
             <div class="warning">
-                <h4>{boat_name}</h4>
+                <h4>{snapshot.fleet.names[i]}</h4>
                 <p>Predicted to reach high risk at {first_high_risk_time}</p>
-                <p>Maximum forecasted risk: {max_risk:.2f}</p>
+                <p>Maximum forecasted risk: {max_risk[i]:.2f}</p>
                 <p>Recommended action: Consider recall or safety check</p>
             </div>
             """, unsafe_allow_html=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+# Seconds between refreshes of each view while auto-update is on; None follows the simulation's ticks
+VIEWS = {
+    "Map View": (render_map_view, None),
+    "Boat Details": (render_boat_details, 10),
+    "Alerts & Notifications": (render_alerts, None),
+    "Analytics": (render_analytics, 30),
+}
+
+view = st.radio("View", list(VIEWS), horizontal=True, key="view", label_visibility="collapsed")
+render_view, refresh_s = VIEWS[view]
+live_view(render_view, view, refresh_s or get_fleet_service().interval_s)
+
 # Footer
 st.markdown("""
 <div style="text-align:center; margin-top:30px; padding:10px; background-color:#1E1E1E; border-radius:5px;">
@@ -1283,34 +1089,3 @@ st.markdown("""
     <p>© 2025 FisherLink Technologies. All rights reserved.</p>
 </div>
 """, unsafe_allow_html=True)
-
-# Generate automatic alerts based on boat conditions
-for boat in st.session_state.boats:
-    # Add alerts for high risk situations
-    if boat["risk_level"] > 0.9 and random.random() < 0.05:  # 5% chance for very high risk boats
-        st.session_state.alerts.append({
-            "type": "Emergency",
-            "time": datetime.now().strftime("%H:%M:%S"),
-            "message": f"EMERGENCY: Critical risk level detected for {boat['name']}! Immediate assistance required."
-        })
-    elif boat["risk_level"] > 0.8 and random.random() < 0.03:  # 3% chance for high risk boats
-        st.session_state.alerts.append({
-            "type": "Warning",
-            "time": datetime.now().strftime("%H:%M:%S"),
-            "message": f"WARNING: High risk level detected for {boat['name']}. Monitor closely."
-        })
-    elif boat["fuel_level"] < 10 and random.random() < 0.05:  # 5% chance for low fuel boats
-        st.session_state.alerts.append({
-            "type": "Warning",
-            "time": datetime.now().strftime("%H:%M:%S"),
-            "message": f"FUEL ALERT: Critically low fuel for {boat['name']}. Return to shore recommended."
-        })
-    elif distance_to_geofence(boat["lat"], boat["lon"]) < -1 and random.random() < 0.1:  # 10% chance for boats beyond geofence
-        st.session_state.alerts.append({
-            "type": "Boundary Alert",
-            "time": datetime.now().strftime("%H:%M:%S"),
-            "message": f"BOUNDARY ALERT: {boat['name']} has crossed the geofence boundary and may lose communication."
-        })
-        
-if len(st.session_state.alerts) > 100:
-    st.session_state.alerts = st.session_state.alerts[-100:] 
\ No newline at end of file
@@ -0,0 +1 @@
+"""Standalone benchmarks; run from the repository root, e.g. ``python -m benchmarks.bench_geofence``."""
@@ -0,0 +1,98 @@
+"""Alert store at archive scale: batched inserts, paging and counts.
+
+Fills a fresh SQLite store with ``--alerts`` alerts spread over a year,
+inserted in tick-sized batches the way the alert engine writes them. It
+then times reopening the store, reading the running counts, and fetching
+pages at the head, deep into the history, and filtered by vessel and by
+severity.
+
+    python -m benchmarks.bench_alerts --alerts 1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from fisherlink.alerts import EMERGENCY, AlertStore
+
+YEAR_S = 365 * 86400
+
+
+def best_ms(fn, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        began = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - began)
+    return best * 1000
+
+
+def run(alerts, batch, vessels, seed):
+    rng = np.random.default_rng(seed)
+    path = os.path.join(tempfile.mkdtemp(prefix="fisherlink-alerts-"), "alerts.sqlite")
+    start = time.time() - YEAR_S
+    store = AlertStore(path)
+
+    types = ("Warning", "Boundary Alert", "Emergency", "Resolved")
+    severities = (1, 1, 2, 0)
+    began = time.perf_counter()
+    for first in range(0, alerts, batch):
+        count = min(batch, alerts - first)
+        kinds = rng.integers(0, len(types), count)
+        ids = rng.integers(1, vessels + 1, count)
+        store.add_many(
+            [(types[k], severities[k], f"alert {first + i}", "raised", None, int(v))
+             for i, (k, v) in enumerate(zip(kinds, ids))],
+            now=start + YEAR_S * first / alerts,
+        )
+    insert_s = time.perf_counter() - began
+    store.close()
+
+    began = time.perf_counter()
+    store = AlertStore(path)
+    open_ms = (time.perf_counter() - began) * 1000
+
+    # A cursor halfway through the history, reached by id as a client would after paging
+    deep_cursor = alerts // 2
+    result = {
+        "alerts": alerts,
+        "file_mb": os.path.getsize(path) / 2**20,
+        "insert_per_s": alerts / insert_s,
+        "open_ms": open_ms,
+        "counts_ms": best_ms(lambda: (store.type_counts(), store.severity_counts())),
+        "first_page_ms": best_ms(lambda: store.page()),
+        "deep_page_ms": best_ms(lambda: store.page(cursor=deep_cursor)),
+        "vessel_page_ms": best_ms(lambda: store.page(vessel_id=vessels // 2)),
+        "emergency_page_ms": best_ms(lambda: store.page(severity=EMERGENCY, cursor=deep_cursor)),
+        "last_week_page_ms": best_ms(lambda: store.page(since=time.time() - 7 * 86400)),
+    }
+    store.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=50, help="alerts per engine tick")
+    parser.add_argument("--vessels", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    result = run(args.alerts, args.batch, args.vessels, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"{result['alerts']:,} alerts over a year, {result['file_mb']:.0f} MB on disk")
+    print(f"  insert            {result['insert_per_s']:>10,.0f} alerts/s")
+    for key, label in (("open_ms", "reopen"), ("counts_ms", "counts"), ("first_page_ms", "first page"),
+                       ("deep_page_ms", "page mid-year"), ("vessel_page_ms", "vessel page"),
+                       ("emergency_page_ms", "emergency page"), ("last_week_page_ms", "last week page")):
+        print(f"  {label:<17} {result[key]:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Track archive write throughput and query latency.
+
+Fills a temporary archive with synthetic tracks (a random walk per vessel
+reported every ``--interval-s`` seconds over ``--days`` days), then times
+the two archive queries against a naive full scan that reads every file
+and filters in pandas.
+
+    python -m benchmarks.bench_archive --vessels 200 --days 7
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from fisherlink.archive import TrackArchive
+from fisherlink.fleet import generate_fleet
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def fill(archive, vessels, days, interval_s, seed):
+    fleet = generate_fleet(vessels, seed=seed)
+    rng = np.random.default_rng(seed)
+    start = np.floor(time.time() / 86400) * 86400 - days * 86400
+    ticks = int(days * 86400 / interval_s)
+    began = time.perf_counter()
+    for tick in range(ticks):
+        now = start + tick * interval_s
+        fleet.lat += rng.normal(0, 0.001, vessels)
+        fleet.lon += rng.normal(0, 0.001, vessels)
+        fleet.last_update[:] = now
+        archive.append(fleet, now=now)
+    archive.flush()
+    # Compact the finished days as the maintenance thread would
+    archive.maintain()
+    return start, ticks * vessels, time.perf_counter() - began
+
+
+def full_scan(root):
+    files = [os.path.join(d, f) for d, _, names in os.walk(root) for f in names if f.endswith(".parquet")]
+    return pd.concat([pd.read_parquet(path) for path in files], ignore_index=True)
+
+
+def run(vessels, days, interval_s, repeats, seed):
+    root = tempfile.mkdtemp(prefix="fisherlink-archive-")
+    try:
+        archive = TrackArchive(root)
+        start, rows, write_s = fill(archive, vessels, days, interval_s, seed)
+        disk = sum(os.path.getsize(os.path.join(d, f)) for d, _, names in os.walk(root) for f in names)
+
+        vessel_id = vessels // 2
+        t1 = start + (days - 2) * 86400 + 3600
+        t2 = t1 + 6 * 3600
+        bbox = (12.0, 79.8, 13.0, 80.6)
+
+        track, track_s = timed(lambda: archive.vessel_track(vessel_id, t1, t2), repeats)
+        snap, snap_s = timed(lambda: archive.vessels_in_bbox(bbox, t2, window_s=interval_s), repeats)
+
+        def naive_track():
+            frame = full_scan(root)
+            mask = (frame.vessel_id == vessel_id) & (frame.timestamp >= t1) & (frame.timestamp <= t2)
+            return frame[mask]
+        naive, naive_s = timed(naive_track, 1)
+        assert len(naive) == len(track)
+
+        return {
+            "vessels": vessels,
+            "days": days,
+            "rows": rows,
+            "write_rows_per_s": rows / write_s,
+            "disk_bytes": disk,
+            "vessel_track_s": track_s,
+            "vessel_track_rows": len(track),
+            "bbox_at_t_s": snap_s,
+            "bbox_at_t_rows": len(snap),
+            "full_scan_s": naive_s,
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def print_table(result):
+    print(f"{result['rows']:,} rows ({result['vessels']} vessels x {result['days']} days), "
+          f"{result['disk_bytes'] / 1e6:.1f} MB on disk, written at {result['write_rows_per_s']:,.0f} rows/s")
+    print(f"{'query':<24}{'ms':>10}{'rows':>10}")
+    print(f"{'vessel between t1, t2':<24}{result['vessel_track_s'] * 1000:>10.1f}{result['vessel_track_rows']:>10}")
+    print(f"{'vessels in bbox at t':<24}{result['bbox_at_t_s'] * 1000:>10.1f}{result['bbox_at_t_rows']:>10}")
+    print(f"{'full scan (reference)':<24}{result['full_scan_s'] * 1000:>10.1f}{result['vessel_track_rows']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vessels", type=int, default=200)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--interval-s", type=float, default=60.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    result = run(args.vessels, args.days, args.interval_s, args.repeats, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_table(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Alert fan-out: time to reach every vessel, fleet topic vs per-vessel sends.
+
+Simulated vessels (:class:`fisherlink.broadcast.FakeVessels`) sit behind
+the in-process transport. They lose ``--loss`` of the alerts they receive
+and ack after ``--latency-ms`` plus up to ``--jitter-ms``. For each fleet
+size the same alert is broadcast twice. The fleet-wide mode sends one
+publish on the fleet topic, then per-vessel retries. The per-vessel mode
+sends one publish per vessel from the start.
+
+    python -m benchmarks.bench_broadcast --fleet-sizes 1000 10000 --loss 0.02
+"""
+import argparse
+import json
+
+from fisherlink.broadcast import Broadcaster, FakeVessels
+from fisherlink.telemetry import FakeTransport
+
+
+def run(fleet_sizes, loss, latency_ms, jitter_ms, ack_timeout_s, batch_size, seed):
+    results = []
+    for size in fleet_sizes:
+        for fleet_wide in (True, False):
+            transport = FakeTransport()
+            vessel_ids = range(1, size + 1)
+            FakeVessels(transport, vessel_ids, loss=loss, latency_s=latency_ms / 1000, jitter_s=jitter_ms / 1000,
+                        seed=seed)
+            broadcaster = Broadcaster(transport, batch_size=batch_size, ack_timeout_s=ack_timeout_s)
+            delivery = broadcaster.send("Tsunami Warning", "Move to higher ground", vessel_ids, severity=2,
+                                        fleet_wide=fleet_wide)
+            delivery.done.wait()
+            broadcaster.close()
+            results.append({"vessels": size, "mode": "fleet topic" if fleet_wide else "per vessel",
+                            **delivery.summary()})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--loss", type=float, default=0.02, help="fraction of alerts a vessel misses")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=200)
+    parser.add_argument("--ack-timeout-s", type=float, default=1.0)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = run(args.fleet_sizes, args.loss, args.latency_ms, args.jitter_ms, args.ack_timeout_s,
+                  args.batch_size, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'vessels':>8} {'mode':<12} {'messages':>9} {'acked':>8} {'attempts':>8} {'ack p50 s':>9} "
+          f"{'ack p95 s':>9} {'reach all s':>11}")
+    for row in results:
+        reach = f"{row['reach_all_s']:.2f}" if row["reach_all_s"] is not None else "-"
+        print(f"{row['vessels']:>8,} {row['mode']:<12} {row['messages_sent']:>9,} {row['acked']:>8,} "
+              f"{row['max_attempts_used']:>8} {row['ack_p50_s']:>9.2f} {row['ack_p95_s']:>9.2f} {reach:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Vessel card grid: markup per refresh, full grid vs one memoized page.
+
+"full grid" renders a card for every vessel on every refresh, as the Boat
+Details view used to. "page cold" renders one page of
+:data:`CARDS_PER_PAGE` cards after a tick, when every vessel has changed.
+"page warm" is the same page for the next session or rerun within the
+tick, served from the :class:`HtmlCache`. "telemetry" steps only
+``--reporting`` of the fleet between refreshes, as a telemetry-driven
+fleet does, and renders the page again.
+
+    python -m benchmarks.bench_cards --fleet-sizes 5000 100000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from fisherlink.cards import CARDS_PER_PAGE, HtmlCache, card_grid_html, card_html
+from fisherlink.fleet import VesselRecords, generate_fleet, step_fleet
+
+
+def best_ms(fn, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        began = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - began)
+    return best * 1000, result
+
+
+def run(fleet_sizes, reporting, seed):
+    results = []
+    for size in fleet_sizes:
+        fleet = generate_fleet(size, seed=seed)
+        step_fleet(fleet)
+        rows = np.arange(min(CARDS_PER_PAGE, size))
+
+        full_ms, full = best_ms(lambda: card_grid_html([card_html(boat) for boat in VesselRecords(fleet)]), 1)
+        cache = HtmlCache(card_html)
+        cold_ms, page = best_ms(lambda: card_grid_html(cache.many(fleet, rows)), 1)
+        warm_ms, _ = best_ms(lambda: card_grid_html(cache.many(fleet, rows)))
+
+        # Telemetry: a fraction of the vessels report and get a new last_update
+        rng = np.random.default_rng(seed)
+        fleet.last_update[rng.random(size) < reporting] += 1.0
+        misses = cache.misses
+        telemetry_ms, _ = best_ms(lambda: card_grid_html(cache.many(fleet, rows)), 1)
+        results.append({
+            "vessels": size,
+            "full_grid_kb": len(full) / 1024,
+            "page_kb": len(page) / 1024,
+            "full_grid_ms": full_ms,
+            "page_cold_ms": cold_ms,
+            "page_warm_ms": warm_ms,
+            "telemetry_ms": telemetry_ms,
+            "telemetry_rerendered": cache.misses - misses,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=[5_000, 100_000])
+    parser.add_argument("--reporting", type=float, default=0.1, help="fraction of vessels reporting per tick")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = run(args.fleet_sizes, args.reporting, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'vessels':>8} {'grid KB':>9} {'page KB':>8} {'grid ms':>9} {'cold ms':>8} {'warm ms':>8} "
+          f"{'telem ms':>8} {'rerendered':>10}")
+    for row in results:
+        print(f"{row['vessels']:>8,} {row['full_grid_kb']:>9,.0f} {row['page_kb']:>8.1f} {row['full_grid_ms']:>9.1f} "
+              f"{row['page_cold_ms']:>8.3f} {row['page_warm_ms']:>8.3f} {row['telemetry_ms']:>8.3f} "
+              f"{row['telemetry_rerendered']:>10}")
+
+
+if __name__ == "__main__":
+    main()
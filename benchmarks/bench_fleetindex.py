@@ -0,0 +1,101 @@
+"""Boat Details filtering: :class:`FleetIndex` vs scanning vessel records.
+
+"records" is the filter chain the Boat Details view used to run: list
+comprehensions over the vessel records, and a linear ``next(...)`` scan
+to find the selected vessel. "index" is :meth:`FleetIndex.query` and
+:meth:`FleetIndex.row`. Each query is checked against the records
+result. The name index is built once per fleet. The rest of the index
+(id map and bitmaps) is rebuilt for every snapshot, and its build time
+is reported per tick.
+
+    python -m benchmarks.bench_fleetindex --fleet-sizes 10000 100000
+"""
+import argparse
+import json
+import time
+
+from fisherlink.fleet import VesselRecords, generate_fleet, step_fleet
+from fisherlink.fleetindex import FleetIndex, NameIndex
+
+QUERIES = {
+    "risk": ("Low Risk", None, None),
+    "risk+status": ("Low Risk", "Safe", None),
+    "short search": (None, None, "se"),
+    "long search": (None, None, "explorer-12"),
+    "all filters": ("Low Risk", "Safe", "wave"),
+    "id": (None, None, "4242"),
+}
+
+
+def records_query(boats, risk, status, search):
+    filtered = boats
+    if risk == "High Risk":
+        filtered = [b for b in filtered if b["risk_level"] > 0.7]
+    elif risk == "Medium Risk":
+        filtered = [b for b in filtered if 0.3 <= b["risk_level"] <= 0.7]
+    elif risk == "Low Risk":
+        filtered = [b for b in filtered if b["risk_level"] < 0.3]
+    if status is not None:
+        filtered = [b for b in filtered if b["safety_status"] == status]
+    if search:
+        filtered = [b for b in filtered if search.lower() in b["name"].lower() or search == str(b["id"])]
+    return [b["id"] for b in filtered]
+
+
+def best_ms(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        began = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - began)
+    return best * 1000, result
+
+
+def run(fleet_sizes, seed):
+    results = []
+    for size in fleet_sizes:
+        fleet = generate_fleet(size, seed=seed)
+        step_fleet(fleet)
+        boats = list(VesselRecords(fleet))
+        names_ms, names = best_ms(lambda: NameIndex(fleet.names), 1)
+        tick_ms, index = best_ms(lambda: FleetIndex(fleet, names))
+        row = {"vessels": size, "name_index_ms": names_ms, "index_per_tick_ms": tick_ms, "queries": {}}
+        for label, query in QUERIES.items():
+            scan_ms, expected = best_ms(lambda: records_query(boats, *query), 1)
+            index_ms, rows = best_ms(lambda: index.query(*query))
+            row["queries"][label] = {
+                "matches": len(rows),
+                "records_ms": scan_ms,
+                "index_ms": index_ms,
+                "same": fleet.ids[rows].tolist() == expected,
+            }
+        vessel_id = int(fleet.ids[-1])
+        row["lookup_scan_ms"], _ = best_ms(lambda: next(i for i, b in enumerate(boats) if b["id"] == vessel_id), 1)
+        row["lookup_index_us"] = best_ms(lambda: index.row(vessel_id))[0] * 1000
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = run(args.fleet_sizes, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for row in results:
+        print(f"{row['vessels']:,} vessels: name index {row['name_index_ms']:.0f} ms once, "
+              f"{row['index_per_tick_ms']:.2f} ms per tick; id lookup {row['lookup_scan_ms']:.2f} ms scan, "
+              f"{row['lookup_index_us']:.2f} us index")
+        print(f"  {'query':<13} {'matches':>8} {'records ms':>11} {'index ms':>9} {'same':>5}")
+        for label, query in row["queries"].items():
+            print(f"  {label:<13} {query['matches']:>8,} {query['records_ms']:>11.1f} {query['index_ms']:>9.3f} "
+                  f"{'yes' if query['same'] else 'NO':>5}")
+
+
+if __name__ == "__main__":
+    main()
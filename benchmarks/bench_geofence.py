@@ -0,0 +1,126 @@
+"""Accuracy and throughput of the geofence distance implementations.
+
+Compares the legacy per-boat ``distance_to_geofence`` (nearest vertex,
+geopy) and the polygon ``GeofenceEngine`` against an exact reference: the
+planar point-to-polyline distance computed by brute force with shapely.
+
+    python -m benchmarks.bench_geofence --points 20000 --coast-vertices 40000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import shapely
+
+from fisherlink.geo import COASTAL_COORDS, GEOFENCE_KM, distance_to_geofence
+from fisherlink.geofence import GeofenceEngine
+
+# Sea area sampled for test positions
+LAT_RANGE = (11.8, 13.3)
+LON_RANGE = (79.9, 80.9)
+
+
+def densify(coords, num_vertices):
+    """Linearly resample a coastline to roughly ``num_vertices`` vertices."""
+    coords = np.asarray(coords, dtype=float)
+    if num_vertices <= len(coords):
+        return coords
+    step = np.hypot(*np.diff(coords, axis=0).T)
+    along = np.concatenate([[0.0], np.cumsum(step)])
+    samples = np.linspace(0.0, along[-1], num_vertices)
+    return np.column_stack([np.interp(samples, along, coords[:, 0]), np.interp(samples, along, coords[:, 1])])
+
+
+def reference_distance(engine, lat, lon):
+    """Exact signed distance to the geofence boundary (slow, brute force)."""
+    x, y = engine.projection.forward(lat, lon)
+    return engine.width_km - shapely.distance(engine.coastline, shapely.points(x, y))
+
+
+def error_stats(estimate, reference):
+    error = np.abs(estimate - reference)
+    return {
+        "mean_abs_error_km": float(error.mean()),
+        "p95_abs_error_km": float(np.percentile(error, 95)),
+        "max_abs_error_km": float(error.max()),
+        "inside_outside_mismatch": float(np.mean((estimate > 0) != (reference > 0))),
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(num_points, legacy_points, coast_vertices, seed):
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(*LAT_RANGE, num_points)
+    lon = rng.uniform(*LON_RANGE, num_points)
+
+    results = {"points": num_points, "coast_vertices": len(COASTAL_COORDS), "methods": {}}
+    engine = GeofenceEngine()
+    reference = reference_distance(engine, lat, lon)
+
+    # Legacy scalar function is far too slow for the full sample
+    legacy_lat, legacy_lon = lat[:legacy_points], lon[:legacy_points]
+    legacy, elapsed = timed(lambda: np.array([distance_to_geofence(a, b) for a, b in zip(legacy_lat, legacy_lon)]))
+    results["methods"]["legacy_distance_to_geofence"] = {
+        "points_per_s": legacy_points / elapsed,
+        **error_stats(legacy, reference[:legacy_points]),
+    }
+
+    estimate, elapsed = timed(engine.signed_distance, lat, lon)
+    results["methods"]["geofence_engine"] = {"points_per_s": num_points / elapsed, **error_stats(estimate, reference)}
+
+    _, elapsed = timed(engine.contains, lat, lon)
+    results["methods"]["geofence_engine"]["contains_points_per_s"] = num_points / elapsed
+
+    if coast_vertices:
+        # Throughput on a densified coastline, where the legacy scan would grow linearly
+        dense = densify(COASTAL_COORDS, coast_vertices)
+        dense_engine, build = timed(GeofenceEngine, dense, GEOFENCE_KM)
+        _, elapsed = timed(dense_engine.signed_distance, lat, lon)
+        results["dense_coastline"] = {
+            "coast_vertices": len(dense),
+            "build_s": build,
+            "geofence_engine_points_per_s": num_points / elapsed,
+        }
+    return results
+
+
+def print_table(results):
+    print(f"{results['points']} positions, {results['coast_vertices']} coastal vertices")
+    print(f"{'method':<30}{'points/s':>14}{'mean err km':>14}{'max err km':>14}{'in/out mismatch':>18}")
+    for name, stats in results["methods"].items():
+        print(
+            f"{name:<30}{stats['points_per_s']:>14,.0f}{stats['mean_abs_error_km']:>14.3f}"
+            f"{stats['max_abs_error_km']:>14.3f}{stats['inside_outside_mismatch']:>18.2%}"
+        )
+    if "dense_coastline" in results:
+        dense = results["dense_coastline"]
+        print(
+            f"densified to {dense['coast_vertices']} vertices: build {dense['build_s']:.2f}s, "
+            f"{dense['geofence_engine_points_per_s']:,.0f} points/s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--legacy-points", type=int, default=500)
+    parser.add_argument("--coast-vertices", type=int, default=40000, help="0 to skip the densified run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = run(args.points, min(args.legacy_points, args.points), args.coast_vertices, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
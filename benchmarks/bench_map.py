@@ -0,0 +1,101 @@
+"""Per-rerun map rendering cost: full folium rebuild vs cached base + vessel layer.
+
+"Before" is the original ``create_map`` path: build every folium layer and
+serialize the whole document on each rerun. "After" renders the static
+base map once and, per rerun, only regenerates the vessel layer script
+and splices it into the cached document. "Deck" is the large-fleet mode:
+one pydeck point layer serialized from the columnar fleet arrays.
+
+    python -m benchmarks.bench_map --fleet-sizes 15 200 1000
+    python -m benchmarks.bench_map --fleet-sizes 1000 10000 --skip-before
+"""
+import argparse
+import json
+import time
+import warnings
+
+from benchmarks.legacy import fleet_to_boats, sync_boats
+from fisherlink.deckmap import fleet_deck
+from fisherlink.fleet import generate_fleet, step_fleet
+from fisherlink.history import HistoryBuffer
+from fisherlink.mapview import base_map_html, compose_map_html, create_map, render_html, vessel_layer_script
+
+# Ticks simulated before measuring so every boat has a full trail
+WARMUP_TICKS = 10
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def run(fleet_sizes, repeats, seed, skip_before=False):
+    base, base_build_s = timed(base_map_html, 1)
+    base_html, map_name = base
+    results = {"base_build_s": base_build_s, "base_bytes": len(base_html.encode()), "fleets": []}
+
+    for size in fleet_sizes:
+        fleet = generate_fleet(size, seed=seed)
+        boats = fleet_to_boats(fleet)
+        history = HistoryBuffer(size)
+        history.record(fleet)
+        for _ in range(WARMUP_TICKS):
+            sync_boats(step_fleet(fleet), boats)
+            history.record(fleet)
+
+        row = {"vessels": size, "before_s": None, "before_bytes": None}
+        if not skip_before:
+            legacy_html, row["before_s"] = timed(lambda: render_html(create_map(boats, history)), repeats)
+            row["before_bytes"] = len(legacy_html.encode())
+        cached_html, row["after_s"] = timed(
+            lambda: compose_map_html(base_html, vessel_layer_script(map_name, boats, history)), repeats
+        )
+        row["after_bytes"] = len(cached_html.encode())
+        deck_json, row["deck_s"] = timed(lambda: fleet_deck(fleet).to_json(), repeats)
+        row["deck_bytes"] = len(deck_json.encode())
+        results["fleets"].append(row)
+    return results
+
+
+def print_table(results):
+    print(f"base map: built once in {results['base_build_s'] * 1000:.1f} ms, {results['base_bytes'] / 1024:.1f} KB")
+    print(
+        f"{'vessels':>8}{'before ms':>12}{'before KB':>12}{'after ms':>12}{'after KB':>12}"
+        f"{'deck ms':>12}{'deck KB':>12}"
+    )
+    for row in results["fleets"]:
+        if row["before_s"] is None:
+            before = f"{'-':>12}{'-':>12}"
+        else:
+            before = f"{row['before_s'] * 1000:>12.1f}{row['before_bytes'] / 1024:>12.1f}"
+        print(
+            f"{row['vessels']:>8}{before}"
+            f"{row['after_s'] * 1000:>12.1f}{row['after_bytes'] / 1024:>12.1f}"
+            f"{row['deck_s'] * 1000:>12.1f}{row['deck_bytes'] / 1024:>12.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=[15, 200, 1000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-before", action="store_true", help="skip the full folium rebuild (slow at 10k+)")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = run(args.fleet_sizes, args.repeats, args.seed, args.skip_before)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Sector-partitioned multi-process stepping vs the single-process step.
+
+For each fleet size, times ``step_fleet`` in one process, then
+:class:`fisherlink.parallel.ParallelStepper` at each worker count, and
+reports steps/s and the speedup over the single-process step. It also
+checks that every worker count produces bit-identical fleets for the same
+seed.
+
+    python -m benchmarks.bench_parallel --fleet-sizes 10000 100000 --workers 1 2 4
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from fisherlink.fleet import generate_fleet, step_fleet
+from fisherlink.parallel import SECTORS, ParallelStepper
+
+DIGEST_FIELDS = ("lat", "lon", "speed", "heading", "fuel_level", "risk_level", "engine_status",
+                 "communication_status", "safety_status")
+
+
+def digest(fleet):
+    h = hashlib.sha256()
+    for name in DIGEST_FIELDS:
+        h.update(np.ascontiguousarray(getattr(fleet, name)).tobytes())
+    return h.hexdigest()[:16]
+
+
+def timed_steps(step, steps):
+    step()  # warm-up: worker start-up and per-process geofence build
+    began = time.perf_counter()
+    for _ in range(steps):
+        step()
+    return steps / (time.perf_counter() - began)
+
+
+def run(fleet_sizes, worker_counts, steps, sectors, seed):
+    results = {"cpus": os.cpu_count(), "sectors": sectors, "fleets": []}
+    for size in fleet_sizes:
+        fleet = generate_fleet(size, seed=seed)
+        serial = timed_steps(lambda: step_fleet(fleet), steps)
+        row = {"vessels": size, "serial_steps_per_s": serial, "parallel": []}
+        digests = set()
+        for workers in worker_counts:
+            fleet = generate_fleet(size, seed=seed)
+            with ParallelStepper(fleet, workers=workers, sectors=sectors) as stepper:
+                rate = timed_steps(stepper.step, steps)
+                digests.add(digest(fleet))
+            row["parallel"].append({"workers": workers, "steps_per_s": rate, "speedup": rate / serial})
+        row["deterministic"] = len(digests) == 1
+        results["fleets"].append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--sectors", type=int, default=SECTORS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    result = run(args.fleet_sizes, args.workers, args.steps, args.sectors, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"{result['cpus']} CPUs, {result['sectors']} sectors")
+    for row in result["fleets"]:
+        print(f"{row['vessels']:,} vessels: serial {row['serial_steps_per_s']:.2f} steps/s, "
+              f"deterministic across worker counts: {row['deterministic']}")
+        for entry in row["parallel"]:
+            print(f"  {entry['workers']:>3} workers  {entry['steps_per_s']:>8.2f} steps/s  "
+                  f"x{entry['speedup']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
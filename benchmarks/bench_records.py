@@ -0,0 +1,85 @@
+"""Memory per vessel: boat dicts vs array-backed :class:`Vessel` views.
+
+"dicts" is the record list the dashboard used to build every tick
+(:func:`benchmarks.legacy.fleet_to_boats`, one 15-key dict per vessel). "arrays" is the
+:class:`FleetState` itself, and "views" is a :class:`VesselRecords` with
+every :class:`Vessel` view materialized at once, which is the worst case,
+since views are normally created on access and dropped. Memory is the
+tracemalloc growth while building each one. Lookup time is one
+``record["risk_level"]`` read.
+
+    python -m benchmarks.bench_records --fleet-sizes 10000 100000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.legacy import fleet_to_boats
+from fisherlink.fleet import VesselRecords, generate_fleet, step_fleet
+
+
+def traced(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    began = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - began
+    grown = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, grown, elapsed
+
+
+def lookup_ns(records, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        began = time.perf_counter()
+        for record in records:
+            record["risk_level"]
+        best = min(best, time.perf_counter() - began)
+    return best / len(records) * 1e9
+
+
+def run(fleet_sizes, seed):
+    results = []
+    for size in fleet_sizes:
+        fleet, fleet_bytes, _ = traced(lambda: generate_fleet(size, seed=seed))
+        step_fleet(fleet)
+        boats, dict_bytes, dict_s = traced(lambda: fleet_to_boats(fleet))
+        views, view_bytes, view_s = traced(lambda: list(VesselRecords(fleet)))
+        results.append({
+            "vessels": size,
+            "dict_bytes_per_vessel": dict_bytes / size,
+            "array_bytes_per_vessel": fleet_bytes / size,
+            "view_bytes_per_vessel": view_bytes / size,
+            "dict_build_ms": dict_s * 1000,
+            "records_build_ms": traced(lambda: VesselRecords(fleet))[2] * 1000,
+            "dict_lookup_ns": lookup_ns(boats),
+            "view_lookup_ns": lookup_ns(views),
+        })
+        del boats, views
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = run(args.fleet_sizes, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'vessels':>8} {'dict B':>8} {'array B':>8} {'view B':>8} {'dicts ms':>9} {'records ms':>10} "
+          f"{'dict ns':>8} {'view ns':>8}")
+    for row in results:
+        print(f"{row['vessels']:>8,} {row['dict_bytes_per_vessel']:>8.0f} {row['array_bytes_per_vessel']:>8.0f} "
+              f"{row['view_bytes_per_vessel']:>8.0f} {row['dict_build_ms']:>9.1f} {row['records_build_ms']:>10.3f} "
+              f"{row['dict_lookup_ns']:>8.0f} {row['view_lookup_ns']:>8.0f}")
+    print("(bytes per vessel; dict and view lookups are one record['risk_level'] read)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Timed view refresh: data age and cadence, polling vs waiting for pushed ticks.
+
+Runs a :class:`FleetService` ticking every ``--interval`` seconds, and
+``--sessions`` simulated dashboard sessions. Each session refreshes on
+its own timer, like a fragment with ``run_every``, starting at a random
+phase. A polling session renders whatever snapshot is current when its
+timer fires. A push session calls ``fresh_snapshot(--wait)`` instead, as
+the dashboard's live views do, so it waits for the next tick when that
+tick is due within ``--wait`` seconds. Every refresh is recorded in a
+:class:`RefreshMonitor`, and the render is a sleep of ``--render-ms``.
+
+    python -m benchmarks.bench_refresh --interval 5 --duration 60
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+import numpy as np
+
+from fisherlink.refresh import REFRESH_WAIT_S, RefreshMonitor
+from fisherlink.service import FleetService
+
+
+def session(service, monitor, push, wait_s, render_s, stop, phase_s):
+    due = time.monotonic() + phase_s
+    while not stop.wait(max(0.0, due - time.monotonic())):
+        due += monitor.target_s
+        snapshot = service.fresh_snapshot(wait_s) if push else service.snapshot()
+        began = time.monotonic()
+        time.sleep(render_s)
+        monitor.record(snapshot.published, time.monotonic() - began)
+
+
+def run(vessels, interval, wait, sessions, duration, render_ms, seed):
+    rng = random.Random(seed)
+    results = []
+    for push in (False, True):
+        service = FleetService(vessels, seed=seed, interval_s=interval).start()
+        stop = threading.Event()
+        monitors = [RefreshMonitor(interval) for _ in range(sessions)]
+        threads = [
+            threading.Thread(target=session, daemon=True, args=(
+                service, monitor, push, wait, render_ms / 1000, stop,
+                rng.uniform(0, interval),
+            ))
+            for monitor in monitors
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        service.stop()
+
+        intervals = np.concatenate([list(m.intervals) for m in monitors])
+        ages = np.concatenate([list(m.ages) for m in monitors])
+        results.append({
+            "mode": "push" if push else "poll",
+            "target_s": interval,
+            "refreshes": int(sum(len(m.ages) for m in monitors)),
+            "interval_p50_s": float(np.percentile(intervals, 50)),
+            "interval_p95_s": float(np.percentile(intervals, 95)),
+            "age_p50_s": float(np.percentile(ages, 50)),
+            "age_p95_s": float(np.percentile(ages, 95)),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vessels", type=int, default=2_000)
+    parser.add_argument("--interval", type=float, default=2.0, help="tick and refresh interval, seconds")
+    parser.add_argument("--wait", type=float, default=REFRESH_WAIT_S, help="longest wait for a due tick, seconds")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per mode")
+    parser.add_argument("--render-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = run(args.vessels, args.interval, args.wait, args.sessions, args.duration, args.render_ms, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<5} {'target s':>8} {'refreshes':>9} {'interval p50':>12} {'interval p95':>12} "
+          f"{'age p50 s':>9} {'age p95 s':>9}")
+    for row in results:
+        print(f"{row['mode']:<5} {row['target_s']:>8g} {row['refreshes']:>9} {row['interval_p50_s']:>12.3f} "
+              f"{row['interval_p95_s']:>12.3f} {row['age_p50_s']:>9.3f} {row['age_p95_s']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
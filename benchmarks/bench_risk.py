@@ -0,0 +1,61 @@
+"""Risk scoring latency for the baseline formula and the trained model.
+
+Each repeat scores the whole fleet in one batched call, as a simulation
+tick does (``assess_risk`` over every vessel). Latency is reported per
+call and normalised to 10k vessels.
+
+    python -m benchmarks.bench_risk --fleet-size 10000 --repeats 200
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from fisherlink.fleet import ENV_RISK_RANGE, generate_fleet
+from fisherlink.risk import BaselineRiskModel, LogisticRiskModel
+
+
+def run(fleet_size, repeats, seed, model_path=None):
+    fleet = generate_fleet(fleet_size, seed=seed)
+    env_risk = np.random.default_rng(seed).uniform(*ENV_RISK_RANGE, fleet_size)
+    models = [BaselineRiskModel(), LogisticRiskModel.load(model_path) if model_path else LogisticRiskModel.load()]
+    results = {"fleet_size": fleet_size, "repeats": repeats, "models": {}}
+    for model in models:
+        timings = []
+        for _ in range(repeats):
+            began = time.perf_counter()
+            model.score(geofence_distance=fleet.geofence_distance, fuel_level=fleet.fuel_level,
+                        operation_time=fleet.operation_time, speed=fleet.speed, heading=fleet.heading,
+                        env_risk=env_risk)
+            timings.append(time.perf_counter() - began)
+        timings = np.array(timings) * 1000
+        results["models"][model.name] = {
+            "p50_ms": float(np.percentile(timings, 50)),
+            "p95_ms": float(np.percentile(timings, 95)),
+            "p50_ms_per_10k": float(np.percentile(timings, 50) * 10_000 / fleet_size),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet-size", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--model", help="model JSON (default: the shipped logistic model)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    result = run(args.fleet_size, args.repeats, args.seed, args.model)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"{result['fleet_size']:,} vessels, {result['repeats']} batched calls per model")
+    print(f"  {'model':<10} {'p50 ms':>9} {'p95 ms':>9} {'ms / 10k':>9}")
+    for name, timing in result["models"].items():
+        print(f"  {name:<10} {timing['p50_ms']:>9.2f} {timing['p95_ms']:>9.2f} {timing['p50_ms_per_10k']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
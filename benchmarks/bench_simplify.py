@@ -0,0 +1,102 @@
+"""Detail views: raw vessel history vs simplified tracks and downsampled risk series.
+
+A few vessels are stepped ``--samples`` times with one history sample per
+simulated minute, as a day of retention stores them. "raw" is what the
+Boat Details view used to draw: every stored position in the mini map and
+every risk sample in the chart. "simplified" is
+:meth:`TrackCache.track` at each ``--zooms`` level and
+:meth:`TrackCache.risk_series`. Mini-map size is the rendered
+:func:`trajectory_map_html` markup. "warm" is the next session or rerun
+asking for the same vessel before its history changes.
+
+    python -m benchmarks.bench_simplify --samples 100 1440 10000
+"""
+import argparse
+import json
+import time
+
+from fisherlink.fleet import Vessel, generate_fleet, step_fleet
+from fisherlink.history import HistoryBuffer
+from fisherlink.mapview import MINI_MAP_ZOOM, trajectory_map_html
+from fisherlink.simplify import TrackCache
+
+VESSELS = 8
+
+
+def best_ms(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        began = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - began)
+    return best * 1000, result
+
+
+def run(sample_counts, zooms, seed):
+    results = []
+    for samples in sample_counts:
+        fleet = generate_fleet(VESSELS, seed=seed)
+        history = HistoryBuffer(VESSELS, capacity=samples)
+        for minute in range(samples):
+            step_fleet(fleet)
+            fleet.last_update[:] = minute * 60.0
+            history.record(fleet)
+
+        row, vessel_id = 0, int(fleet.ids[0])
+        boat = Vessel(fleet, row)
+        raw = history.positions(row)
+        raw_html = trajectory_map_html(boat, raw)
+        entry = {
+            "samples": samples,
+            "raw_points": len(raw),
+            "raw_map_kb": len(raw_html) / 1024,
+            "tracks": {},
+        }
+        for zoom in zooms:
+            # A fresh cache per measurement so every repeat simplifies from scratch
+            cold_ms, track = best_ms(lambda: TrackCache().track(history, row, vessel_id, zoom))
+            entry["tracks"][zoom] = {"points": len(track), "simplify_ms": cold_ms}
+        mini_track = TrackCache().track(history, row, vessel_id, MINI_MAP_ZOOM)
+        entry["map_kb"] = len(trajectory_map_html(boat, mini_track)) / 1024
+
+        series_ms, (times, risk) = best_ms(lambda: TrackCache().risk_series(history, row, vessel_id))
+        raw_risk = history.risk_levels(row)
+        entry.update({
+            "raw_series_points": len(raw_risk),
+            "series_points": len(times),
+            "series_ms": series_ms,
+            "series_keeps_extremes": bool(risk.max() == raw_risk.max() and risk.min() == raw_risk.min()),
+        })
+
+        cache = TrackCache()
+        cache.track(history, row, vessel_id, MINI_MAP_ZOOM)
+        entry["warm_us"] = best_ms(lambda: cache.track(history, row, vessel_id, MINI_MAP_ZOOM))[0] * 1000
+        results.append(entry)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, nargs="+", default=[100, 1_440, 10_000],
+                        help="history samples per vessel")
+    parser.add_argument("--zooms", type=int, nargs="+", default=[6, MINI_MAP_ZOOM, 14])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = run(args.samples, args.zooms, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for entry in results:
+        print(f"{entry['samples']:,} samples: mini map {entry['raw_map_kb']:.0f} KB raw, "
+              f"{entry['map_kb']:.0f} KB simplified; risk chart {entry['raw_series_points']:,} -> "
+              f"{entry['series_points']} points in {entry['series_ms']:.2f} ms "
+              f"(min/max kept: {'yes' if entry['series_keeps_extremes'] else 'no'}); warm {entry['warm_us']:.1f} us")
+        print(f"  {'zoom':>4} {'points':>8} {'ms':>7}")
+        for zoom, track in entry["tracks"].items():
+            print(f"  {zoom:>4} {track['points']:>8,} {track['simplify_ms']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
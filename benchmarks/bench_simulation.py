@@ -0,0 +1,144 @@
+"""Headless simulation throughput, tick latency and peak memory per fleet size.
+
+Two phases are timed for each fleet size:
+
+* ``step``: :func:`fisherlink.fleet.step_fleet` alone (movement, geofence
+  distance, risk and status rules).
+* ``tick``: a full :meth:`fisherlink.service.FleetService.tick`, which also
+  records history, computes fleet statistics and publishes a snapshot.
+
+Peak memory is the tracemalloc high-water mark (NumPy buffers included)
+over building the service and running the ticks. It is measured in a
+separate pass, so the tracing overhead does not skew the timings.
+
+    python -m benchmarks.bench_simulation --fleet-sizes 15 1000 10000 100000 --output bench.json
+    python -m benchmarks.bench_simulation --compare bench.json  # exits 1 on a regression
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from fisherlink.fleet import step_fleet
+from fisherlink.service import FleetService
+
+FLEET_SIZES = (15, 1_000, 10_000, 100_000)
+
+# Metrics compared by --compare, and whether higher is better
+COMPARED = {"ticks_per_s": True, "tick_p95_ms": False, "step_p95_ms": False, "peak_mib": False}
+
+
+def _latency(samples_s):
+    ms = np.asarray(samples_s) * 1000
+    return {f"p{q}_ms": float(np.percentile(ms, q)) for q in (50, 95, 99)}
+
+
+def _timed_loop(fn, ticks, max_seconds):
+    # At least a few samples per phase, then stop at the tick count or the time budget
+    samples = []
+    deadline = time.perf_counter() + max_seconds
+    while len(samples) < ticks and (len(samples) < 5 or time.perf_counter() < deadline):
+        began = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - began)
+    return samples
+
+
+def run_size(size, ticks, max_seconds, seed):
+    began = time.perf_counter()
+    service = FleetService(size, seed=seed)
+    setup_s = time.perf_counter() - began
+
+    step = _timed_loop(lambda: step_fleet(service._fleet), ticks, max_seconds)
+    tick = _timed_loop(service.tick, ticks, max_seconds)
+
+    # Memory pass: a fresh service under tracemalloc
+    tracemalloc.start()
+    traced = FleetService(size, seed=seed)
+    for _ in range(min(ticks, 5)):
+        traced.tick()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "vessels": size,
+        "setup_s": setup_s,
+        "ticks": len(tick),
+        "ticks_per_s": len(tick) / sum(tick),
+        **{f"tick_{k}": v for k, v in _latency(tick).items()},
+        "steps": len(step),
+        **{f"step_{k}": v for k, v in _latency(step).items()},
+        "peak_mib": peak / 2**20,
+    }
+
+
+def run(fleet_sizes, ticks, max_seconds, seed):
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "streamlit_imported": "streamlit" in sys.modules,
+        "fleets": [run_size(size, ticks, max_seconds, seed) for size in fleet_sizes],
+    }
+
+
+def regressions(result, baseline, tolerance):
+    """Metrics more than ``tolerance`` (a fraction) worse than in ``baseline``."""
+    previous = {row["vessels"]: row for row in baseline["fleets"]}
+    found = []
+    for row in result["fleets"]:
+        before = previous.get(row["vessels"])
+        if before is None:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            old, new = before[metric], row[metric]
+            if not old:
+                continue
+            change = (old - new) / old if higher_is_better else (new - old) / old
+            if change > tolerance:
+                found.append(f"{row['vessels']:,} vessels: {metric} {old:.3g} -> {new:.3g} ({change:+.0%} worse)")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=list(FLEET_SIZES))
+    parser.add_argument("--ticks", type=int, default=100, help="ticks timed per phase")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="time budget per phase")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --output run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown, as a fraction")
+    args = parser.parse_args()
+
+    result = run(args.fleet_sizes, args.ticks, args.max_seconds, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{'vessels':>8} {'ticks/s':>9} {'tick p50':>9} {'tick p95':>9} {'tick p99':>9} "
+              f"{'step p50':>9} {'step p95':>9} {'peak MiB':>9}")
+        for row in result["fleets"]:
+            print(f"{row['vessels']:>8,} {row['ticks_per_s']:>9.1f} {row['tick_p50_ms']:>9.2f} "
+                  f"{row['tick_p95_ms']:>9.2f} {row['tick_p99_ms']:>9.2f} {row['step_p50_ms']:>9.2f} "
+                  f"{row['step_p95_ms']:>9.2f} {row['peak_mib']:>9.1f}")
+        print("(latencies in ms)")
+
+    if args.compare:
+        with open(args.compare) as f:
+            found = regressions(result, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
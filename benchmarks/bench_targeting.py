@@ -0,0 +1,88 @@
+"""Region-targeted alerts: recipient lookup with :class:`VesselIndex` vs a full scan.
+
+For each fleet size this builds the index over one stepped fleet. It then
+resolves the recipients of a radius, a polygon and a coastal segment
+region, with and without vessels forecast to enter within
+``--minutes``. The scan baseline runs the same exact containment test on
+every vessel, and the forecast case tests every vessel's track.
+
+    python -m benchmarks.bench_targeting --fleet-sizes 2000 100000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import shapely
+
+from fisherlink.fleet import generate_fleet, step_fleet
+from fisherlink.geo import destination_points
+from fisherlink.regions import CoastalSegment, PolygonRegion, RadiusRegion, VesselIndex
+
+REGIONS = {
+    "radius": RadiusRegion(12.6, 80.5, 5),
+    "polygon": PolygonRegion(((12.50, 80.40), (12.55, 80.40), (12.55, 80.48), (12.50, 80.48))),
+    "coastal": CoastalSegment(3, 5, 10),
+}
+
+
+def best_ms(fn, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        began = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - began)
+    return best * 1000, result
+
+
+def scan(index, region, minutes):
+    geometry = region.geometry(index.projection)
+    x, y = index._points.T
+    hits = shapely.contains_xy(geometry, x, y)
+    if minutes:
+        lat, lon = destination_points(index.lat, index.lon, index.speed_km_min * minutes, index.heading)
+        ends = np.column_stack(index.projection.forward(lat, lon))
+        hits |= shapely.intersects(geometry, shapely.linestrings(np.stack([index._points, ends], axis=1)))
+    return index.ids[hits]
+
+
+def run(fleet_sizes, minutes, seed):
+    results = []
+    for size in fleet_sizes:
+        fleet = generate_fleet(size, seed=seed)
+        step_fleet(fleet)
+        build_ms, index = best_ms(lambda: VesselIndex(fleet))
+        for name, region in REGIONS.items():
+            for window in (0, minutes):
+                index_ms, found = best_ms(lambda: index.recipients(region, window))
+                scan_ms, expected = best_ms(lambda: scan(index, region, window))
+                results.append({
+                    "vessels": size, "region": name, "minutes": window, "recipients": len(found),
+                    "build_ms": build_ms, "index_ms": index_ms, "scan_ms": scan_ms,
+                    "matches_scan": bool(np.array_equal(np.sort(found), np.sort(expected))),
+                })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=[2_000, 100_000])
+    parser.add_argument("--minutes", type=int, default=30, help="forecast window for entering vessels")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = run(args.fleet_sizes, args.minutes, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'vessels':>8} {'region':<8} {'min':>4} {'found':>7} {'build ms':>9} {'index ms':>9} {'scan ms':>8} "
+          f"{'same':>5}")
+    for row in results:
+        print(f"{row['vessels']:>8,} {row['region']:<8} {row['minutes']:>4} {row['recipients']:>7,} "
+              f"{row['build_ms']:>9.2f} {row['index_ms']:>9.2f} {row['scan_ms']:>8.2f} "
+              f"{'yes' if row['matches_scan'] else 'NO':>5}")
+
+
+if __name__ == "__main__":
+    main()
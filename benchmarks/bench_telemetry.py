@@ -0,0 +1,99 @@
+"""Telemetry ingestion throughput through the bounded queue.
+
+A producer thread publishes pre-encoded vessel reports through the
+in-process fake transport as fast as it can while the consumer applies
+them to the fleet in batches, the way ``FleetService.tick`` does. Reports
+are spread over the fleet so each batch touches many vessels.
+
+    python -m benchmarks.bench_telemetry --messages 200000 --fleet-size 10000
+"""
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+
+from fisherlink.fleet import generate_fleet
+from fisherlink.telemetry import REPORT_DTYPE, FakeTransport, TelemetryIngestor, topic_for
+
+
+def make_payloads(fleet, count, seed):
+    rng = np.random.default_rng(seed)
+    reports = np.zeros(count, dtype=REPORT_DTYPE)
+    rows = rng.integers(0, len(fleet), count)
+    reports["vessel_id"] = fleet.ids[rows]
+    reports["timestamp"] = time.time() + np.arange(count) * 1e-3
+    reports["lat"] = fleet.lat[rows] + rng.normal(0, 0.001, count)
+    reports["lon"] = fleet.lon[rows] + rng.normal(0, 0.001, count)
+    reports["speed"] = rng.uniform(0, 15, count)
+    reports["heading"] = rng.uniform(0, 360, count)
+    reports["fuel_level"] = rng.uniform(10, 100, count)
+    topics = [topic_for(vessel_id) for vessel_id in reports["vessel_id"]]
+    return topics, [report.tobytes() for report in reports]
+
+
+def run(messages, fleet_size, max_queue, batch_size, policy, seed):
+    fleet = generate_fleet(fleet_size, seed=seed)
+    transport = FakeTransport()
+    ingestor = TelemetryIngestor(transport, max_queue=max_queue, policy=policy)
+    topics, payloads = make_payloads(fleet, messages, seed)
+
+    def produce():
+        for topic, payload in zip(topics, payloads):
+            transport.publish(topic, payload)
+
+    producer = threading.Thread(target=produce)
+    batches, max_pending, apply_s = 0, 0, 0.0
+    start = time.perf_counter()
+    producer.start()
+    while producer.is_alive() or ingestor.pending():
+        max_pending = max(max_pending, ingestor.pending())
+        began = time.perf_counter()
+        if len(ingestor.apply(fleet, batch_size)):
+            batches += 1
+            apply_s += time.perf_counter() - began
+        else:
+            time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    producer.join()
+
+    return {
+        "messages": messages,
+        "fleet_size": fleet_size,
+        "policy": policy,
+        "messages_per_s": messages / elapsed,
+        "received": ingestor.received,
+        "dropped": ingestor.dropped,
+        "vessel_updates": ingestor.applied,
+        "batches": batches,
+        "mean_batch_apply_ms": apply_s / max(batches, 1) * 1000,
+        "max_queue_depth": max_pending,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--fleet-size", type=int, default=10_000)
+    parser.add_argument("--max-queue", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--policy", choices=["block", "drop"], default="block")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    result = run(args.messages, args.fleet_size, args.max_queue, args.batch_size, args.policy, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"{result['messages']:,} reports for {result['fleet_size']:,} vessels ({result['policy']} policy)")
+    print(f"  throughput        {result['messages_per_s']:>12,.0f} msg/s")
+    print(f"  dropped           {result['dropped']:>12,}")
+    print(f"  vessel updates    {result['vessel_updates']:>12,} in {result['batches']} batches")
+    print(f"  batch apply       {result['mean_batch_apply_ms']:>12.1f} ms")
+    print(f"  max queue depth   {result['max_queue_depth']:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Boat-dict fleet records and the per-boat update rules the dashboard used before :class:`FleetState`.
+
+Kept only as the baseline that benchmarks and the vectorized simulator's
+tests compare against.
+"""
+import random
+
+from fisherlink.fleet import RECORD_FIELDS
+from fisherlink.geo import calculate_geofence_point, distance_to_geofence
+
+
+def _boat_record(fleet, i):
+    return {key: convert(getattr(fleet, array)[i]) for key, (array, convert) in RECORD_FIELDS.items()}
+
+
+def fleet_to_boats(fleet):
+    """Build the list of boat dicts the dashboard used to render, one 15-key dict per vessel."""
+    return [_boat_record(fleet, i) for i in range(len(fleet))]
+
+
+def sync_boats(fleet, boats):
+    """Copy the latest fleet state into existing boat dicts."""
+    for i, boat in enumerate(boats):
+        boat.update(_boat_record(fleet, i))
+    return boats
+
+
+def _random_draw(name, low=0.0, high=1.0):
+    return random.uniform(low, high)
+
+
+def update_boat(boat, draw=_random_draw, geofence_distance=distance_to_geofence):
+    """One simulated minute for one boat dict, with the original per-boat rules.
+
+    Every random number comes from ``draw(name, low, high)`` so a test can
+    feed in the same draws as :func:`fisherlink.fleet.step_fleet`; the
+    default uses the ``random`` module like the original code did.
+    ``geofence_distance(lat, lon)`` is the signed distance to the geofence.
+    """
+    # Update heading with small random changes to simulate natural drift and steering
+    heading_change = draw("heading", -15, 15)
+    boat["heading"] = (boat["heading"] + heading_change) % 360
+
+    # Update speed with small random changes
+    speed_change = draw("speed", -0.5, 0.5)
+    boat["speed"] = max(0.5, min(20, boat["speed"] + speed_change))
+
+    # Distance traveled in 1 minute (assuming update interval is 1 minute)
+    distance_km = boat["speed"] * 1.852 / 60
+    boat["lat"], boat["lon"] = calculate_geofence_point(boat["lat"], boat["lon"], distance_km, boat["heading"])
+
+    # Update operation time
+    boat["operation_time"] += 1/60  # Add 1 minute
+
+    # Update fish caught with some randomness
+    if draw("catch_chance") < 0.3:  # 30% chance of catching fish in this update
+        boat["fish_caught"] += draw("catch", 0, 5)  # 0-5 kg per catch
+
+    # Update fuel level (decreasing over time)
+    fuel_decrease = draw("fuel", 0.05, 0.15)  # 0.05-0.15% decrease per minute
+    boat["fuel_level"] = max(0, boat["fuel_level"] - fuel_decrease)
+
+    # Calculate distance to boundary
+    distance = geofence_distance(boat["lat"], boat["lon"])
+
+    # Update risk level based on various factors
+    # 1. Distance to geofence (higher risk when closer to or beyond geofence)
+    distance_risk = max(0, min(1, 1 - ((distance + 5) / 35)))
+    # 2. Fuel level (higher risk with lower fuel)
+    fuel_risk = max(0, min(1, (100 - boat["fuel_level"]) / 100))
+    # 3. Operation time (higher risk with longer operation time)
+    time_risk = max(0, min(1, boat["operation_time"] / 24))  # Assuming max 24 hours
+    # 4. Random environmental factors (weather, sea condition)
+    env_risk = draw("env", 0, 0.3)
+
+    # Calculate combined risk with different weights
+    boat["risk_level"] = (
+        0.4 * distance_risk +
+        0.25 * fuel_risk +
+        0.25 * time_risk +
+        0.1 * env_risk
+    )
+
+    # Update engine status based on risk and random factors
+    if boat["risk_level"] > 0.7 or (boat["risk_level"] > 0.5 and draw("engine_warning") < 0.1):
+        boat["engine_status"] = "Warning"
+    elif boat["risk_level"] > 0.9 or (boat["risk_level"] > 0.7 and draw("engine_critical") < 0.05):
+        boat["engine_status"] = "Critical"
+    else:
+        boat["engine_status"] = "Normal"
+
+    # Update communication status
+    if boat["risk_level"] > 0.8 and draw("comm_intermittent") < 0.1:
+        boat["communication_status"] = "Intermittent"
+    elif boat["risk_level"] > 0.9 and draw("comm_lost") < 0.05:
+        boat["communication_status"] = "Lost"
+    else:
+        boat["communication_status"] = "Active"
+
+    # Update safety status
+    if distance < -5:  # More than 5km beyond geofence
+        boat["safety_status"] = "Danger"
+    elif distance < 0:  # Beyond geofence but within 5km
+        boat["safety_status"] = "Warning"
+    elif boat["risk_level"] > 0.7:  # High risk but within geofence
+        boat["safety_status"] = "Caution"
+    else:
+        boat["safety_status"] = "Safe"
+    return boat
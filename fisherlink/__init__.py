@@ -0,0 +1 @@
+"""FisherLink simulation, geometry and risk engine used by the Streamlit dashboard."""
@@ -0,0 +1,373 @@
+"""Event-driven vessel alerts, evaluated once per simulation tick.
+
+An :class:`AlertRule` watches one fleet array against an enter threshold
+and a looser exit threshold. :class:`AlertEngine` keeps one boolean
+"in alert" array per rule. Each tick it compares the whole fleet against
+every rule, with a few vectorized comparisons per rule, and emits events
+only for vessels whose state changed:
+
+* a vessel enters a rule once its value crosses the enter threshold;
+* it only leaves once the value crosses back over the exit threshold, so
+  a value hovering at the threshold does not flap (hysteresis);
+* a vessel that re-enters a rule within ``cooldown_s`` of its last raised
+  alert for that rule is tracked as in alert but raises nothing, and
+  nothing is cleared when it leaves again (per-vessel cooldown).
+
+Events go to an :class:`AlertStore`. It is a SQLite table indexed by
+vessel, type, severity and time, with running counts of raised alerts per
+type and per severity. It is read a page at a time with keyset cursors, so a year of
+alerts can be browsed without loading it into memory.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from fisherlink.fleet import HIGH_RISK
+
+DEFAULT_PATH = os.path.join("data", "alerts.sqlite")
+RETENTION_DAYS = 365
+PAGE_SIZE = 10
+
+# Most alerts kept, about 2 GB at ~200 bytes per alert with its indexes. A
+# 100k-vessel fleet that raises and clears a few alerts per vessel a day
+# writes about a million a day, so at that size this cap, not the
+# retention period, bounds the store: roughly the last ten days are kept.
+MAX_ROWS = 10_000_000
+
+# Severity codes, stored with every alert; SEVERITIES maps them to labels
+INFO, WARNING, EMERGENCY = range(3)
+SEVERITIES = ("Info", "Warning", "Emergency")
+
+# Minimum seconds between two raised alerts of the same rule for the same vessel
+COOLDOWN_S = 300.0
+
+RAISED = "raised"
+CLEARED = "cleared"
+
+# Type given to the event emitted when a vessel leaves an alert state
+RESOLVED_TYPE = "Resolved"
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """Alert while ``field`` is above (or below) ``enter``, until it passes back over ``exit``."""
+    name: str
+    field: str
+    above: bool
+    enter: float
+    exit: float
+    type: str
+    severity: int
+    message: str  # formatted with the vessel ``name`` and current ``value``
+    cleared_message: str
+    cooldown_s: float = COOLDOWN_S
+
+    def entering(self, value):
+        return value > self.enter if self.above else value < self.enter
+
+    def leaving(self, value):
+        return value < self.exit if self.above else value > self.exit
+
+
+DEFAULT_RULES = (
+    AlertRule(
+        "critical_risk", "risk_level", above=True, enter=0.9, exit=0.8, type="Emergency", severity=EMERGENCY,
+        message="EMERGENCY: Critical risk level detected for {name}! Immediate assistance required.",
+        cleared_message="{name} is no longer at critical risk (risk {value:.2f}).",
+    ),
+    AlertRule(
+        "high_risk", "risk_level", above=True, enter=0.8, exit=HIGH_RISK, type="Warning", severity=WARNING,
+        message="WARNING: High risk level detected for {name}. Monitor closely.",
+        cleared_message="{name} is back below high risk (risk {value:.2f}).",
+    ),
+    AlertRule(
+        "low_fuel", "fuel_level", above=False, enter=10, exit=15, type="Warning", severity=WARNING,
+        message="FUEL ALERT: Critically low fuel for {name}. Return to shore recommended.",
+        cleared_message="{name} fuel restored to {value:.0f}%.",
+    ),
+    AlertRule(
+        "geofence", "geofence_distance", above=False, enter=-1, exit=0, type="Boundary Alert",
+        severity=WARNING,
+        message="BOUNDARY ALERT: {name} has crossed the geofence boundary and may lose communication.",
+        cleared_message="{name} is back inside the geofence.",
+    ),
+)
+
+
+@dataclass(frozen=True)
+class Alert:
+    """One alert event; ``vessel_id`` is None for fleet-wide and operator alerts."""
+    id: int
+    time: float
+    type: str
+    severity: int
+    message: str
+    state: str = RAISED
+    rule: str = None
+    vessel_id: int = None
+
+    @property
+    def clock(self):
+        return datetime.fromtimestamp(self.time).strftime("%H:%M:%S")
+
+    @property
+    def severity_name(self):
+        return SEVERITIES[self.severity]
+
+
+@dataclass(frozen=True)
+class AlertPage:
+    """One page of alerts, newest first; pass ``next_cursor`` to get the next (older) page."""
+    alerts: list
+    next_cursor: int = None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    type TEXT NOT NULL,
+    severity INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    state TEXT NOT NULL,
+    rule TEXT,
+    vessel_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS alerts_time ON alerts (time);
+CREATE INDEX IF NOT EXISTS alerts_vessel ON alerts (vessel_id, id);
+CREATE INDEX IF NOT EXISTS alerts_type ON alerts (type, id);
+CREATE INDEX IF NOT EXISTS alerts_severity ON alerts (severity, id);
+CREATE TABLE IF NOT EXISTS alert_counts (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+"""
+
+_COLUMNS = "id, time, type, severity, message, state, rule, vessel_id"
+
+# Bumped when what alert_counts counts changes; stores with another version rebuild their counts
+COUNTS_VERSION = 2
+
+
+class AlertStore:
+    """Persistent alert log in SQLite (``":memory:"`` for a throwaway one).
+
+    Counts of raised alerts per type and severity are kept in their own
+    table, updated in the same transaction as each insert or prune, and
+    cached in memory. Reading them never scans the alerts. Cleared events
+    are stored and paged like any other alert but are not counted. Alerts older than
+    ``retention_days``, and the oldest alerts beyond ``max_rows``, are
+    removed by :meth:`prune`, which runs at most once an hour as alerts
+    are added; between prunes the store can exceed ``max_rows`` by up to
+    an hour of alerts. One process should own a store file; within it,
+    the store is safe to share between threads.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, retention_days=RETENTION_DAYS, max_rows=MAX_ROWS):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._next_id = self._db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM alerts").fetchone()[0]
+        version = self._db.execute("SELECT count FROM alert_counts WHERE kind = 'version'").fetchone()
+        if version is None or version[0] != COUNTS_VERSION:
+            self._rebuild_counts()
+        self._counts = {"type": Counter(), "severity": Counter()}
+        for kind, key, count in self._db.execute(
+                "SELECT kind, key, count FROM alert_counts WHERE kind IN ('type', 'severity') AND count > 0"):
+            self._counts[kind][key if kind == "type" else int(key)] = count
+        self._pruned_at = 0.0
+
+    def __len__(self):
+        """Number of stored raised alerts."""
+        return sum(self._counts["severity"].values())
+
+    def _rebuild_counts(self):
+        # One scan of the alerts, only when opening a store written by an older version
+        with self._db:
+            self._db.execute("DELETE FROM alert_counts")
+            for kind in ("type", "severity"):
+                self._db.execute(
+                    f"INSERT INTO alert_counts (kind, key, count) "
+                    f"SELECT ?, {kind}, COUNT(*) FROM alerts WHERE state = ? GROUP BY {kind}",
+                    (kind, RAISED),
+                )
+            self._db.execute("INSERT INTO alert_counts (kind, key, count) VALUES ('version', '', ?)",
+                             (COUNTS_VERSION,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def add(self, alert_type, message, severity=INFO, state=RAISED, rule=None, vessel_id=None, now=None):
+        """Record one alert and return it."""
+        return self.add_many([(alert_type, severity, message, state, rule, vessel_id)], now)[0]
+
+    def add_many(self, records, now=None):
+        """Record ``(type, severity, message, state, rule, vessel_id)`` tuples in one transaction."""
+        now = time.time() if now is None else now
+        with self._lock:
+            alerts = [Alert(self._next_id + i, now, *record) for i, record in enumerate(records)]
+            if not alerts:
+                return alerts
+            raised = [alert for alert in alerts if alert.state == RAISED]
+            types = Counter(alert.type for alert in raised)
+            severities = Counter(alert.severity for alert in raised)
+            with self._db:
+                self._db.executemany(
+                    f"INSERT INTO alerts ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(a.id, a.time, a.type, a.severity, a.message, a.state, a.rule, a.vessel_id) for a in alerts],
+                )
+                self._update_counts(types, severities)
+            self._next_id += len(alerts)
+            if now - self._pruned_at >= 3600:
+                self._prune(now)
+            return alerts
+
+    def _update_counts(self, types, severities, sign=1):
+        # Caller holds the lock and the transaction
+        for kind, counts in (("type", types), ("severity", severities)):
+            self._db.executemany(
+                "INSERT INTO alert_counts (kind, key, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (kind, key) DO UPDATE SET count = count + excluded.count",
+                [(kind, str(key), sign * count) for key, count in counts.items()],
+            )
+            for key, count in counts.items():
+                self._counts[kind][key] += sign * count
+                if self._counts[kind][key] <= 0:
+                    del self._counts[kind][key]
+
+    def prune(self, now=None):
+        """Delete alerts older than the retention period and the oldest beyond ``max_rows``."""
+        with self._lock:
+            self._prune(time.time() if now is None else now)
+
+    def _prune(self, now):
+        self._pruned_at = now
+        cutoff = now - self.retention_days * 86400
+        # Ids are consecutive, so the newest max_rows alerts are the ones from this id on
+        first_id = self._next_id - self.max_rows
+        expired_where, params = "(time < ? OR id < ?)", (cutoff, first_id)
+        if self._db.execute(f"SELECT 1 FROM alerts WHERE {expired_where} LIMIT 1", params).fetchone() is None:
+            return
+        with self._db:
+            expired = self._db.execute(
+                f"SELECT type, severity, COUNT(*) FROM alerts WHERE {expired_where} AND state = ? "
+                f"GROUP BY type, severity",
+                (*params, RAISED),
+            ).fetchall()
+            types, severities = Counter(), Counter()
+            for alert_type, severity, count in expired:
+                types[alert_type] += count
+                severities[severity] += count
+            self._db.execute(f"DELETE FROM alerts WHERE {expired_where}", params)
+            self._update_counts(types, severities, sign=-1)
+
+    def page(self, limit=PAGE_SIZE, cursor=None, vessel_id=None, alert_type=None, severity=None, since=None,
+             until=None):
+        """Alerts matching every given filter, newest first, ``limit`` at a time.
+
+        ``cursor`` is the ``next_cursor`` of the previous page. Pages are
+        keyed on the alert id, so each one is an index range scan that
+        stays fast however deep the operator pages, and new alerts never
+        shift the pages already seen.
+        """
+        clauses, params = [], []
+        for column, value in (("vessel_id", vessel_id), ("type", alert_type), ("severity", severity)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("time >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("time <= ?")
+            params.append(until)
+        if cursor is not None:
+            clauses.append("id < ?")
+            params.append(cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM alerts {where} ORDER BY id DESC LIMIT ?", (*params, limit + 1)
+            ).fetchall()
+        alerts = [Alert(*row) for row in rows[:limit]]
+        return AlertPage(alerts, alerts[-1].id if len(rows) > limit else None)
+
+    def recent(self, limit=PAGE_SIZE):
+        """The newest ``limit`` alerts, newest first."""
+        return self.page(limit).alerts
+
+    def type_counts(self):
+        """Number of stored raised alerts of each type."""
+        with self._lock:
+            return Counter(self._counts["type"])
+
+    def severity_counts(self):
+        """Number of stored raised alerts of each severity code."""
+        with self._lock:
+            return Counter(self._counts["severity"])
+
+
+class AlertEngine:
+    """Per-tick rule evaluation over the fleet arrays; see the module docstring."""
+
+    def __init__(self, store=None, rules=DEFAULT_RULES):
+        self.store = AlertStore(":memory:") if store is None else store
+        self.rules = tuple(rules)
+        self._ids = None
+
+    def _reset(self, fleet):
+        # Rule state is per row; start over if the fleet's rows change
+        n = len(fleet)
+        self._ids = fleet.ids.copy()
+        self._active = np.zeros((len(self.rules), n), dtype=bool)
+        self._notified = np.zeros((len(self.rules), n), dtype=bool)  # raised in this episode
+        self._last_raised = np.full((len(self.rules), n), -np.inf)
+
+    def evaluate(self, fleet, now=None):
+        """Apply every rule to ``fleet`` and store the resulting events; returns them."""
+        now = time.time() if now is None else now
+        if self._ids is None or not np.array_equal(self._ids, fleet.ids):
+            self._reset(fleet)
+
+        records = []
+        for r, rule in enumerate(self.rules):
+            value = getattr(fleet, rule.field)
+            active, notified = self._active[r], self._notified[r]
+            entered = ~active & rule.entering(value)
+            left = active & rule.leaving(value)
+            raised = entered & (now - self._last_raised[r] >= rule.cooldown_s)
+            cleared = left & notified
+            active[entered] = True
+            active[left] = False
+            notified[raised] = True
+            notified[left] = False
+            self._last_raised[r, raised] = now
+
+            for row in np.flatnonzero(raised):
+                message = rule.message.format(name=fleet.names[row], value=value[row])
+                records.append((rule.type, rule.severity, message, RAISED, rule.name, int(fleet.ids[row])))
+            for row in np.flatnonzero(cleared):
+                message = rule.cleared_message.format(name=fleet.names[row], value=value[row])
+                records.append((RESOLVED_TYPE, INFO, message, CLEARED, rule.name, int(fleet.ids[row])))
+        return self.store.add_many(records, now)
+
+    def active(self, rule_name):
+        """Rows currently in alert for ``rule_name``."""
+        names = [rule.name for rule in self.rules]
+        if self._ids is None:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(self._active[names.index(rule_name)])
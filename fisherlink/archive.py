@@ -0,0 +1,405 @@
+"""Append-only Parquet archive of vessel tracks with time-range queries.
+
+Snapshots are buffered in memory and written in batches under one
+directory per UTC day (``date=YYYY-MM-DD``). Each batch file is sorted by
+vessel and time, so Parquet row-group statistics on ``vessel_id`` and
+``timestamp`` let queries skip data that cannot match. Queries first pick
+the day directories their time range touches, then push the remaining
+predicates down to the Parquet reader.
+
+Once a day is over, its batch files are compacted into a single file so
+that the 90 days of history kept for compliance stay cheap to scan.
+Older days are deleted. Both happen in :meth:`TrackArchive.maintain`,
+which :meth:`TrackArchive.start` runs on its own thread so that appends
+never wait for it.
+
+Compaction is an external sort: batch files are streamed into vessel-id
+range buckets on disk, then each bucket is sorted and appended to the day
+file, so memory is bounded by ``COMPACT_ROWS`` rather than by the day. The
+swap is guarded by a ``_compacting.json`` marker listing the files the new
+day file replaces; queries skip those files once the day file is in place,
+and the next maintenance run finishes or rolls back an interrupted swap.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DEFAULT_ROOT = os.path.join("data", "tracks")
+RETENTION_DAYS = 90
+
+# A batch is written once it holds this many rows or its oldest row is this old
+FLUSH_ROWS = 50_000
+FLUSH_INTERVAL_S = 60.0
+
+ROW_GROUP_SIZE = 64 * 1024
+
+# How far back "position at time t" looks for each vessel's latest report
+SNAPSHOT_WINDOW_S = 60.0
+
+SCHEMA = pa.schema([
+    ("vessel_id", pa.int32()),
+    ("timestamp", pa.float64()),  # epoch seconds
+    ("lat", pa.float64()),
+    ("lon", pa.float64()),
+    ("speed", pa.float32()),
+    ("heading", pa.float32()),
+    ("risk_level", pa.float32()),
+    ("fuel_level", pa.float32()),
+    ("operation_time", pa.float32()),
+    ("geofence_distance", pa.float32()),
+    ("engine_status", pa.int8()),
+    ("safety_status", pa.int8()),
+])
+
+SORT_KEYS = [("vessel_id", "ascending"), ("timestamp", "ascending")]
+
+# Rows sorted in memory at a time while compacting a day
+COMPACT_ROWS = 2_000_000
+MAINTENANCE_INTERVAL_S = 600.0
+MARKER = "_compacting.json"
+
+logger = logging.getLogger(__name__)
+
+
+def _day(epoch):
+    """UTC day of each epoch timestamp as a ``YYYY-MM-DD`` string array."""
+    seconds = np.asarray(epoch, dtype=np.float64).astype(np.int64)
+    return np.datetime_as_string(seconds.astype("datetime64[s]"), unit="D")
+
+
+def _id_range(files):
+    """Smallest and largest vessel id and total row count, from the Parquet footers alone."""
+    lo, hi, rows = None, None, 0
+    for path in files:
+        metadata = pq.read_metadata(path)
+        rows += metadata.num_rows
+        column = metadata.schema.names.index("vessel_id")
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(column).statistics
+            if stats is None or not stats.has_min_max:
+                continue
+            lo = stats.min if lo is None else min(lo, stats.min)
+            hi = stats.max if hi is None else max(hi, stats.max)
+    return (0 if lo is None else lo), (0 if hi is None else hi), rows
+
+
+class TrackArchive:
+    """Batched writer and query API over the partitioned Parquet track files.
+
+    Safe to share between sessions: appends and flushes are serialized by
+    one lock, maintenance by another, so a compaction never blocks the
+    caller of :meth:`append`. Files are written under a ``_`` prefix and
+    renamed into place, so queries never pick up a half-written file.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, retention_days=RETENTION_DAYS, flush_rows=FLUSH_ROWS,
+                 flush_interval_s=FLUSH_INTERVAL_S, row_group_size=ROW_GROUP_SIZE, compact_rows=COMPACT_ROWS):
+        self.root = root
+        self.retention_days = retention_days
+        self.flush_rows = flush_rows
+        self.flush_interval_s = flush_interval_s
+        self.row_group_size = row_group_size
+        self.compact_rows = compact_rows
+        self._lock = threading.Lock()
+        self._maintenance_lock = threading.Lock()
+        self._batches = []
+        self._buffered = 0
+        self._buffered_since = None
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(root, exist_ok=True)
+
+    def append(self, fleet, rows=None, now=None):
+        """Buffer the current state of the fleet (or of ``rows``) and flush when due."""
+        # Fancy indexing copies: Arrow would otherwise share the fleet's live buffers
+        rows = np.arange(len(fleet)) if rows is None else np.asarray(rows)
+        batch = pa.record_batch([
+            pa.array(fleet.ids[rows], pa.int32()),
+            pa.array(fleet.last_update[rows], pa.float64()),
+            pa.array(fleet.lat[rows], pa.float64()),
+            pa.array(fleet.lon[rows], pa.float64()),
+            pa.array(fleet.speed[rows], pa.float32()),
+            pa.array(fleet.heading[rows], pa.float32()),
+            pa.array(fleet.risk_level[rows], pa.float32()),
+            pa.array(fleet.fuel_level[rows], pa.float32()),
+            pa.array(fleet.operation_time[rows], pa.float32()),
+            pa.array(fleet.geofence_distance[rows], pa.float32()),
+            pa.array(fleet.engine_status[rows], pa.int8()),
+            pa.array(fleet.safety_status[rows], pa.int8()),
+        ], schema=SCHEMA)
+
+        now = time.time() if now is None else now
+        with self._lock:
+            self._batches.append(batch)
+            self._buffered += batch.num_rows
+            if self._buffered_since is None:
+                self._buffered_since = now
+            due = (self._buffered >= self.flush_rows or
+                   now - self._buffered_since >= self.flush_interval_s)
+            if due:
+                self._flush()
+
+    def flush(self):
+        """Write any buffered rows now."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._batches:
+            return
+        table = pa.Table.from_batches(self._batches, schema=SCHEMA)
+        self._batches, self._buffered, self._buffered_since = [], 0, None
+
+        days = _day(table["timestamp"].to_numpy())
+        for day in np.unique(days):
+            part = table.filter(pa.array(days == day)).sort_by(SORT_KEYS)
+            name = f"part-{int(part['timestamp'][0].as_py() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+            self._write(part, os.path.join(self._day_dir(day), name))
+
+    def _write(self, table, path):
+        directory, name = os.path.split(path)
+        os.makedirs(directory, exist_ok=True)
+        staging = os.path.join(directory, f"_{name}")
+        pq.write_table(table, staging, row_group_size=self.row_group_size, compression="zstd")
+        os.replace(staging, path)
+
+    def _day_dir(self, day):
+        return os.path.join(self.root, f"date={day}")
+
+    def days(self):
+        """Archived UTC days, oldest first."""
+        return sorted(
+            name.split("=", 1)[1] for name in os.listdir(self.root)
+            if name.startswith("date=") and os.path.isdir(os.path.join(self.root, name))
+        )
+
+    def _files(self, day):
+        directory = self._day_dir(day)
+        if not os.path.isdir(directory):
+            return []
+        names = os.listdir(directory)
+        # Once the new day file is in place, the files it replaces are skipped until deleted.
+        # Whether the swap happened is read off the same listing, so both come from one moment.
+        covered = set()
+        if MARKER in names:
+            marker = self._read_marker(directory)
+            if marker is not None and marker["staging"] not in names:
+                covered = set(marker["sources"]) - {marker["target"]}
+        # Leading "_" and "." mark files still being written
+        return sorted(
+            os.path.join(directory, name) for name in names
+            if name.endswith(".parquet") and not name.startswith(("_", ".")) and name not in covered
+        )
+
+    @staticmethod
+    def _read_marker(directory):
+        try:
+            with open(os.path.join(directory, MARKER)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _cutoff(self, now):
+        # Oldest day still inside the retention window
+        return _day(now - self.retention_days * 86400)
+
+    def start(self, interval_s=MAINTENANCE_INTERVAL_S):
+        """Run :meth:`maintain` now and then every ``interval_s`` seconds in a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval_s,), name="track-archive",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self, timeout=None):
+        """Stop the maintenance thread and write any buffered rows."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def _run(self, interval_s):
+        while True:
+            try:
+                self.maintain()
+            except Exception:
+                logger.exception("Track archive maintenance failed")
+            if self._stop.wait(interval_s):
+                return
+
+    def maintain(self, now=None):
+        """Finish interrupted compactions, delete expired days and compact every finished day."""
+        now = time.time() if now is None else now
+        today, cutoff = _day(now), self._cutoff(now)
+        with self._maintenance_lock:
+            for day in self.days():
+                if day < cutoff:
+                    shutil.rmtree(self._day_dir(day), ignore_errors=True)
+                    continue
+                self._recover(day)
+                if day < today:
+                    self._compact(day)
+
+    def compact(self, day):
+        """Merge a day's batch files into one file sorted by vessel and time."""
+        with self._maintenance_lock:
+            self._recover(day)
+            self._compact(day)
+
+    def _compact(self, day):
+        files = self._files(day)
+        if len(files) < 2:
+            return
+        directory = self._day_dir(day)
+        target = f"day-{day}.parquet"
+        staging = f"_compact-{uuid.uuid4().hex[:8]}.parquet"
+        self._sort_into(files, os.path.join(directory, staging))
+
+        # The marker goes down before the swap and comes off after the cleanup; see _recover
+        marker = {"staging": staging, "target": target, "sources": [os.path.basename(path) for path in files]}
+        with open(os.path.join(directory, f"_{MARKER}.tmp"), "w") as f:
+            json.dump(marker, f)
+        os.replace(os.path.join(directory, f"_{MARKER}.tmp"), os.path.join(directory, MARKER))
+        os.replace(os.path.join(directory, staging), os.path.join(directory, target))
+        self._finish(directory, marker)
+
+    def _sort_into(self, files, path):
+        # Pass 1 streams every file into vessel-id range buckets; pass 2 sorts one bucket at a
+        # time. Buckets are in id order, so appending them in turn sorts the whole day.
+        lo, hi, rows = _id_range(files)
+        buckets = max(1, -(-rows // self.compact_rows))
+        span = hi - lo + 1
+        scratch = os.path.join(os.path.dirname(path), f"_buckets-{uuid.uuid4().hex[:8]}")
+        os.makedirs(scratch)
+        try:
+            writers = {}
+            for source in files:
+                for batch in pq.ParquetFile(source).iter_batches(batch_size=self.row_group_size):
+                    batch = pa.Table.from_batches([batch]).cast(SCHEMA)
+                    bucket = (batch["vessel_id"].to_numpy().astype(np.int64) - lo) * buckets // span
+                    bucket = np.clip(bucket, 0, buckets - 1)
+                    order = np.argsort(bucket, kind="stable")
+                    edges = np.searchsorted(bucket[order], np.arange(buckets + 1))
+                    for b in np.flatnonzero(np.diff(edges)):
+                        if b not in writers:
+                            writers[b] = pa.ipc.new_file(os.path.join(scratch, f"{b}.arrow"), SCHEMA)
+                        writers[b].write_table(batch.take(order[edges[b]:edges[b + 1]]))
+            for writer in writers.values():
+                writer.close()
+
+            with pq.ParquetWriter(path, SCHEMA, compression="zstd") as out:
+                for b in sorted(writers):
+                    bucket_path = os.path.join(scratch, f"{b}.arrow")
+                    with pa.memory_map(bucket_path) as source:
+                        table = pa.ipc.open_file(source).read_all().sort_by(SORT_KEYS)
+                    out.write_table(table, row_group_size=self.row_group_size)
+                    del table
+                    os.remove(bucket_path)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    def _finish(self, directory, marker):
+        for name in marker["sources"]:
+            if name != marker["target"]:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+        os.remove(os.path.join(directory, MARKER))
+
+    def _recover(self, day):
+        # A marker left by a crash: if the staged day file is still there the swap never
+        # happened, so drop it; otherwise the day file is in place and the sources go.
+        # Scratch files without a marker are from a compaction that never got that far.
+        directory = self._day_dir(day)
+        if not os.path.isdir(directory):
+            return
+        marker = self._read_marker(directory)
+        if marker is not None:
+            staging = os.path.join(directory, marker["staging"])
+            if os.path.exists(staging):
+                os.remove(staging)
+                os.remove(os.path.join(directory, MARKER))
+            else:
+                self._finish(directory, marker)
+        for name in os.listdir(directory):
+            if name.startswith(("_compact-", "_buckets-")):
+                path = os.path.join(directory, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+
+    def prune(self, now=None):
+        """Delete days that fall outside the retention window."""
+        now = time.time() if now is None else now
+        with self._maintenance_lock:
+            cutoff = self._cutoff(now)
+            for day in self.days():
+                if day < cutoff:
+                    shutil.rmtree(self._day_dir(day), ignore_errors=True)
+
+    def _scan(self, t1, t2, predicate, columns=None):
+        # Partition pruning: only open the day directories the range touches
+        first, last = _day(t1), _day(t2)
+        for attempt in range(3):
+            files = [path for day in self.days() if first <= day <= last for path in self._files(day)]
+            if not files:
+                return SCHEMA.empty_table() if columns is None else SCHEMA.empty_table().select(columns)
+            try:
+                dataset = ds.dataset(files, schema=SCHEMA, format="parquet")
+                return dataset.to_table(columns=columns, filter=predicate)
+            except FileNotFoundError:
+                # A compaction removed a listed file; listing again picks up its day file
+                if attempt == 2:
+                    raise
+
+    def vessel_track(self, vessel_id, t1, t2):
+        """All archived samples of one vessel with ``t1 <= timestamp <= t2``, in time order."""
+        predicate = ((ds.field("vessel_id") == int(vessel_id)) &
+                     (ds.field("timestamp") >= t1) & (ds.field("timestamp") <= t2))
+        table = self._scan(t1, t2, predicate)
+        return table.sort_by("timestamp").to_pandas()
+
+    def tracks(self, t1, t2):
+        """Every archived sample with ``t1 <= timestamp <= t2``, sorted by vessel then time."""
+        predicate = (ds.field("timestamp") >= t1) & (ds.field("timestamp") <= t2)
+        return self._scan(t1, t2, predicate).sort_by(SORT_KEYS).to_pandas()
+
+    def vessels_in_bbox(self, bbox, t, window_s=SNAPSHOT_WINDOW_S):
+        """Latest position at or before ``t`` of every vessel inside ``bbox``.
+
+        ``bbox`` is ``(min_lat, min_lon, max_lat, max_lon)``. A vessel counts
+        if its last report within ``window_s`` before ``t`` lies in the box.
+        The time window is pushed down to the reader; the box is applied to
+        each vessel's latest report, since an earlier report in the box says
+        nothing about where the vessel was at ``t``.
+        """
+        min_lat, min_lon, max_lat, max_lon = bbox
+        predicate = (ds.field("timestamp") > t - window_s) & (ds.field("timestamp") <= t)
+        table = self._scan(t - window_s, t, predicate)
+        if table.num_rows == 0:
+            return table.to_pandas()
+
+        # Latest report per vessel: sort by vessel then time and keep each vessel's last row
+        table = table.sort_by(SORT_KEYS)
+        ids = table["vessel_id"].to_numpy()
+        last = np.append(ids[1:] != ids[:-1], True)
+        table = table.filter(pa.array(last))
+
+        inside = pc.and_(
+            pc.and_(pc.greater_equal(table["lat"], min_lat), pc.less_equal(table["lat"], max_lat)),
+            pc.and_(pc.greater_equal(table["lon"], min_lon), pc.less_equal(table["lon"], max_lon)),
+        )
+        return table.filter(inside).to_pandas()
@@ -0,0 +1,282 @@
+"""SOS and operator alert fan-out to vessels, with acknowledgement tracking.
+
+:class:`Broadcaster` delivers an alert to a set of vessels over any
+transport with ``publish(topic, payload)`` and ``subscribe(topic,
+callback)``. :class:`fisherlink.telemetry.MqttTransport` is the real one
+and :class:`fisherlink.telemetry.FakeTransport` the in-process one.
+Deliveries run on an asyncio loop in a background thread, so
+:meth:`Broadcaster.send` returns at once with a :class:`Delivery` that
+fills in as vessels acknowledge.
+
+A fleet-wide alert is published once on :data:`FLEET_TOPIC`, which every
+vessel subscribes to, so the first attempt costs one message whatever
+the fleet size. Targeted alerts, and retries to vessels that have not
+acknowledged within the ack timeout, go to each vessel's own topic in
+batches of ``batch_size``. The loop yields between batches so acks are
+processed while the fan-out continues. Each retry doubles the wait, up to
+``max_attempts`` sends per vessel.
+
+Vessels acknowledge by publishing an 8-byte :data:`ACK_DTYPE` record
+(broadcast id, vessel id) to ``fisherlink/vessels/<id>/acks``.
+:class:`FakeVessels` plays the fleet's side for tests and benchmarks.
+"""
+import asyncio
+import heapq
+import json
+import random
+import threading
+import time
+
+import numpy as np
+
+from fisherlink.telemetry import TOPIC_PREFIX
+
+FLEET_TOPIC = f"{TOPIC_PREFIX}/all/alerts"
+ALERT_FILTER = f"{TOPIC_PREFIX}/+/alerts"
+ACK_FILTER = f"{TOPIC_PREFIX}/+/acks"
+
+ACK_DTYPE = np.dtype([("broadcast_id", "<u4"), ("vessel_id", "<u4")])
+
+BATCH_SIZE = 500
+ACK_TIMEOUT_S = 2.0
+MAX_ATTEMPTS = 4
+
+# Finished deliveries kept for status queries
+KEEP_DELIVERIES = 100
+
+
+def alert_topic(vessel_id):
+    return f"{TOPIC_PREFIX}/{vessel_id}/alerts"
+
+
+def ack_topic(vessel_id):
+    return f"{TOPIC_PREFIX}/{vessel_id}/acks"
+
+
+def encode_ack(broadcast_id, vessel_id):
+    return np.array([(broadcast_id, vessel_id)], dtype=ACK_DTYPE).tobytes()
+
+
+class Delivery:
+    """Progress of one broadcast; updated on the broadcaster's loop, readable from any thread.
+
+    ``acked_at`` holds each recipient's acknowledgement time, or NaN, in the
+    order of ``vessel_ids``. ``attempts`` counts the sends per recipient.
+    """
+
+    def __init__(self, broadcast_id, type, message, severity, vessel_ids, fleet_wide):
+        self.id = broadcast_id
+        self.type = type
+        self.message = message
+        self.severity = severity
+        self.fleet_wide = fleet_wide
+        self.vessel_ids = np.unique(np.asarray(vessel_ids, dtype=np.int64))
+        self.acked_at = np.full(len(self.vessel_ids), np.nan)
+        self.attempts = np.zeros(len(self.vessel_ids), dtype=np.int8)
+        self.issued = time.time()
+        self.finished = None
+        self.messages_sent = 0
+        self.done = threading.Event()
+        self._all_acked = asyncio.Event()
+        self.payload = json.dumps({
+            "broadcast_id": broadcast_id, "type": type, "severity": severity,
+            "message": message, "issued": self.issued,
+        }).encode()
+
+    def __len__(self):
+        return len(self.vessel_ids)
+
+    def _ack(self, vessel_ids, now):
+        """Record acks from ``vessel_ids``; ids that are not pending recipients are ignored."""
+        if not len(self.vessel_ids):
+            return 0
+        pos = np.minimum(np.searchsorted(self.vessel_ids, vessel_ids), len(self.vessel_ids) - 1)
+        pos = pos[self.vessel_ids[pos] == vessel_ids]
+        # Duplicate acks (from retries) keep the first time
+        first = np.unique(pos[np.isnan(self.acked_at[pos])])
+        self.acked_at[first] = now
+        return len(first)
+
+    @property
+    def acked(self):
+        return int(np.count_nonzero(~np.isnan(self.acked_at)))
+
+    @property
+    def pending_rows(self):
+        return np.flatnonzero(np.isnan(self.acked_at))
+
+    @property
+    def reach_all_s(self):
+        """Seconds from issue until the last recipient acknowledged; None until all have."""
+        if not len(self) or self.acked < len(self):
+            return None
+        return float(self.acked_at.max() - self.issued)
+
+    def summary(self):
+        latency = self.acked_at[~np.isnan(self.acked_at)] - self.issued
+        percentile = (lambda q: float(np.percentile(latency, q))) if len(latency) else (lambda q: None)
+        return {
+            "broadcast_id": self.id,
+            "type": self.type,
+            "recipients": len(self),
+            "acked": self.acked,
+            "unreached": len(self) - self.acked,
+            "messages_sent": self.messages_sent,
+            "max_attempts_used": int(self.attempts.max()) if len(self) else 0,
+            "ack_p50_s": percentile(50),
+            "ack_p95_s": percentile(95),
+            "reach_all_s": self.reach_all_s,
+            "finished": self.finished is not None,
+        }
+
+
+class Broadcaster:
+    """Fans alerts out over ``transport`` on a background asyncio loop; see the module docstring."""
+
+    def __init__(self, transport, batch_size=BATCH_SIZE, ack_timeout_s=ACK_TIMEOUT_S, max_attempts=MAX_ATTEMPTS):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.ack_timeout_s = ack_timeout_s
+        self.max_attempts = max_attempts
+        self._deliveries = {}
+        self._next_id = 1
+        self._id_lock = threading.Lock()
+        self._ack_lock = threading.Lock()
+        self._acks = []
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="broadcaster", daemon=True)
+        self._thread.start()
+        transport.subscribe(ACK_FILTER, self._on_ack)
+
+    def send(self, type, message, vessel_ids, severity=0, fleet_wide=False):
+        """Start delivering an alert to ``vessel_ids`` and return its :class:`Delivery`.
+
+        With ``fleet_wide`` the first attempt is one publish on the fleet
+        topic; ``vessel_ids`` is still the set of vessels expected to ack.
+        """
+        with self._id_lock:
+            broadcast_id = self._next_id
+            self._next_id += 1
+        delivery = Delivery(broadcast_id, type, message, severity, vessel_ids, fleet_wide)
+        self._deliveries[broadcast_id] = delivery
+        for old_id in list(self._deliveries)[:-KEEP_DELIVERIES]:
+            if self._deliveries[old_id].done.is_set():
+                del self._deliveries[old_id]
+        asyncio.run_coroutine_threadsafe(self._deliver(delivery), self._loop)
+        return delivery
+
+    def delivery(self, broadcast_id):
+        return self._deliveries.get(broadcast_id)
+
+    def recent(self, limit=5):
+        """The newest ``limit`` deliveries, newest first."""
+        return [self._deliveries[i] for i in list(self._deliveries)[::-1][:limit]]
+
+    def _on_ack(self, topic, payload):
+        # Transport thread: queue the ack; the loop, which owns every Delivery, applies them in bulk
+        if len(payload) != ACK_DTYPE.itemsize:
+            return
+        with self._ack_lock:
+            self._acks.append(payload)
+            if len(self._acks) > 1:
+                return  # a drain is already scheduled
+        self._loop.call_soon_threadsafe(self._apply_acks)
+
+    def _apply_acks(self):
+        with self._ack_lock:
+            payloads, self._acks = self._acks, []
+        acks = np.frombuffer(b"".join(payloads), dtype=ACK_DTYPE)
+        now = time.time()
+        for broadcast_id in np.unique(acks["broadcast_id"]):
+            delivery = self._deliveries.get(int(broadcast_id))
+            if delivery is not None:
+                delivery._ack(acks["vessel_id"][acks["broadcast_id"] == broadcast_id].astype(np.int64), now)
+                if delivery.acked == len(delivery):
+                    delivery._all_acked.set()
+
+    async def _deliver(self, delivery):
+        timeout = self.ack_timeout_s
+        for attempt in range(1, self.max_attempts + 1):
+            pending = delivery.pending_rows
+            if not len(pending):
+                break
+            if attempt == 1 and delivery.fleet_wide:
+                self.transport.publish(FLEET_TOPIC, delivery.payload)
+                delivery.messages_sent += 1
+            else:
+                for start in range(0, len(pending), self.batch_size):
+                    batch = pending[start:start + self.batch_size]
+                    for vessel_id in delivery.vessel_ids[batch]:
+                        self.transport.publish(alert_topic(vessel_id), delivery.payload)
+                    delivery.messages_sent += len(batch)
+                    await asyncio.sleep(0)  # let queued acks in between batches
+            delivery.attempts[pending] = attempt
+            try:
+                await asyncio.wait_for(delivery._all_acked.wait(), timeout)
+            except asyncio.TimeoutError:
+                timeout *= 2
+        delivery.finished = time.time()
+        delivery.done.set()
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class FakeVessels:
+    """Simulated vessels that acknowledge alerts on a transport.
+
+    Each received alert is lost with probability ``loss``; otherwise the
+    vessel acks after ``latency_s`` plus up to ``jitter_s`` seconds. Delayed
+    acks are published from one timer thread, as they would arrive from a
+    broker.
+    """
+
+    def __init__(self, transport, vessel_ids, loss=0.0, latency_s=0.0, jitter_s=0.0, seed=None):
+        self.transport = transport
+        self.vessel_ids = np.asarray(vessel_ids, dtype=np.int64)
+        self.loss = loss
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self._random = random.Random(seed)
+        self._due = []  # heap of (due time, sequence, vessel id, ack payload)
+        self._sequence = 0
+        self._wake = threading.Condition()
+        self.received = 0
+        if latency_s > 0 or jitter_s > 0:
+            threading.Thread(target=self._publish_due, name="fake-vessels", daemon=True).start()
+        transport.subscribe(FLEET_TOPIC, self._on_fleet_alert)
+        transport.subscribe(ALERT_FILTER, self._on_alert)
+
+    def _on_fleet_alert(self, topic, payload):
+        broadcast_id = json.loads(payload)["broadcast_id"]
+        for vessel_id in self.vessel_ids:
+            self._receive(broadcast_id, int(vessel_id))
+
+    def _on_alert(self, topic, payload):
+        vessel = topic.split("/")[-2]
+        if vessel.isdigit():
+            self._receive(json.loads(payload)["broadcast_id"], int(vessel))
+
+    def _receive(self, broadcast_id, vessel_id):
+        with self._wake:
+            self.received += 1
+            if self._random.random() < self.loss:
+                return
+            delay = self.latency_s + self._random.random() * self.jitter_s
+            if delay > 0:
+                heapq.heappush(self._due, (time.monotonic() + delay, self._sequence, vessel_id,
+                                           encode_ack(broadcast_id, vessel_id)))
+                self._sequence += 1
+                self._wake.notify()
+                return
+        self.transport.publish(ack_topic(vessel_id), encode_ack(broadcast_id, vessel_id))
+
+    def _publish_due(self):
+        while True:
+            with self._wake:
+                while not self._due or self._due[0][0] > time.monotonic():
+                    self._wake.wait(self._due[0][0] - time.monotonic() if self._due else None)
+                _, _, vessel_id, ack = heapq.heappop(self._due)
+            self.transport.publish(ack_topic(vessel_id), ack)
@@ -0,0 +1,90 @@
+"""Server-side HTML for vessel cards, popups and detail panels, memoized per vessel state.
+
+A vessel's markup only changes when its row does, and every row update
+(simulation step or telemetry report) stamps ``last_update``.
+:class:`HtmlCache` therefore keys rendered fragments on ``(vessel id,
+last_update)``. Every session and rerun that shows an unchanged vessel
+reuses the same string. In a telemetry-driven fleet that is every
+vessel that has not reported since the last render. In the simulated
+fleet, where every vessel moves each tick, it is everything after the
+first session renders the tick.
+
+The card grid is paginated: :func:`card_grid_html` emits one page of
+cards as a single CSS grid instead of a column layout per row.
+"""
+import threading
+from collections import OrderedDict
+
+from fisherlink.fleet import Vessel, risk_band
+
+# Cards per page of the vessel grid: 10 rows of 3
+CARDS_PER_PAGE = 30
+
+# Rendered fragments kept per cache; a few pages plus the open detail panels
+MAX_FRAGMENTS = 2048
+
+
+def risk_class(risk_level):
+    return ("low", "medium", "high")[risk_band(risk_level)]
+
+
+def card_html(boat):
+    """Summary card for one vessel, styled by risk (``boat-card-low|medium|high``)."""
+    return f"""<div class="boat-card-{risk_class(boat['risk_level'])}">
+    <h3>{boat['name']}</h3>
+    <p>Risk Level: {boat['risk_level']:.2f}</p>
+    <p>Status: {boat['safety_status']}</p>
+    <p>Position: ({boat['lat']:.4f}, {boat['lon']:.4f})</p>
+    <p>Last Update: {boat['last_update']}</p>
+</div>"""
+
+
+def card_grid_html(cards, columns=3):
+    """Lay out rendered cards in a grid of ``columns``, as one block of markup."""
+    return (f'<div style="display: grid; grid-template-columns: repeat({columns}, minmax(0, 1fr)); '
+            f'column-gap: 1rem;">' + "".join(cards) + "</div>")
+
+
+def page_count(total, per_page=CARDS_PER_PAGE):
+    return max(1, -(-total // per_page))
+
+
+class HtmlCache:
+    """LRU of ``render(vessel)`` results keyed on (vessel id, ``last_update``).
+
+    ``render`` receives a :class:`fisherlink.fleet.Vessel` view of the row,
+    followed by any extra arguments passed to :meth:`html`. Extra arguments
+    must be determined by the vessel state, like its trail. Safe to share
+    between sessions; rendering happens outside the lock, so two sessions
+    missing on the same key at once both render it.
+    """
+
+    def __init__(self, render, maxsize=MAX_FRAGMENTS):
+        self.render = render
+        self.maxsize = maxsize
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def html(self, fleet, row, *args):
+        key = (int(fleet.ids[row]), float(fleet.last_update[row]))
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                self.hits += 1
+                return fragment
+        fragment = self.render(Vessel(fleet, int(row)), *args)
+        with self._lock:
+            self.misses += 1
+            self._fragments[key] = fragment
+            while len(self._fragments) > self.maxsize:
+                self._fragments.popitem(last=False)
+        return fragment
+
+    def many(self, fleet, rows):
+        return [self.html(fleet, row) for row in rows]
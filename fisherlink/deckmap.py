@@ -0,0 +1,108 @@
+"""Point-layer map for large fleets, drawn on the GPU by deck.gl.
+
+Folium creates one DOM marker, popup and trail per vessel, which stalls
+both the Python side and the browser beyond a few hundred boats. Here the
+whole fleet is a single pydeck ``ScatterplotLayer`` fed from the columnar
+fleet arrays: one row of id, name, position, risk and colour per vessel.
+Tooltips are templated by deck.gl on hover, and the detailed popup (and
+trail) is only rendered for the vessel the user clicks.
+"""
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+
+from fisherlink.fleet import risk_band
+from fisherlink.geo import COASTAL_COORDS, GEOFENCE_POINTS
+from fisherlink.mapview import MAP_CENTER
+
+VESSEL_LAYER_ID = "vessels"
+
+# Green / orange / red per risk_band code, as mapview.risk_style
+RISK_COLORS = np.array([[76, 175, 80], [255, 152, 0], [244, 67, 54]], dtype=np.uint8)
+
+TOOLTIP = {
+    "html": "<b>{name}</b><br/>Risk: {risk}",
+    "style": {"backgroundColor": "#1E1E1E", "color": "white"},
+}
+
+
+def _path(coords):
+    # deck.gl expects [lon, lat] pairs
+    return np.asarray(coords, dtype=float)[:, ::-1].tolist()
+
+
+def vessel_frame(fleet):
+    """One row per vessel with only the columns the point layer needs."""
+    colors = RISK_COLORS[risk_band(fleet.risk_level)]
+    return pd.DataFrame({
+        "id": fleet.ids,
+        "name": fleet.names,
+        "lat": np.round(fleet.lat, 5),
+        "lon": np.round(fleet.lon, 5),
+        "risk": np.round(fleet.risk_level, 2),
+        "r": colors[:, 0],
+        "g": colors[:, 1],
+        "b": colors[:, 2],
+    })
+
+
+def fleet_deck(fleet, trail=None, zoom=9, height=600):
+    """Deck with the static coastline/geofence, every vessel, and an optional trail.
+
+    ``trail`` is a sequence of ``(lat, lon)`` positions, normally a window of
+    the selected vessel's history.
+    """
+    layers = [
+        pdk.Layer(
+            "PathLayer",
+            [{"path": _path(COASTAL_COORDS)}],
+            get_path="path",
+            get_color=[187, 134, 252],
+            width_min_pixels=3,
+        ),
+        pdk.Layer(
+            "PathLayer",
+            [{"path": _path(GEOFENCE_POINTS)}],
+            get_path="path",
+            get_color=[255, 68, 68],
+            width_min_pixels=3,
+        ),
+        pdk.Layer(
+            "ScatterplotLayer",
+            vessel_frame(fleet),
+            id=VESSEL_LAYER_ID,
+            get_position="[lon, lat]",
+            get_fill_color="[r, g, b]",
+            get_radius=300,
+            radius_min_pixels=3,
+            radius_max_pixels=10,
+            pickable=True,
+        ),
+    ]
+    if trail is not None and len(trail) > 1:
+        layers.append(pdk.Layer(
+            "PathLayer",
+            [{"path": _path(trail)}],
+            get_path="path",
+            get_color=[144, 202, 249],
+            width_min_pixels=2,
+        ))
+
+    return pdk.Deck(
+        layers=layers,
+        initial_view_state=pdk.ViewState(latitude=MAP_CENTER[0], longitude=MAP_CENTER[1], zoom=zoom),
+        map_provider="carto",
+        map_style="dark",
+        tooltip=TOOLTIP,
+        height=height,
+    )
+
+
+def selected_vessel(state):
+    """Id of the vessel picked in a ``st.pydeck_chart`` selection state, or None."""
+    if not state:
+        return None
+    objects = state.get("selection", {}).get("objects", {}).get(VESSEL_LAYER_ID)
+    if not objects:
+        return None
+    return int(objects[0]["id"])
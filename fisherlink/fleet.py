@@ -0,0 +1,364 @@
+"""Structure-of-arrays fleet state and the batched simulation step.
+
+Every per-boat attribute lives in its own NumPy array indexed by vessel
+position, so one call to :func:`step_fleet` advances the whole fleet with
+vectorized math instead of walking a list of dicts. Statuses are stored as
+small integer codes; the ``*_STATUSES`` tuples map them back to the labels
+the dashboard shows.
+"""
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from fisherlink.geo import COASTAL_COORDS, destination_points
+from fisherlink.geofence import default_geofence
+
+BOAT_NAMES = [
+    "Sea Explorer", "Coastal Fisher", "Ocean Voyager", "Bay Catcher",
+    "Wave Rider", "Deep Blue", "Sea Harvester", "Marine Master",
+    "Aqua Venture", "Tide Chaser", "Chennai Fisher", "Tamil Mariner",
+    "Gulf Voyager", "Bay Watcher", "Seaside Worker", "Coastal Guard",
+    "Blue Waters", "Marina Fisher", "Bay Navigator", "Sea Pearl"
+]
+
+# Status labels, indexed by the int8 codes stored in FleetState
+ENGINE_STATUSES = ("Normal", "Warning", "Critical")
+COMMUNICATION_STATUSES = ("Active", "Intermittent", "Lost")
+SAFETY_STATUSES = ("Safe", "Caution", "Warning", "Danger")
+
+ENGINE_NORMAL, ENGINE_WARNING, ENGINE_CRITICAL = range(3)
+COMM_ACTIVE, COMM_INTERMITTENT, COMM_LOST = range(3)
+SAFETY_SAFE, SAFETY_CAUTION, SAFETY_WARNING, SAFETY_DANGER = range(4)
+
+# Risk band edges used across the app: low < LOW_RISK <= medium <= HIGH_RISK < high.
+# The safety, engine and alert rules also key off HIGH_RISK.
+LOW_RISK = 0.3
+HIGH_RISK = 0.7
+
+
+def risk_band(risk_level):
+    """Band code per vessel: 0 low, 1 medium, 2 high, as the edges above define them.
+
+    Every risk colour, class and filter goes through this; a scalar gives a 0-d array.
+    """
+    risk_level = np.asarray(risk_level)
+    return (risk_level >= LOW_RISK).astype(np.int8) + (risk_level > HIGH_RISK)
+
+# Risk weights shared by the simulator and anything that re-evaluates risk
+RISK_WEIGHTS = {"distance": 0.4, "fuel": 0.25, "time": 0.25, "env": 0.1}
+
+# Ranges of the simulator's per-minute fuel burn (%) and environmental risk draw
+FUEL_BURN_RANGE = (0.05, 0.15)
+ENV_RISK_RANGE = (0, 0.3)
+
+
+@dataclass
+class FleetState:
+    """Columnar state of every vessel; row ``i`` of each array is one boat.
+
+    ``last_update`` is NaN for a vessel that has never reported (see
+    :func:`unreported_fleet`).
+    """
+    ids: np.ndarray
+    names: np.ndarray
+    lat: np.ndarray
+    lon: np.ndarray
+    speed: np.ndarray
+    heading: np.ndarray
+    crew_size: np.ndarray
+    operation_time: np.ndarray
+    fish_caught: np.ndarray
+    risk_level: np.ndarray
+    fuel_level: np.ndarray
+    engine_status: np.ndarray
+    communication_status: np.ndarray
+    safety_status: np.ndarray
+    geofence_distance: np.ndarray
+    last_update: np.ndarray
+    rng: np.random.Generator
+    tick: int = 0
+    # Object with a ``score(...)`` method (see fisherlink.risk); None uses risk_score
+    risk_model: object = None
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _boat_names(num_boats):
+    return np.array(
+        [BOAT_NAMES[i % len(BOAT_NAMES)] + f"-{i+1}" for i in range(num_boats)],
+        dtype=object
+    )
+
+
+# Generate a fleet with the same starting distributions as the original boat generator
+def generate_fleet(num_boats=10, seed=None):
+    rng = np.random.default_rng(seed)
+    coast = np.asarray(COASTAL_COORDS)
+
+    # Generate initial positions close to shore
+    shore_idx = rng.integers(0, len(coast), num_boats)
+    # Random distance from shore (0-25 km)
+    distance = rng.uniform(0, 25, num_boats)
+    # Random bearing (45-135 degrees, roughly east with variation)
+    bearing = rng.uniform(45, 135, num_boats)
+    lat, lon = destination_points(coast[shore_idx, 0], coast[shore_idx, 1], distance, bearing)
+
+    return FleetState(
+        ids=np.arange(1, num_boats + 1, dtype=np.int64),
+        names=_boat_names(num_boats),
+        lat=lat,
+        lon=lon,
+        speed=rng.uniform(5, 15, num_boats),
+        heading=rng.uniform(0, 360, num_boats),
+        crew_size=rng.integers(3, 11, num_boats).astype(np.int16),
+        operation_time=rng.integers(1, 13, num_boats).astype(float),
+        fish_caught=rng.uniform(0, 1000, num_boats),
+        risk_level=rng.uniform(0, 0.5, num_boats),  # Start with low to medium risk
+        fuel_level=rng.uniform(50, 100, num_boats),
+        engine_status=np.full(num_boats, ENGINE_NORMAL, dtype=np.int8),
+        communication_status=np.full(num_boats, COMM_ACTIVE, dtype=np.int8),
+        safety_status=np.full(num_boats, SAFETY_SAFE, dtype=np.int8),
+        geofence_distance=default_geofence().signed_distance(lat, lon),
+        last_update=np.full(num_boats, time.time()),
+        rng=rng,
+    )
+
+
+def unreported_fleet(num_boats=10, seed=None):
+    """Vessels 1..``num_boats`` with no data yet, for a fleet driven by telemetry.
+
+    Everything a report carries is NaN until the vessel's first report,
+    and communication is Lost. Crew and catch are not in reports; they
+    start at zero.
+    """
+    unknown = np.full(num_boats, np.nan)
+    return FleetState(
+        ids=np.arange(1, num_boats + 1, dtype=np.int64),
+        names=_boat_names(num_boats),
+        lat=unknown.copy(),
+        lon=unknown.copy(),
+        speed=unknown.copy(),
+        heading=unknown.copy(),
+        crew_size=np.zeros(num_boats, dtype=np.int16),
+        operation_time=unknown.copy(),
+        fish_caught=np.zeros(num_boats),
+        risk_level=unknown.copy(),
+        fuel_level=unknown.copy(),
+        engine_status=np.full(num_boats, ENGINE_NORMAL, dtype=np.int8),
+        communication_status=np.full(num_boats, COMM_LOST, dtype=np.int8),
+        safety_status=np.full(num_boats, SAFETY_SAFE, dtype=np.int8),
+        geofence_distance=unknown.copy(),
+        last_update=unknown.copy(),
+        rng=np.random.default_rng(seed),
+    )
+
+
+def reported_rows(fleet):
+    """Rows of the vessels that have reported at least once."""
+    return np.flatnonzero(~np.isnan(fleet.last_update))
+
+
+def step_fleet(fleet):
+    """Advance every vessel by one simulated minute in a single vectorized pass.
+
+    Mirrors the per-boat update rules (drift, fuel burn, catch, weighted
+    risk and the engine/communication/safety status rules) and draws all
+    randomness from ``fleet.rng`` so a seeded fleet replays identically.
+    Arrays are updated in place, so a fleet whose arrays live in shared
+    memory (see :mod:`fisherlink.parallel`) stays there.
+    """
+    rng = fleet.rng
+    n = len(fleet)
+
+    # Update heading with small random changes to simulate natural drift and steering
+    fleet.heading[:] = (fleet.heading + rng.uniform(-15, 15, n)) % 360
+
+    # Update speed with small random changes
+    fleet.speed[:] = np.clip(fleet.speed + rng.uniform(-0.5, 0.5, n), 0.5, 20)
+
+    # Distance traveled in 1 minute (knots -> km/h -> km per minute)
+    distance_km = fleet.speed * 1.852 / 60
+    fleet.lat[:], fleet.lon[:] = destination_points(fleet.lat, fleet.lon, distance_km, fleet.heading)
+
+    # Update operation time
+    fleet.operation_time += 1/60  # Add 1 minute
+
+    # 30% chance of catching 0-5 kg of fish in this update
+    catch = rng.uniform(0, 5, n)
+    fleet.fish_caught += np.where(rng.random(n) < 0.3, catch, 0.0)
+
+    # Fuel burns 0.05-0.15% per minute
+    fleet.fuel_level[:] = np.maximum(0, fleet.fuel_level - rng.uniform(*FUEL_BURN_RANGE, n))
+
+    fleet.geofence_distance[:] = default_geofence().signed_distance(fleet.lat, fleet.lon)
+    assess_fleet(fleet)
+
+    fleet.last_update[:] = time.time()
+    fleet.tick += 1
+    return fleet
+
+
+def risk_score(geofence_distance, fuel_level, operation_time, env_risk):
+    """Weighted risk from its four factors; works elementwise on arrays of any shape."""
+    # 1. Distance to geofence (higher risk when closer to or beyond geofence)
+    distance_risk = np.clip(1 - ((geofence_distance + 5) / 35), 0, 1)
+    # 2. Fuel level (higher risk with lower fuel)
+    fuel_risk = np.clip((100 - fuel_level) / 100, 0, 1)
+    # 3. Operation time (higher risk with longer operation time, max 24 hours)
+    time_risk = np.clip(operation_time / 24, 0, 1)
+
+    return (
+        RISK_WEIGHTS["distance"] * distance_risk +
+        RISK_WEIGHTS["fuel"] * fuel_risk +
+        RISK_WEIGHTS["time"] * time_risk +
+        RISK_WEIGHTS["env"] * env_risk
+    )
+
+
+def score_risk(model, geofence_distance, fuel_level, operation_time, speed, heading, env_risk):
+    """Score with ``model``, or with the hand-weighted :func:`risk_score` when it is None."""
+    if model is None:
+        return risk_score(geofence_distance, fuel_level, operation_time, env_risk)
+    return model.score(
+        geofence_distance=geofence_distance,
+        fuel_level=fuel_level,
+        operation_time=operation_time,
+        speed=speed,
+        heading=heading,
+        env_risk=env_risk,
+    )
+
+
+def assess_risk(fleet, rows=None):
+    """Recompute risk and safety status, for every vessel or only the vessels in ``rows``."""
+    sel = slice(None) if rows is None else rows
+    n = len(fleet) if rows is None else len(rows)
+    geofence_distance = fleet.geofence_distance[sel]
+
+    # Random environmental factors (weather, sea condition)
+    env_risk = fleet.rng.uniform(*ENV_RISK_RANGE, n)
+    risk = score_risk(
+        fleet.risk_model,
+        geofence_distance=geofence_distance,
+        fuel_level=fleet.fuel_level[sel],
+        operation_time=fleet.operation_time[sel],
+        speed=fleet.speed[sel],
+        heading=fleet.heading[sel],
+        env_risk=env_risk,
+    )
+    fleet.risk_level[sel] = risk
+
+    # Safety status
+    fleet.safety_status[sel] = np.select(
+        [
+            geofence_distance < -5,  # More than 5km beyond geofence
+            geofence_distance < 0,   # Beyond geofence but within 5km
+            risk > HIGH_RISK,        # High risk but within geofence
+        ],
+        [SAFETY_DANGER, SAFETY_WARNING, SAFETY_CAUTION],
+        SAFETY_SAFE
+    )
+    return fleet
+
+
+def assess_fleet(fleet, rows=None):
+    """Recompute risk and the three status codes from the current fleet state.
+
+    Engine and communication statuses follow the simulator's random rules;
+    vessels that report their own status should only go through
+    :func:`assess_risk`.
+    """
+    assess_risk(fleet, rows)
+    sel = slice(None) if rows is None else rows
+    n = len(fleet) if rows is None else len(rows)
+    rng = fleet.rng
+    risk = fleet.risk_level[sel]
+
+    # Engine status: the Warning rule is checked first, exactly like the per-boat code
+    engine_warning = (risk > HIGH_RISK) | ((risk > 0.5) & (rng.random(n) < 0.1))
+    engine_critical = ~engine_warning & ((risk > 0.9) | ((risk > HIGH_RISK) & (rng.random(n) < 0.05)))
+    fleet.engine_status[sel] = np.select(
+        [engine_warning, engine_critical], [ENGINE_WARNING, ENGINE_CRITICAL], ENGINE_NORMAL
+    )
+
+    # Communication status
+    comm_intermittent = (risk > 0.8) & (rng.random(n) < 0.1)
+    comm_lost = ~comm_intermittent & (risk > 0.9) & (rng.random(n) < 0.05)
+    fleet.communication_status[sel] = np.select(
+        [comm_intermittent, comm_lost], [COMM_INTERMITTENT, COMM_LOST], COMM_ACTIVE
+    )
+    return fleet
+
+
+def _format_time(epoch):
+    return datetime.fromtimestamp(epoch).strftime("%H:%M:%S")
+
+
+# Boat record keys, in the order the dashboard has always used, mapped to
+# (FleetState array, converter from the stored value to the displayed one)
+RECORD_FIELDS = {
+    "id": ("ids", int),
+    "name": ("names", str),
+    "lat": ("lat", float),
+    "lon": ("lon", float),
+    "speed": ("speed", float),
+    "heading": ("heading", float),
+    "crew_size": ("crew_size", int),
+    "operation_time": ("operation_time", float),
+    "fish_caught": ("fish_caught", float),
+    "risk_level": ("risk_level", float),
+    "fuel_level": ("fuel_level", float),
+    "engine_status": ("engine_status", ENGINE_STATUSES.__getitem__),
+    "communication_status": ("communication_status", COMMUNICATION_STATUSES.__getitem__),
+    "safety_status": ("safety_status", SAFETY_STATUSES.__getitem__),
+    "last_update": ("last_update", _format_time),
+}
+
+
+class Vessel(Mapping):
+    """Read-only, dict-compatible view of one fleet row.
+
+    ``vessel["risk_level"]``, ``.get``, ``.items`` and ``dict(vessel)`` behave
+    like the old boat dicts, but nothing is copied: each lookup reads the
+    fleet array and converts the value (status codes to labels, epoch to
+    ``HH:MM:SS``). A view holds two references, whatever the fleet size.
+    """
+    __slots__ = ("fleet", "row")
+
+    def __init__(self, fleet, row):
+        self.fleet = fleet
+        self.row = row
+
+    def __getitem__(self, key):
+        array, convert = RECORD_FIELDS[key]
+        return convert(getattr(self.fleet, array)[self.row])
+
+    def __iter__(self):
+        return iter(RECORD_FIELDS)
+
+    def __len__(self):
+        return len(RECORD_FIELDS)
+
+    def __repr__(self):
+        return f"Vessel({dict(self)!r})"
+
+
+class VesselRecords(Sequence):
+    """Sequence of :class:`Vessel` views over a fleet, created on access."""
+    __slots__ = ("fleet",)
+
+    def __init__(self, fleet):
+        self.fleet = fleet
+
+    def __getitem__(self, index):
+        rows = range(len(self.fleet))
+        if isinstance(index, slice):
+            return [Vessel(self.fleet, row) for row in rows[index]]
+        return Vessel(self.fleet, rows[index])
+
+    def __len__(self):
+        return len(self.fleet)
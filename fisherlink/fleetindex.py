@@ -0,0 +1,168 @@
+"""Indexed vessel lookup and filtering for one fleet snapshot.
+
+:class:`FleetIndex` answers the Boat Details queries without scanning
+vessel records:
+
+* ``row(vessel_id)`` is one array read (a dict lookup for sparse ids).
+* Risk bands and safety statuses are packed bitmaps, one bit per vessel.
+  A combined filter is a few byte-wise ANDs over ``n / 8`` bytes.
+* Name search goes through a :class:`NameIndex`, an inverted index of
+  every 1-, 2- and 3-character substring (n-gram) of the lower-cased
+  names. A term of up to three characters is a single posting list. A
+  longer term intersects the posting lists of its trigrams, smallest
+  first, and checks only the surviving candidates for the full
+  substring.
+
+Names do not change once a fleet is generated, while risk and status
+change every tick. So a :class:`NameIndex` is built once and passed to
+the :class:`FleetIndex` of every snapshot, and only the bitmaps are
+rebuilt per snapshot.
+"""
+import functools
+
+import numpy as np
+
+from fisherlink.fleet import SAFETY_STATUSES, risk_band
+
+# Labels of the risk_band codes, as the Boat Details filter names them
+RISK_BANDS = ("Low Risk", "Medium Risk", "High Risk")
+
+# Longest n-gram indexed; longer terms are answered from their trigrams
+MAX_GRAM = 3
+
+# Unicode code points fit in 21 bits, so three of them pack into one uint64
+_CODE_BITS = 21
+
+
+def _char_codes(names):
+    """``(n, width)`` code point matrix of the names, zero-padded on the right."""
+    names = np.asarray(names, dtype=str)
+    width = max(names.dtype.itemsize // 4, 1)
+    return np.ascontiguousarray(names.astype(f"<U{width}")).view(np.uint32).reshape(len(names), width)
+
+
+def _gram_codes(chars, n):
+    """Code of every n-gram starting at each column; 0 where it would run past the name."""
+    width = chars.shape[1]
+    if width < n:
+        return np.zeros((len(chars), 0), dtype=np.uint64)
+    codes = np.zeros((len(chars), width - n + 1), dtype=np.uint64)
+    valid = np.ones(codes.shape, dtype=bool)
+    for k in range(n):
+        part = chars[:, k:width - n + 1 + k].astype(np.uint64)
+        valid &= part > 0
+        codes |= part << np.uint64(_CODE_BITS * (MAX_GRAM - 1 - k))
+    return np.where(valid, codes, 0)
+
+
+class NameIndex:
+    """Case-insensitive substring search over vessel names."""
+
+    def __init__(self, names):
+        self.names = np.char.lower(np.asarray(names, dtype=str))
+        chars = _char_codes(self.names)
+        codes, rows = [], []
+        for n in range(1, MAX_GRAM + 1):
+            grams = _gram_codes(chars, n)
+            found = grams > 0
+            codes.append(grams[found])
+            rows.append(np.nonzero(found)[0])
+        codes = np.concatenate(codes)
+        rows = np.concatenate(rows).astype(np.int32)
+
+        # One posting per (gram, row), sorted by gram then row
+        order = np.lexsort((rows, codes))
+        codes, rows = codes[order], rows[order]
+        first = np.ones(len(codes), dtype=bool)
+        first[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes, self._rows = codes[first], rows[first]
+        self._grams, starts = np.unique(codes, return_index=True)
+        self._offsets = np.append(starts, len(codes))
+
+    def __len__(self):
+        return len(self.names)
+
+    def _postings(self, gram_code):
+        i = np.searchsorted(self._grams, gram_code)
+        if i == len(self._grams) or self._grams[i] != gram_code:
+            return self._rows[:0]
+        return self._rows[self._offsets[i]:self._offsets[i + 1]]
+
+    def search(self, term):
+        """Rows whose name contains ``term``, ignoring case, ascending."""
+        term = term.lower()
+        if not term:
+            return np.arange(len(self.names))
+        chars = _char_codes([term])
+        n = min(len(term), MAX_GRAM)
+        grams = np.unique(_gram_codes(chars, n)[0])
+        postings = sorted((self._postings(code) for code in grams), key=len)
+        rows = postings[0]
+        for other in postings[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        if len(term) > MAX_GRAM and len(rows):
+            # Shared trigrams do not guarantee the whole term appears in order
+            rows = rows[np.char.find(self.names[rows], term) >= 0]
+        return rows.astype(np.intp)
+
+
+class FleetIndex:
+    """Lookup and filter queries over one snapshot; see the module docstring."""
+
+    def __init__(self, fleet, name_index=None):
+        if name_index is None:
+            name_index = NameIndex(fleet.names)
+        elif len(name_index) != len(fleet):
+            raise ValueError("name_index was built for a different fleet")
+        self.ids = np.asarray(fleet.ids)
+        self.names = name_index
+        # Dense ids (the usual 1..n) index a row array directly; sparse ones fall back to a dict
+        if len(self.ids) and 0 <= self.ids.min() and self.ids.max() < 4 * len(self.ids) + 64:
+            self._row_of = np.full(int(self.ids.max()) + 1, -1, dtype=np.intp)
+            self._row_of[self.ids] = np.arange(len(self.ids))
+            self._rows = None
+        else:
+            self._rows = dict(zip(self.ids.tolist(), range(len(self.ids))))
+        bands = risk_band(fleet.risk_level)
+        self._risk = [np.packbits(bands == band) for band in range(len(RISK_BANDS))]
+        self._status = [np.packbits(fleet.safety_status == code) for code in range(len(SAFETY_STATUSES))]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, vessel_id):
+        """Row of ``vessel_id``, or None if the fleet has no such vessel."""
+        if vessel_id is None:
+            return None
+        if self._rows is not None:
+            return self._rows.get(vessel_id)
+        if not 0 <= vessel_id < len(self._row_of) or self._row_of[vessel_id] < 0:
+            return None
+        return int(self._row_of[vessel_id])
+
+    def query(self, risk=None, status=None, search=None):
+        """Rows matching every filter given, ascending.
+
+        ``risk`` is a :data:`RISK_BANDS` label, ``status`` a
+        ``SAFETY_STATUSES`` label. ``search`` matches a substring of the
+        name, ignoring case, or the vessel id written out exactly
+        (``"6"``, not ``"06"``).
+        """
+        bitmaps = []
+        if risk is not None:
+            bitmaps.append(self._risk[RISK_BANDS.index(risk)])
+        if status is not None:
+            bitmaps.append(self._status[SAFETY_STATUSES.index(status)])
+        rows = None
+        if bitmaps:
+            rows = np.flatnonzero(np.unpackbits(functools.reduce(np.bitwise_and, bitmaps), count=len(self)))
+
+        if search:
+            found = self.names.search(search)
+            by_id = self.row(int(search)) if search.isdecimal() and str(int(search)) == search else None
+            if by_id is not None:
+                found = np.union1d(found, [by_id])
+            rows = found if rows is None else np.intersect1d(rows, found, assume_unique=True)
+        return np.arange(len(self)) if rows is None else rows
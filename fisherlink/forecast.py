@@ -0,0 +1,72 @@
+"""Fleet-wide risk forecast over the next couple of hours.
+
+Each vessel is dead-reckoned along its current speed and heading, and
+its fuel and operation time are run forward at the simulator's expected
+rates. Risk is then re-scored at every horizon point with the fleet's
+risk model (the weighted :func:`fisherlink.fleet.risk_score` formula by
+default), exactly as the simulation step scores it, taking the
+environmental factor at its mean. The whole fleet x horizon grid is
+computed as ``(n, h)`` arrays in one pass, including one geofence
+distance query for all projected positions.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from fisherlink.fleet import ENV_RISK_RANGE, FUEL_BURN_RANGE, HIGH_RISK, score_risk
+from fisherlink.geo import destination_points
+from fisherlink.geofence import default_geofence
+
+# Forecast points, in minutes from now
+HORIZON_MINUTES = (30, 60, 90, 120)
+
+
+@dataclass(frozen=True)
+class RiskForecast:
+    """Projected state per vessel (rows) and horizon point (columns)."""
+    minutes: np.ndarray
+    lat: np.ndarray
+    lon: np.ndarray
+    risk: np.ndarray
+    first_high: np.ndarray  # column of the first risk > HIGH_RISK, or -1
+
+    @property
+    def high_risk_rows(self):
+        """Vessels forecast to cross into high risk within the horizon."""
+        return np.flatnonzero(self.first_high >= 0)
+
+    @property
+    def max_risk(self):
+        return self.risk.max(axis=1)
+
+
+def forecast_fleet(fleet, minutes=HORIZON_MINUTES, threshold=HIGH_RISK):
+    """Forecast risk for every vessel at each offset in ``minutes``."""
+    minutes = np.asarray(minutes, dtype=float)
+    n, h = len(fleet), len(minutes)
+
+    # Dead reckoning: knots -> km per minute, straight along the current heading
+    distance_km = (fleet.speed * 1.852 / 60)[:, None] * minutes
+    lat, lon = destination_points(
+        np.repeat(fleet.lat, h), np.repeat(fleet.lon, h), distance_km.ravel(), np.repeat(fleet.heading, h)
+    )
+    geofence_distance = default_geofence().signed_distance(lat, lon).reshape(n, h)
+    lat, lon = lat.reshape(n, h), lon.reshape(n, h)
+
+    fuel_level = np.maximum(0, fleet.fuel_level[:, None] - np.mean(FUEL_BURN_RANGE) * minutes)
+    operation_time = fleet.operation_time[:, None] + minutes / 60
+    risk = score_risk(
+        fleet.risk_model,
+        geofence_distance=geofence_distance,
+        fuel_level=fuel_level,
+        operation_time=operation_time,
+        speed=np.broadcast_to(fleet.speed[:, None], (n, h)),
+        heading=np.broadcast_to(fleet.heading[:, None], (n, h)),
+        env_risk=np.mean(ENV_RISK_RANGE),
+    )
+
+    # First crossing per vessel in one reduction: argmax finds the first True column
+    above = risk > threshold
+    first_high = np.where(above.any(axis=1), above.argmax(axis=1), -1)
+
+    return RiskForecast(minutes=minutes, lat=lat, lon=lon, risk=risk, first_high=first_high)
@@ -0,0 +1,56 @@
+"""Polygon geofence with true point-to-coastline distances.
+
+The legacy ``distance_to_geofence`` measures to the nearest coastal vertex
+and its paired geofence point, so it is wrong between vertices and gets
+slower as the coastline is densified. :class:`GeofenceEngine` instead
+builds the geofence as a shapely polygon in the local kilometre plane of
+a :class:`fisherlink.spatial.CoastIndex`: every point within ``width_km``
+of the simplified coastline. Inside/outside tests run as one prepared
+``contains_xy`` call per batch, and distances come from the index.
+"""
+from functools import lru_cache
+
+import numpy as np
+import shapely
+
+from fisherlink.geo import COASTAL_COORDS, GEOFENCE_KM
+from fisherlink.spatial import SIMPLIFY_TOLERANCE_KM, CoastIndex
+
+
+class GeofenceEngine:
+    """Signed distance and containment tests against the coastal geofence.
+
+    Signed distances follow ``distance_to_geofence``: positive inside the
+    geofence, negative beyond it, in kilometres to the geofence boundary.
+    """
+
+    def __init__(self, coast_coords=COASTAL_COORDS, width_km=GEOFENCE_KM,
+                 tolerance_km=SIMPLIFY_TOLERANCE_KM, quad_segs=16):
+        self.width_km = width_km
+        self.coast = CoastIndex(coast_coords, tolerance_km=tolerance_km)
+        self.projection = self.coast.projection
+        self.coastline = self.coast.coastline
+        self.zone = self.coast.simplified.buffer(width_km, quad_segs=quad_segs)
+        shapely.prepare(self.zone)
+
+    def contains(self, lat, lon):
+        """Boolean array: True where the position lies inside the geofence."""
+        x, y = self.coast.project(lat, lon)
+        return shapely.contains_xy(self.zone, x, y)
+
+    def shore_distance(self, lat, lon):
+        """Distance in km from each position to the nearest point on the coastline."""
+        return self.coast.shore_distance(lat, lon)
+
+    def signed_distance(self, lat, lon):
+        """Distance in km to the geofence boundary, signed by the polygon containment test."""
+        x, y = self.coast.project(lat, lon)
+        magnitude = np.abs(self.width_km - self.coast.distance_xy(x, y))
+        inside = shapely.contains_xy(self.zone, x, y)
+        return np.where(inside, magnitude, -magnitude)
+
+
+@lru_cache(maxsize=None)
+def default_geofence():
+    """Geofence over ``COASTAL_COORDS``, built once per process."""
+    return GeofenceEngine()
@@ -0,0 +1,133 @@
+"""Fixed-capacity vessel history backed by NumPy ring buffers.
+
+The boat dicts used to carry three Python lists each (positions, risk
+levels and ``%H:%M:%S`` strings) that were appended to and re-sliced on
+every tick. :class:`HistoryBuffer` preallocates one block per fleet,
+indexed by vessel row, and stores epoch timestamps. Appending a tick is a
+handful of vectorized writes; memory is fixed by ``capacity`` no matter
+how long the simulation runs.
+
+Every sample is written twice, at slot ``s`` and ``s + capacity``. The most
+recent ``k`` samples of a vessel are then always one contiguous slice, so
+trails and risk series are returned as views without copying or
+re-ordering, at the cost of doubling the buffer.
+"""
+import numpy as np
+
+# Default samples kept per vessel
+HISTORY_LENGTH = 100
+
+# 24 hours at one sample per minute
+DAY_RETENTION_S = 24 * 3600
+MINUTE_RESOLUTION_S = 60
+
+
+class HistoryBuffer:
+    """Ring buffer of ``(lat, lon)``, risk and epoch time per vessel.
+
+    ``resolution_s`` sets the spacing between stored samples: an append
+    that arrives less than ``resolution_s`` after the vessel's newest slot
+    was opened overwrites that slot instead of using a new one, so the
+    newest position is always current while retention stays
+    ``capacity * resolution_s``.
+    """
+
+    def __init__(self, num_vessels, capacity=HISTORY_LENGTH, resolution_s=0.0):
+        self.capacity = int(capacity)
+        self.resolution_s = float(resolution_s)
+        shape = (num_vessels, 2 * self.capacity)
+        self._positions = np.full(shape + (2,), np.nan, dtype=np.float32)
+        self._risk = np.full(shape, np.nan, dtype=np.float32)
+        self._time = np.full(shape, np.nan, dtype=np.float64)
+        self._head = np.zeros(num_vessels, dtype=np.int64)  # next slot to write
+        self._count = np.zeros(num_vessels, dtype=np.int64)
+        self._written = np.zeros(num_vessels, dtype=np.int64)  # samples ever written, overwrites included
+        self._opened = np.zeros(num_vessels, dtype=np.float64)  # time the newest slot was started
+
+    @classmethod
+    def for_retention(cls, num_vessels, retention_s=DAY_RETENTION_S, resolution_s=MINUTE_RESOLUTION_S):
+        """Buffer holding ``retention_s`` of history sampled every ``resolution_s``."""
+        return cls(num_vessels, capacity=int(np.ceil(retention_s / resolution_s)), resolution_s=resolution_s)
+
+    def __len__(self):
+        return len(self._head)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the preallocated arrays."""
+        arrays = (self._positions, self._risk, self._time, self._head, self._count, self._written, self._opened)
+        return sum(a.nbytes for a in arrays)
+
+    def count(self, i):
+        """Number of samples currently stored for vessel ``i``."""
+        return int(self._count[i])
+
+    def version(self, i):
+        """``(write index, newest timestamp)`` of vessel ``i``; changes on every append to it.
+
+        The write index counts every sample ever written, overwrites of the
+        newest slot included, so unlike :meth:`count` it keeps growing once
+        the ring is full.
+        """
+        newest = self._time[i, self._head[i] - 1 + self.capacity] if self._count[i] else None
+        return int(self._written[i]), None if newest is None else float(newest)
+
+    def append(self, lat, lon, risk, timestamp, rows=None):
+        """Store one sample for each vessel in ``rows`` (default: every vessel)."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        timestamp = np.broadcast_to(np.asarray(timestamp, dtype=np.float64), rows.shape)
+
+        # Reports older than a vessel's newest sample arrived out of order; drop them
+        newest = (self._head[rows] - 1) % self.capacity
+        has_samples = self._count[rows] > 0
+        fresh = ~has_samples | (timestamp >= self._time[rows, newest])
+        if not fresh.all():
+            rows, timestamp, newest, has_samples = rows[fresh], timestamp[fresh], newest[fresh], has_samples[fresh]
+            lat, lon, risk = (np.broadcast_to(v, fresh.shape)[fresh] for v in (lat, lon, risk))
+
+        # Samples closer than the resolution overwrite the vessel's newest slot
+        replace = has_samples & (timestamp - self._opened[rows] < self.resolution_s)
+        slot = np.where(replace, newest, self._head[rows])
+
+        for offset in (0, self.capacity):
+            self._positions[rows, slot + offset, 0] = lat
+            self._positions[rows, slot + offset, 1] = lon
+            self._risk[rows, slot + offset] = risk
+            self._time[rows, slot + offset] = timestamp
+
+        self._written[rows] += 1
+        advance = rows[~replace]
+        self._opened[advance] = timestamp[~replace]
+        self._head[advance] = (self._head[advance] + 1) % self.capacity
+        self._count[advance] = np.minimum(self._count[advance] + 1, self.capacity)
+
+    def record(self, fleet, rows=None):
+        """Append the fleet's current position, risk and update time."""
+        if rows is None:
+            self.append(fleet.lat, fleet.lon, fleet.risk_level, fleet.last_update)
+        else:
+            rows = np.asarray(rows)
+            self.append(fleet.lat[rows], fleet.lon[rows], fleet.risk_level[rows], fleet.last_update[rows], rows)
+
+    def _window(self, i, length):
+        count = self._count[i]
+        length = count if length is None else min(length, count)
+        end = self._head[i] + self.capacity
+        return slice(end - length, end)
+
+    def positions(self, i, length=None):
+        """View of the last ``length`` positions of vessel ``i``, oldest first, shape ``(k, 2)``."""
+        return self._positions[i, self._window(i, length)]
+
+    def risk_levels(self, i, length=None):
+        """View of the last ``length`` risk levels of vessel ``i``, oldest first."""
+        return self._risk[i, self._window(i, length)]
+
+    def timestamps(self, i, length=None):
+        """View of the last ``length`` epoch timestamps of vessel ``i``, oldest first."""
+        return self._time[i, self._window(i, length)]
+
+    def samples(self, i, length=None):
+        """``(version, positions, risk_levels, timestamps)`` of vessel ``i``'s last ``length`` samples."""
+        window = self._window(i, length)
+        return self.version(i), self._positions[i, window], self._risk[i, window], self._time[i, window]
@@ -0,0 +1,193 @@
+"""Incremental vessel map: one long-lived Leaflet instance fed with deltas.
+
+The full-render map ships a complete HTML document on every refresh,
+which resets zoom and pan and costs hundreds of KB per tick. The live map
+is a small Streamlit component (``live_map/index.html``) that builds its
+Leaflet map once and keeps it across reruns. :class:`MapDeltaFeed` tracks
+what each session's map has already received and emits only the vessels
+whose position, risk or status changed, as columnar arrays of about a
+hundred bytes per vessel. Each vessel carries its popup fields, so the
+browser builds a popup when its marker is clicked without asking Python.
+
+The base layers match the full-render map: the tile layers and layer
+control, the coastline, the geofence and the 30 km connectors between
+them. Tile layers that folium cannot resolve to a URL template (the
+Stamen styles, which moved behind an API key) are left out.
+"""
+import os
+from functools import lru_cache
+
+import folium
+import numpy as np
+
+from fisherlink.fleet import (
+    COMMUNICATION_STATUSES, ENGINE_STATUSES, HIGH_RISK, LOW_RISK, RECORD_FIELDS, SAFETY_STATUSES,
+)
+from fisherlink.geo import COASTAL_COORDS, GEOFENCE_POINTS
+from fisherlink.mapview import MAP_CENTER, TILE_LAYERS
+
+COMPONENT_DIR = os.path.join(os.path.dirname(__file__), "live_map")
+
+# Changes smaller than these are not worth sending to the browser
+POSITION_EPS = 1e-5  # degrees, roughly 1 m
+RISK_EPS = 0.005
+
+# Popup fields sent with every vessel in a message and the decimals kept
+DETAIL_FIELDS = {
+    "speed": 2,
+    "heading": 1,
+    "operation_time": 2,
+    "fish_caught": 1,
+    "fuel_level": 2,
+}
+STATUS_FIELDS = {
+    "engine_status": ENGINE_STATUSES,
+    "communication_status": COMMUNICATION_STATUSES,
+    "safety_status": SAFETY_STATUSES,
+}
+
+
+@lru_cache(maxsize=None)
+def tile_layers():
+    """``TILE_LAYERS`` as Leaflet tile layer options, resolved the way folium resolves them."""
+    layers = []
+    for tiles, name, attr in TILE_LAYERS:
+        layer = folium.TileLayer(tiles, name=name, attr=attr)
+        if "{z}" not in layer.tiles:
+            continue
+        layers.append({
+            "name": name,
+            "url": layer.tiles,
+            "attribution": attr,
+            "subdomains": layer.options["subdomains"],
+            "maxZoom": layer.options["max_zoom"],
+        })
+    return layers
+
+
+def _details(fleet, rows):
+    """Popup columns for ``rows``; statuses stay codes, labelled in the browser."""
+    details = {field: np.round(getattr(fleet, field)[rows], decimals).tolist()
+               for field, decimals in DETAIL_FIELDS.items()}
+    for field in STATUS_FIELDS:
+        details[field] = getattr(fleet, field)[rows].tolist()
+    format_time = RECORD_FIELDS["last_update"][1]
+    details["last_update"] = [format_time(epoch) for epoch in fleet.last_update[rows]]
+    return details
+
+
+def _status_codes(fleet):
+    return np.column_stack([getattr(fleet, field) for field in STATUS_FIELDS])
+
+
+class MapDeltaFeed:
+    """Per-session record of what the live map holds, producing update messages.
+
+    Messages are versioned; a delta carries the version it applies on top
+    of (``base``) so the browser can detect a gap and request a snapshot.
+    Popup fields ride along with the vessels a message lists, so a vessel
+    that holds still keeps the popup of its last listed tick; its "Last
+    Update" row says which one.
+    """
+
+    def __init__(self, position_eps=POSITION_EPS, risk_eps=RISK_EPS):
+        self.position_eps = position_eps
+        self.risk_eps = risk_eps
+        self.version = 0
+        self.handled_resync = None
+        self._tick = None
+        self._message = None
+        self._ids = None
+        self._lat = None
+        self._lon = None
+        self._risk = None
+        self._status = None
+
+    def message(self, fleet, full=False):
+        """Message for the current fleet tick; repeated calls within a tick reuse it."""
+        if not full and self._message is not None and fleet.tick == self._tick:
+            return self._message
+
+        lat = np.round(fleet.lat, 5)
+        lon = np.round(fleet.lon, 5)
+        risk = np.round(fleet.risk_level, 3)
+        status = _status_codes(fleet)
+
+        if full or self._ids is None or not np.array_equal(self._ids, fleet.ids):
+            # Fleet composition changed or the browser lost track: send everything
+            self._ids = fleet.ids.copy()
+            self._lat, self._lon, self._risk, self._status = lat, lon, risk, status
+            self.version += 1
+            message = {
+                "full": True,
+                "version": self.version,
+                "ids": fleet.ids.tolist(),
+                "names": list(fleet.names),
+                "lat": lat.tolist(),
+                "lon": lon.tolist(),
+                "risk": risk.tolist(),
+                "crew_size": fleet.crew_size.tolist(),
+                **_details(fleet, slice(None)),
+                "statuses": {field: list(labels) for field, labels in STATUS_FIELDS.items()},
+                "coastline": [list(point) for point in COASTAL_COORDS],
+                "geofence": [list(point) for point in GEOFENCE_POINTS],
+            }
+        else:
+            changed = np.flatnonzero(
+                (np.abs(lat - self._lat) > self.position_eps) |
+                (np.abs(lon - self._lon) > self.position_eps) |
+                (np.abs(risk - self._risk) > self.risk_eps) |
+                (status != self._status).any(axis=1)
+            )
+            # Compare future ticks against what the browser actually holds
+            self._lat[changed] = lat[changed]
+            self._lon[changed] = lon[changed]
+            self._risk[changed] = risk[changed]
+            self._status[changed] = status[changed]
+            self.version += 1
+            message = {
+                "base": self.version - 1,
+                "version": self.version,
+                "ids": fleet.ids[changed].tolist(),
+                "lat": lat[changed].tolist(),
+                "lon": lon[changed].tolist(),
+                "risk": risk[changed].tolist(),
+                **_details(fleet, changed),
+            }
+
+        self._tick = fleet.tick
+        self._message = message
+        return message
+
+    def wants_resync(self, component_value):
+        """True once per resync request reported back by the browser."""
+        if not component_value or "resync" not in component_value:
+            return False
+        if component_value["resync"] == self.handled_resync:
+            return False
+        self.handled_resync = component_value["resync"]
+        return True
+
+
+@lru_cache(maxsize=None)
+def _component():
+    # Imported lazily so the simulation package never needs Streamlit
+    import streamlit.components.v1 as components
+    return components.declare_component("live_map", path=COMPONENT_DIR)
+
+
+def live_map(fleet, feed, key="live_map", height=600, zoom=9):
+    """Render (or update) the live map for this session."""
+    import streamlit as st
+
+    full = feed.wants_resync(st.session_state.get(key))
+    return _component()(
+        delta=feed.message(fleet, full=full),
+        center=list(MAP_CENTER),
+        zoom=zoom,
+        tiles=tile_layers(),
+        risk_bands=[LOW_RISK, HIGH_RISK],
+        height=height,
+        key=key,
+        default=None,
+    )
@@ -0,0 +1,274 @@
+"""Folium map rendering for the monitoring view.
+
+The map is split into a static base layer (tiles, coastline, geofence and
+the 30 km connectors) that is rendered to HTML once per process, and a
+small vessel layer: a JSON payload plus a few lines of Leaflet script that
+draw the markers and trails in the browser. Only the vessel layer has to
+be regenerated when positions change.
+"""
+import json
+
+import folium
+import numpy as np
+
+from fisherlink.fleet import risk_band
+from fisherlink.geo import COASTAL_COORDS, GEOFENCE_POINTS
+
+# Map centered between Chennai and Pondicherry
+MAP_CENTER = ((13.0827 + 11.9300) / 2, (80.2707 + 79.8300) / 2)
+
+CARTO_ATTR = '&copy; <a href="http://www.openstreetmap.org/copyright">OpenStreetMap</a> &copy; <a href="http://cartodb.com/attributions">CartoDB</a>'
+OSM_ATTR = '&copy; <a href="http://www.openstreetmap.org/copyright">OpenStreetMap</a>'
+STAMEN_ATTR = 'Map tiles by <a href="http://stamen.com">Stamen Design</a>, under <a href="http://creativecommons.org/licenses/by/3.0">CC BY 3.0</a>. Data by <a href="http://openstreetmap.org">OpenStreetMap</a>, under <a href="http://www.openstreetmap.org/copyright">ODbL</a>'
+
+TILE_LAYERS = [
+    ('CartoDB dark_matter', 'Dark Map (Default)', CARTO_ATTR),
+    ('CartoDB positron', 'Light Map', CARTO_ATTR),
+    ('OpenStreetMap', 'Standard Map', OSM_ATTR),
+    ('Stamen Terrain', 'Terrain Map', STAMEN_ATTR),
+    ('Stamen Watercolor', 'Watercolor Map', STAMEN_ATTR),
+]
+
+# Number of recent positions drawn as a trail behind each marker
+TRAIL_LENGTH = 10
+
+# Initial zoom of the detail-panel mini map; its track is simplified for this zoom
+MINI_MAP_ZOOM = 10
+
+
+# Marker color and icon per risk band
+RISK_STYLES = (('green', 'ship'), ('orange', 'ship'), ('red', 'warning'))
+
+
+# Determine marker color and icon based on risk level
+def risk_style(risk_level):
+    return RISK_STYLES[risk_band(risk_level)]
+
+
+# Tiles, coastline and geofence shared by every render of the map
+def add_base_layers(m):
+    # Add additional map layers
+    for tiles, name, attr in TILE_LAYERS:
+        folium.TileLayer(tiles, name=name, attr=attr).add_to(m)
+
+    # Add layer control
+    folium.LayerControl().add_to(m)
+
+    # Add coastal line (following the OpenStreetMap purple boundary)
+    folium.PolyLine(
+        locations=COASTAL_COORDS,
+        color='#BB86FC',  # Light purple for better visibility on dark background
+        weight=3,
+        opacity=0.8,
+        tooltip='Coastline (OSM boundary)'
+    ).add_to(m)
+
+    # Create geofence boundary line 30km from shore
+    folium.PolyLine(
+        locations=GEOFENCE_POINTS,
+        color='#FF4444',  # Bright red for visibility on dark background
+        weight=3,
+        opacity=0.8,
+        tooltip='30km Geofence Boundary (Signal Limit)'
+    ).add_to(m)
+
+    # Connect coastal points to geofence points to show the 30km distance
+    for i in range(len(COASTAL_COORDS)):
+        folium.PolyLine(
+            locations=[COASTAL_COORDS[i], GEOFENCE_POINTS[i]],
+            color='#FFAB40',  # Orange
+            weight=1,
+            opacity=0.5,
+            dash_array='5',
+            tooltip='30km Distance'
+        ).add_to(m)
+    return m
+
+
+def new_map():
+    # Use a dark map tile for the base map
+    return folium.Map(
+        location=list(MAP_CENTER),
+        zoom_start=9,
+        tiles="CartoDB dark_matter",  # Use dark theme map
+        scrollWheelZoom=True
+    )
+
+
+# Popup content with dark mode styling for a single boat record
+def popup_html(boat):
+    return f"""
+    <div style="width: 250px; background-color: #1E1E1E; color: white; border-radius: 5px; padding: 5px;">
+        <h3 style="text-align: center; color: #90CAF9;">{boat['name']}</h3>
+        <table style="width: 100%; color: white;">
+            <tr><td><b>Speed:</b></td><td>{boat['speed']:.1f} knots</td></tr>
+            <tr><td><b>Heading:</b></td><td>{boat['heading']:.1f}°</td></tr>
+            <tr><td><b>Crew:</b></td><td>{boat['crew_size']} persons</td></tr>
+            <tr><td><b>Operation Time:</b></td><td>{boat['operation_time']:.1f} hours</td></tr>
+            <tr><td><b>Fish Caught:</b></td><td>{boat['fish_caught']:.1f} kg</td></tr>
+            <tr><td><b>Fuel Level:</b></td><td>{boat['fuel_level']:.1f}%</td></tr>
+            <tr><td><b>Engine Status:</b></td><td>{boat['engine_status']}</td></tr>
+            <tr><td><b>Communication:</b></td><td>{boat['communication_status']}</td></tr>
+            <tr><td><b>Safety Status:</b></td><td>{boat['safety_status']}</td></tr>
+            <tr><td><b>Risk Level:</b></td><td>{boat['risk_level']:.2f}</td></tr>
+            <tr><td><b>Last Update:</b></td><td>{boat['last_update']}</td></tr>
+        </table>
+    </div>
+    """
+
+
+# Create the interactive map with every vessel rendered server-side;
+# boat i's trail comes from row i of the history buffer
+def create_map(boats, history):
+    m = add_base_layers(new_map())
+
+    # Add boats to the map
+    for i, boat in enumerate(boats):
+        color, icon = risk_style(boat["risk_level"])
+
+        # Add marker
+        folium.Marker(
+            location=[boat["lat"], boat["lon"]],
+            popup=folium.Popup(popup_html(boat), max_width=300),
+            tooltip=f"{boat['name']} - Risk: {boat['risk_level']:.2f}",
+            icon=folium.Icon(color=color, icon=icon, prefix='fa')
+        ).add_to(m)
+
+        # Add trail (recent movement history)
+        trail = history.positions(i, TRAIL_LENGTH)  # Last 10 positions
+        if len(trail) > 1:
+            folium.PolyLine(
+                locations=trail.tolist(),
+                color=color,
+                weight=2,
+                opacity=0.6
+            ).add_to(m)
+
+    return m
+
+
+def render_html(m):
+    """Full HTML document for a map, as ``folium_static`` would embed it."""
+    return folium.Figure().add_child(m).render()
+
+
+# Detail-panel mini map: the vessel's recorded track and its current position
+def trajectory_map_html(boat, trail):
+    mini_map = folium.Map(
+        location=[boat["lat"], boat["lon"]],
+        zoom_start=MINI_MAP_ZOOM,
+        tiles="CartoDB dark_matter"
+    )
+
+    folium.PolyLine(
+        locations=trail.tolist(),
+        color='cyan',
+        weight=3,
+        opacity=0.8
+    ).add_to(mini_map)
+
+    folium.Marker(
+        location=[boat["lat"], boat["lon"]],
+        tooltip=f"{boat['name']} - Current Position",
+        icon=folium.Icon(color='red', icon='ship', prefix='fa')
+    ).add_to(mini_map)
+
+    return render_html(mini_map)
+
+
+def base_map_html():
+    """Render the static layers once; returns ``(html, map_variable_name)``."""
+    m = add_base_layers(new_map())
+    return render_html(m), m.get_name()
+
+
+# Leaflet script that draws the vessel payload onto the already-rendered base map.
+# Popups are built in the browser when a marker is clicked.
+VESSEL_LAYER_JS = """
+<script>
+(function() {
+    var map = %(map_name)s;
+    var v = %(payload)s;
+    var layer = L.featureGroup().addTo(map);
+    function row(label, value) { return '<tr><td><b>' + label + ':</b></td><td>' + value + '</td></tr>'; }
+    function popup(i) {
+        return '<div style="width: 250px; background-color: #1E1E1E; color: white; border-radius: 5px; padding: 5px;">' +
+            '<h3 style="text-align: center; color: #90CAF9;">' + v.name[i] + '</h3>' +
+            '<table style="width: 100%%; color: white;">' +
+            row('Speed', v.speed[i].toFixed(1) + ' knots') +
+            row('Heading', v.heading[i].toFixed(1) + '°') +
+            row('Crew', v.crew_size[i] + ' persons') +
+            row('Operation Time', v.operation_time[i].toFixed(1) + ' hours') +
+            row('Fish Caught', v.fish_caught[i].toFixed(1) + ' kg') +
+            row('Fuel Level', v.fuel_level[i].toFixed(1) + '%%') +
+            row('Engine Status', v.engine_status[i]) +
+            row('Communication', v.communication_status[i]) +
+            row('Safety Status', v.safety_status[i]) +
+            row('Risk Level', v.risk_level[i].toFixed(2)) +
+            row('Last Update', v.last_update[i]) +
+            '</table></div>';
+    }
+    v.name.forEach(function(name, i) {
+        if (v.trail[i].length > 1) {
+            L.polyline(v.trail[i], {color: v.color[i], weight: 2, opacity: 0.6}).addTo(layer);
+        }
+        L.marker([v.lat[i], v.lon[i]], {
+            icon: L.AwesomeMarkers.icon({markerColor: v.color[i], iconColor: 'white', icon: v.icon[i], prefix: 'fa'})
+        })
+            .bindTooltip(name + ' - Risk: ' + v.risk_level[i].toFixed(2))
+            .bindPopup(function() { return popup(i); }, {maxWidth: 300})
+            .addTo(layer);
+    });
+})();
+</script>
+"""
+
+# Popup fields sent to the browser and the decimals kept for numeric ones
+POPUP_FIELDS = {
+    "speed": 2,
+    "heading": 1,
+    "crew_size": None,
+    "operation_time": 2,
+    "fish_caught": 1,
+    "fuel_level": 2,
+    "engine_status": None,
+    "communication_status": None,
+    "safety_status": None,
+    "risk_level": 3,
+    "last_update": None,
+}
+
+
+def vessel_layer_script(map_name, boats, history):
+    """Columnar JSON payload of the vessels plus the script that draws them.
+
+    Trails are read from ``history``, whose rows follow the order of ``boats``.
+    """
+    styles = [risk_style(boat["risk_level"]) for boat in boats]
+    payload = {
+        "name": [boat["name"] for boat in boats],
+        "lat": [round(boat["lat"], 5) for boat in boats],
+        "lon": [round(boat["lon"], 5) for boat in boats],
+        "color": [color for color, _ in styles],
+        "icon": [icon for _, icon in styles],
+        "trail": [
+            np.round(history.positions(i, TRAIL_LENGTH).astype(float), 5).tolist()
+            for i in range(len(boats))
+        ],
+    }
+    for field, decimals in POPUP_FIELDS.items():
+        if decimals is None:
+            payload[field] = [boat[field] for boat in boats]
+        else:
+            payload[field] = [round(boat[field], decimals) for boat in boats]
+
+    return VESSEL_LAYER_JS % {
+        "map_name": map_name,
+        "payload": json.dumps(payload, separators=(",", ":")),
+    }
+
+
+def compose_map_html(base_html, vessel_script):
+    """Append the vessel layer to the cached base document."""
+    head, _, tail = base_html.rpartition("</html>")
+    return head + vessel_script + "</html>" + tail
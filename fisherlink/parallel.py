@@ -0,0 +1,146 @@
+"""Multi-process fleet stepping, partitioned into coastal sectors.
+
+:class:`ParallelStepper` moves a fleet's arrays into one
+``multiprocessing.shared_memory`` block and splits the vessels into
+``sectors`` contiguous row ranges by their nearest stretch of
+``COASTAL_COORDS`` (Chennai to Pondicherry). Each tick, a process pool
+runs :func:`fisherlink.fleet.step_fleet` on every sector in place. Only
+the sector bounds and the sector's random generator state are pickled
+across the process boundary; the vessel data never is.
+
+Every sector draws from its own generator, spawned from the fleet's.
+Results therefore depend only on the fleet's seed and the number of
+sectors, never on the number of workers or the order in which sectors
+finish. They do differ from stepping the same fleet with
+:func:`~fisherlink.fleet.step_fleet` in one process, which draws every
+vessel from a single stream.
+
+Sectors are assigned once, when the stepper is created. Vessels that
+drift along the coast afterwards stay in their sector. This is only a
+scheduling unit, so a stale assignment costs a little locality but never
+correctness.
+"""
+import dataclasses
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from fisherlink.fleet import FleetState, step_fleet
+from fisherlink.spatial import default_coast_index
+
+# Fields that stay in the parent: object arrays cannot live in shared memory
+LOCAL_FIELDS = ("names",)
+
+# Default partition count; fixed so that results do not depend on the worker count
+SECTORS = 16
+
+# Per-process state of a pool worker, set by _attach
+_worker = {}
+
+
+def coastal_sectors(lat, lon, sectors):
+    """Sector number (0 = northernmost) of each position's nearest stretch of coastline."""
+    position = default_coast_index().coast_position(lat, lon)
+    return np.minimum((position * sectors).astype(np.int64), sectors - 1)
+
+
+def _layout(fleet):
+    # (field, dtype, offset) for every shareable array, 64-byte aligned
+    layout, offset = [], 0
+    for field in dataclasses.fields(fleet):
+        value = getattr(fleet, field.name)
+        if isinstance(value, np.ndarray) and field.name not in LOCAL_FIELDS:
+            layout.append((field.name, value.dtype.str, offset))
+            offset += -(-value.nbytes // 64) * 64
+    return layout, max(offset, 1)
+
+
+def _views(buffer, layout, n):
+    return {name: np.ndarray(n, dtype=dtype, buffer=buffer, offset=offset) for name, dtype, offset in layout}
+
+
+def _attach(name, layout, n):
+    # Workers share the parent's resource tracker, so attaching here does
+    # not hand ownership of the block to the worker
+    shm = shared_memory.SharedMemory(name=name)
+    _worker.update(shm=shm, arrays=_views(shm.buf, layout, n))
+
+
+def _step_sector(start, stop, rng_state, risk_model):
+    rng = np.random.Generator(np.random.PCG64())
+    rng.bit_generator.state = rng_state
+    arrays = {name: array[start:stop] for name, array in _worker["arrays"].items()}
+    step_fleet(FleetState(names=None, rng=rng, risk_model=risk_model, **arrays))
+    return rng.bit_generator.state
+
+
+class ParallelStepper:
+    """Steps ``fleet`` in ``workers`` processes, one task per coastal sector.
+
+    The fleet is reordered by sector and its arrays are replaced, in place,
+    by views into shared memory. Code holding the fleet, such as the
+    service, telemetry ingestion and snapshots, keeps working on it
+    unchanged. Use as a context manager or call :meth:`close` to release
+    the pool and the shared block.
+    """
+
+    def __init__(self, fleet, workers=None, sectors=SECTORS):
+        self.workers = workers or os.cpu_count() or 1
+        self.sectors = sectors
+        self.fleet = fleet
+        n = len(fleet)
+
+        # Sort rows so every sector is one contiguous slice
+        sector = coastal_sectors(fleet.lat, fleet.lon, self.sectors)
+        order = np.argsort(sector, kind="stable")
+        bounds = np.searchsorted(sector[order], np.arange(self.sectors + 1))
+        self._slices = [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+        self._rng_states = [rng.bit_generator.state for rng in fleet.rng.spawn(len(self._slices))]
+
+        layout, size = _layout(fleet)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        for name, array in _views(self._shm.buf, layout, n).items():
+            array[:] = getattr(fleet, name)[order]
+            setattr(fleet, name, array)
+        fleet.names = fleet.names[order]
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_attach,
+            initargs=(self._shm.name, layout, n),
+        )
+
+    def step(self):
+        """Advance the fleet one tick; returns it like :func:`step_fleet`."""
+        futures = [
+            self._pool.submit(_step_sector, start, stop, state, self.fleet.risk_model)
+            for (start, stop), state in zip(self._slices, self._rng_states)
+        ]
+        self._rng_states = [future.result() for future in futures]
+        self.fleet.tick += 1
+        return self.fleet
+
+    def close(self):
+        """Shut the pool down and give the fleet private copies of its arrays."""
+        if self._shm is None:
+            return
+        try:
+            self._pool.shutdown()
+        finally:
+            # Also after a worker crash: the block must not outlive the stepper
+            layout, _ = _layout(self.fleet)
+            for name, _, _ in layout:
+                setattr(self.fleet, name, getattr(self.fleet, name).copy())
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
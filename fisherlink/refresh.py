@@ -0,0 +1,75 @@
+"""Cadence and freshness of the dashboard's timed refreshes.
+
+Each live view reruns on its own timer (a Streamlit fragment with
+``run_every``). The timer is not aligned with the simulation's ticks. So
+when a refresh comes due at most :data:`REFRESH_WAIT_S` before the next
+tick, the view waits for that tick to be pushed
+(:meth:`fisherlink.service.FleetService.fresh_snapshot`) instead of
+rendering data that is about to be replaced.
+
+:class:`RefreshMonitor` records each timed refresh against its target
+interval. It tracks the interval actually achieved, how old the rendered
+snapshot was, and how long the render took, so a view can show the
+latency it delivers.
+"""
+import time
+from collections import deque
+
+import numpy as np
+
+# Longest a due refresh waits for the next tick before rendering what it has
+REFRESH_WAIT_S = 1.0
+
+# A rerun that comes this soon after the last refresh is an interaction, not the timer
+DUE_FRACTION = 0.8
+
+# Refreshes kept for the statistics
+WINDOW = 120
+
+
+class RefreshMonitor:
+    """Rolling statistics for one view refreshing every ``target_s`` seconds."""
+
+    def __init__(self, target_s, window=WINDOW):
+        self.target_s = target_s
+        self.last = None
+        self.intervals = deque(maxlen=window)
+        self.ages = deque(maxlen=window)
+        self.render_times = deque(maxlen=window)
+
+    def due(self, now=None):
+        """True when the timer, not a widget interaction, is the likely cause of this rerun."""
+        now = time.monotonic() if now is None else now
+        return self.last is None or now - self.last >= DUE_FRACTION * self.target_s
+
+    def record(self, published, render_s, now=None):
+        """Record a timed refresh that rendered the snapshot ``published`` at (epoch seconds)."""
+        now = time.monotonic() if now is None else now
+        if self.last is not None:
+            self.intervals.append(now - self.last)
+        self.last = now
+        self.ages.append(max(0.0, time.time() - render_s - published))
+        self.render_times.append(render_s)
+
+    def summary(self):
+        intervals = np.asarray(self.intervals)
+        ages = np.asarray(self.ages)
+        percentile = (lambda values, q: float(np.percentile(values, q)) if len(values) else None)
+        return {
+            "target_s": self.target_s,
+            "refreshes": len(self.ages),
+            "interval_p50_s": percentile(intervals, 50),
+            "interval_p95_s": percentile(intervals, 95),
+            "late_p95_s": percentile(np.maximum(intervals - self.target_s, 0.0), 95),
+            "age_p50_s": percentile(ages, 50),
+            "age_p95_s": percentile(ages, 95),
+            "render_p95_ms": percentile(np.asarray(self.render_times) * 1000, 95),
+        }
+
+    def describe(self):
+        stats = self.summary()
+        if stats["interval_p50_s"] is None:
+            return f"Refreshing every {self.target_s:g}s"
+        return (f"Refresh target {self.target_s:g}s · actual p50 {stats['interval_p50_s']:.2f}s, "
+                f"p95 {stats['interval_p95_s']:.2f}s · data age p95 {stats['age_p95_s']:.2f}s · "
+                f"render p95 {stats['render_p95_ms']:.0f} ms")
@@ -0,0 +1,172 @@
+"""Geographic alert targeting: regions and a spatial index over vessel positions.
+
+A region is a polygon, a radius around a point, or a stretch of the
+``COASTAL_COORDS`` coastline widened to a band. Each one is built as a
+shapely geometry in the same local kilometre plane the geofence uses
+(:class:`fisherlink.geo.LocalProjection`).
+
+:class:`VesselIndex` holds one fleet snapshot's positions in a KD-tree over
+that plane. A query first takes the vessels inside the circle that bounds
+the region, which for a regional alert is a small fraction of the fleet,
+and then runs the exact containment test on those alone.
+
+Forecast targeting uses the same tree. A vessel at most ``v_max * minutes``
+from the bounding circle is a candidate. Its dead-reckoned track, along
+its current speed and heading as in :mod:`fisherlink.forecast`, is tested
+against the region as a line segment. That catches tracks that cross a
+region between forecast points as well as ones that end in it.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import shapely
+from scipy.spatial import cKDTree
+
+from fisherlink.geo import COASTAL_COORDS, GEOFENCE_KM, LocalProjection, destination_points
+
+
+@lru_cache(maxsize=None)
+def default_projection():
+    """Projection centred on ``COASTAL_COORDS``, the plane shared by the geofence."""
+    return LocalProjection.around(COASTAL_COORDS)
+
+
+def _project(projection, coords):
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    return np.column_stack(projection.forward(coords[:, 0], coords[:, 1]))
+
+
+@dataclass(frozen=True)
+class RadiusRegion:
+    """Every position within ``radius_km`` of (lat, lon)."""
+    lat: float
+    lon: float
+    radius_km: float
+
+    def geometry(self, projection):
+        if self.radius_km <= 0:
+            raise ValueError("radius_km must be positive")
+        return shapely.Point(_project(projection, (self.lat, self.lon))[0]).buffer(self.radius_km, quad_segs=32)
+
+    def describe(self):
+        return f"within {self.radius_km:g} km of {self.lat:.4f}, {self.lon:.4f}"
+
+
+def _check_vertices(points):
+    for i, point in enumerate(points, 1):
+        if len(point) != 2:
+            raise ValueError(f"vertex {i} must be 'lat, lon', got {len(point)} values")
+        lat, lon = point
+        if not (np.isfinite(lat) and np.isfinite(lon) and -90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"vertex {i} ({lat}, {lon}) is not a valid latitude and longitude")
+    if len(points) < 3:
+        raise ValueError("a polygon region needs at least 3 points")
+
+
+@dataclass(frozen=True)
+class PolygonRegion:
+    """A polygon given as ``(lat, lon)`` vertices; the ring is closed automatically."""
+    points: tuple
+
+    @classmethod
+    def parse(cls, text):
+        """Region from one ``lat, lon`` vertex per line; raises ValueError naming the bad vertex."""
+        points = []
+        for i, line in enumerate((line for line in text.splitlines() if line.strip()), 1):
+            try:
+                points.append(tuple(float(value) for value in line.split(",")))
+            except ValueError:
+                raise ValueError(f"vertex {i} must be 'lat, lon', got {line.strip()!r}") from None
+        _check_vertices(points)
+        return cls(tuple(points))
+
+    def geometry(self, projection):
+        _check_vertices(self.points)
+        polygon = shapely.Polygon(_project(projection, self.points))
+        # Self-intersecting rings (a bow-tie drawn by hand) are repaired rather than rejected
+        return polygon if polygon.is_valid else shapely.make_valid(polygon)
+
+    def describe(self):
+        return f"inside a {len(self.points)}-point polygon"
+
+
+@dataclass(frozen=True)
+class CoastalSegment:
+    """The sea within ``width_km`` of the coastline between two ``COASTAL_COORDS`` vertices."""
+    start: int
+    end: int
+    width_km: float = GEOFENCE_KM
+
+    def geometry(self, projection):
+        if not 0 <= self.start < self.end < len(COASTAL_COORDS):
+            raise ValueError(f"coastal segment must satisfy 0 <= start < end < {len(COASTAL_COORDS)}")
+        coast = shapely.LineString(_project(projection, COASTAL_COORDS[self.start:self.end + 1]))
+        return coast.buffer(self.width_km, quad_segs=16)
+
+    def describe(self):
+        return f"within {self.width_km:g} km of coastal points {self.start}-{self.end}"
+
+
+class VesselIndex:
+    """Region queries over one fleet snapshot.
+
+    Positions, speeds and headings are copied when the index is built, so
+    stepping a live fleet afterwards does not change the answers. Rebuild
+    the index for each new snapshot.
+    """
+
+    def __init__(self, fleet, projection=None):
+        self.projection = projection or default_projection()
+        self.ids = np.array(fleet.ids)
+        self.lat = np.array(fleet.lat, dtype=float)
+        self.lon = np.array(fleet.lon, dtype=float)
+        self.heading = np.array(fleet.heading, dtype=float)
+        # Knots -> km per minute, as in the simulation step
+        self.speed_km_min = np.asarray(fleet.speed, dtype=float) * 1.852 / 60
+        self.max_speed_km_min = float(self.speed_km_min.max()) if len(self.ids) else 0.0
+        self._points = np.column_stack(self.projection.forward(self.lat, self.lon))
+        self._tree = cKDTree(self._points)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _prepared(self, region):
+        geometry = region.geometry(self.projection)
+        shapely.prepare(geometry)
+        xmin, ymin, xmax, ymax = geometry.bounds
+        center = np.array([(xmin + xmax) / 2, (ymin + ymax) / 2])
+        return geometry, center, float(np.hypot(xmax - xmin, ymax - ymin) / 2)
+
+    def _candidates(self, center, radius):
+        return np.sort(np.asarray(self._tree.query_ball_point(center, radius), dtype=np.intp))
+
+    def inside(self, region):
+        """Rows of the vessels currently inside ``region``, ascending."""
+        geometry, center, radius = self._prepared(region)
+        rows = self._candidates(center, radius)
+        x, y = self._points[rows].T
+        return rows[shapely.contains_xy(geometry, x, y)]
+
+    def entering(self, region, minutes):
+        """Rows of the vessels outside ``region`` now whose track enters it within ``minutes``."""
+        geometry, center, radius = self._prepared(region)
+        rows = self._candidates(center, radius + self.max_speed_km_min * minutes)
+        x, y = self._points[rows].T
+        rows = rows[~shapely.contains_xy(geometry, x, y)]
+        if not len(rows) or minutes <= 0:
+            return rows[:0]
+
+        end_lat, end_lon = destination_points(
+            self.lat[rows], self.lon[rows], self.speed_km_min[rows] * minutes, self.heading[rows]
+        )
+        ends = np.column_stack(self.projection.forward(end_lat, end_lon))
+        tracks = shapely.linestrings(np.stack([self._points[rows], ends], axis=1))
+        return rows[shapely.intersects(geometry, tracks)]
+
+    def recipients(self, region, minutes=0):
+        """Vessel ids inside ``region`` now or, with ``minutes``, forecast to enter it within that time."""
+        rows = self.inside(region)
+        if minutes > 0:
+            rows = np.union1d(rows, self.entering(region, minutes))
+        return self.ids[rows]
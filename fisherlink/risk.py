@@ -0,0 +1,290 @@
+"""Pluggable risk models and offline training on archived tracks.
+
+A risk model is any object with a ``score`` method taking keyword arrays
+(``geofence_distance``, ``fuel_level``, ``operation_time``, ``speed``,
+``heading``, ``env_risk``) of any common shape and returning risk in
+[0, 1] of that shape. Assign one to ``FleetState.risk_model`` and the
+simulation step, telemetry ingestion and the forecast all score through
+it, in one batched call per tick.
+
+:class:`BaselineRiskModel` is the original hand-weighted formula.
+:class:`LogisticRiskModel` is a logistic regression over a few NumPy
+features. It predicts the probability that a vessel not currently in an
+incident has one (beyond the geofence, critical engine or under 10%
+fuel) start within the next 30 minutes, and it is trained from the
+Parquet track archive::
+
+    python -m fisherlink.risk --simulate-vessels 400 --simulate-minutes 600
+    python -m fisherlink.risk --archive data/tracks --out fisherlink/models/risk_logistic.json
+"""
+import abc
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from fisherlink.fleet import ENGINE_CRITICAL, SAFETY_WARNING, risk_score
+
+FEATURES = (
+    "geofence_distance",
+    "fuel_level",
+    "low_fuel",
+    "operation_time",
+    "speed",
+    "east_speed",
+    "north_speed",
+)
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(__file__), "models", "risk_logistic.json")
+
+# What counts as an incident when labelling archived tracks
+INCIDENT_HORIZON_S = 30 * 60
+LOW_FUEL = 10
+
+
+class RiskModel(abc.ABC):
+    """Interface: batched risk scoring over arrays of vessel features."""
+    name = "model"
+
+    @abc.abstractmethod
+    def score(self, *, geofence_distance, fuel_level, operation_time, speed, heading, env_risk):
+        """Risk in [0, 1], in the broadcast shape of the arguments."""
+
+
+class BaselineRiskModel(RiskModel):
+    """The hand-weighted formula, same as leaving ``FleetState.risk_model`` unset."""
+    name = "baseline"
+
+    def score(self, *, geofence_distance, fuel_level, operation_time, speed, heading, env_risk):
+        return risk_score(geofence_distance, fuel_level, operation_time, env_risk)
+
+
+def feature_matrix(geofence_distance, fuel_level, operation_time, speed, heading):
+    """Stack the model features along a new last axis, in :data:`FEATURES` order."""
+    geofence_distance = np.asarray(geofence_distance, dtype=float)
+    fuel_level = np.asarray(fuel_level, dtype=float)
+    speed = np.asarray(speed, dtype=float)
+    heading = np.radians(heading)
+    return np.stack(np.broadcast_arrays(
+        geofence_distance,
+        fuel_level,
+        np.maximum(LOW_FUEL * 2 - fuel_level, 0),
+        np.asarray(operation_time, dtype=float),
+        speed,
+        speed * np.sin(heading),  # the open sea is to the east
+        speed * np.cos(heading),
+    ), axis=-1)
+
+
+class LogisticRiskModel(RiskModel):
+    """Logistic regression on standardized :data:`FEATURES`."""
+    name = "logistic"
+
+    def __init__(self, weights, bias, mean, scale, features=FEATURES):
+        if tuple(features) != FEATURES:
+            raise ValueError(f"Model was trained on features {features}, expected {FEATURES}")
+        self.weights = np.asarray(weights, dtype=float)
+        self.bias = float(bias)
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+
+    def score(self, *, geofence_distance, fuel_level, operation_time, speed, heading, env_risk=None):
+        features = feature_matrix(geofence_distance, fuel_level, operation_time, speed, heading)
+        z = ((features - self.mean) / self.scale) @ self.weights + self.bias
+        return 1 / (1 + np.exp(-np.clip(z, -30, 30)))
+
+    def to_dict(self):
+        return {
+            "features": list(FEATURES),
+            "weights": self.weights.tolist(),
+            "bias": self.bias,
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        with open(path) as f:
+            return cls(**json.load(f))
+
+
+def load_risk_model(name):
+    """Model by name: ``"baseline"``, ``"logistic"`` (the shipped weights) or a JSON path."""
+    if name == "baseline":
+        return BaselineRiskModel()
+    if name == "logistic":
+        return LogisticRiskModel.load()
+    return LogisticRiskModel.load(name)
+
+
+def label_tracks(tracks, horizon_s=INCIDENT_HORIZON_S):
+    """Incident-within-horizon labels for archived samples.
+
+    ``tracks`` is a DataFrame sorted by vessel and time (as returned by
+    :meth:`fisherlink.archive.TrackArchive.tracks`). Returns ``(labels,
+    known)``. A sample is labelled when an incident starts within the
+    horizon. Samples taken during an incident are left unknown: their
+    label would only restate the current state. A sample's label is also
+    unknown when no incident follows and its vessel's track ends before
+    the horizon does.
+    """
+    vessel = tracks["vessel_id"].to_numpy()
+    t = tracks["timestamp"].to_numpy()
+    incident = (
+        (tracks["safety_status"].to_numpy() >= SAFETY_WARNING) |
+        (tracks["engine_status"].to_numpy() == ENGINE_CRITICAL) |
+        (tracks["fuel_level"].to_numpy() < LOW_FUEL)
+    )
+    n = len(tracks)
+
+    # Next incident strictly after each sample, then check it is the same vessel and soon enough.
+    # After a sample outside an incident, the next incident sample is where one starts.
+    incidents = np.flatnonzero(incident)
+    following = np.searchsorted(incidents, np.arange(n), side="right")
+    has_next = following < len(incidents)
+    nxt = incidents[np.minimum(following, max(len(incidents) - 1, 0))] if len(incidents) else np.zeros(n, int)
+    labels = ~incident & has_next & (vessel[nxt] == vessel) & (t[nxt] - t <= horizon_s)
+
+    # Last timestamp of each sample's vessel, for censoring
+    starts = np.flatnonzero(np.r_[True, vessel[1:] != vessel[:-1]])
+    track_end = np.repeat(np.maximum.reduceat(t, starts), np.diff(np.r_[starts, n]))
+    known = ~incident & (labels | (t + horizon_s <= track_end))
+    return labels, known
+
+
+def training_set(tracks, horizon_s=INCIDENT_HORIZON_S):
+    """Features, labels and vessel ids for the labelled samples in ``tracks``."""
+    labels, known = label_tracks(tracks, horizon_s)
+    features = feature_matrix(
+        tracks["geofence_distance"].to_numpy(),
+        tracks["fuel_level"].to_numpy(),
+        tracks["operation_time"].to_numpy(),
+        tracks["speed"].to_numpy(),
+        tracks["heading"].to_numpy(),
+    )
+    return features[known], labels[known].astype(float), tracks["vessel_id"].to_numpy()[known]
+
+
+def train_logistic(features, labels, l2=1e-3, iterations=30):
+    """Fit a :class:`LogisticRiskModel` with Newton's method (IRLS) and L2 regularization."""
+    mean = features.mean(axis=0)
+    scale = features.std(axis=0)
+    scale[scale == 0] = 1
+    x = np.column_stack([(features - mean) / scale, np.ones(len(features))])
+    beta = np.zeros(x.shape[1])
+    penalty = l2 * len(x) * np.eye(x.shape[1])
+    penalty[-1, -1] = 0  # the bias is not regularized
+
+    for _ in range(iterations):
+        p = 1 / (1 + np.exp(-np.clip(x @ beta, -30, 30)))
+        gradient = x.T @ (p - labels) + penalty @ beta
+        hessian = (x * (p * (1 - p))[:, None]).T @ x + penalty
+        step = np.linalg.solve(hessian, gradient)
+        beta -= step
+        if np.abs(step).max() < 1e-8:
+            break
+    return LogisticRiskModel(beta[:-1], beta[-1], mean, scale)
+
+
+def auc(scores, labels):
+    """Area under the ROC curve (rank statistic; ties count half)."""
+    labels = np.asarray(labels, dtype=bool)
+    positives, negatives = labels.sum(), (~labels).sum()
+    if not positives or not negatives:
+        return float("nan")
+    order = np.argsort(scores, kind="mergesort")
+    ranks = np.empty(len(scores))
+    ranks[order] = np.arange(1, len(scores) + 1)
+    # Average the ranks of tied scores
+    sorted_scores = np.asarray(scores)[order]
+    starts = np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1]])
+    ends = np.r_[starts[1:], len(scores)]
+    ranks[order] = np.repeat((starts + ends + 1) / 2, ends - starts)
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def log_loss(scores, labels):
+    p = np.clip(scores, 1e-7, 1 - 1e-7)
+    return float(-np.mean(labels * np.log(p) + (1 - labels) * np.log(1 - p)))
+
+
+def simulate_tracks(archive, vessels, minutes, seed=None, start=None):
+    """Run the simulator and archive one sample per simulated minute."""
+    from fisherlink.fleet import generate_fleet, step_fleet
+
+    fleet = generate_fleet(vessels, seed=seed)
+    start = time.time() - minutes * 60 if start is None else start
+    for minute in range(minutes):
+        step_fleet(fleet)
+        fleet.last_update[:] = start + minute * 60
+        archive.append(fleet, now=start + minute * 60)
+    archive.flush()
+
+
+def evaluate(models, features, labels):
+    """AUC and log loss of each model on a labelled feature matrix."""
+    columns = dict(zip(FEATURES, np.moveaxis(features, -1, 0)))
+    heading = np.degrees(np.arctan2(columns["east_speed"], columns["north_speed"]))
+    results = {}
+    for model in models:
+        scores = model.score(
+            geofence_distance=columns["geofence_distance"],
+            fuel_level=columns["fuel_level"],
+            operation_time=columns["operation_time"],
+            speed=columns["speed"],
+            heading=heading,
+            env_risk=0.15,
+        )
+        results[model.name] = {"auc": auc(scores, labels), "log_loss": log_loss(scores, labels)}
+    return results
+
+
+def main():
+    from fisherlink.archive import TrackArchive
+
+    parser = argparse.ArgumentParser(description="Train the logistic risk model on archived tracks.")
+    parser.add_argument("--archive", help="track archive directory (default: simulate into a temporary one)")
+    parser.add_argument("--simulate-vessels", type=int, default=400)
+    parser.add_argument("--simulate-minutes", type=int, default=600)
+    parser.add_argument("--horizon-minutes", type=float, default=INCIDENT_HORIZON_S / 60)
+    parser.add_argument("--l2", type=float, default=1e-3)
+    parser.add_argument("--holdout", type=float, default=0.2, help="fraction of vessels held out for evaluation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=DEFAULT_MODEL_PATH)
+    args = parser.parse_args()
+
+    if args.archive:
+        archive = TrackArchive(args.archive)
+    else:
+        archive = TrackArchive(tempfile.mkdtemp(prefix="fisherlink-tracks-"))
+        simulate_tracks(archive, args.simulate_vessels, args.simulate_minutes, seed=args.seed)
+
+    tracks = archive.tracks(0, time.time()).dropna()
+    features, labels, vessel_ids = training_set(tracks, args.horizon_minutes * 60)
+
+    # Hold out whole vessels so the evaluation never sees a training track
+    rng = np.random.default_rng(args.seed)
+    unique_ids = np.unique(vessel_ids)
+    held_out = rng.choice(unique_ids, int(len(unique_ids) * args.holdout), replace=False)
+    test = np.isin(vessel_ids, held_out)
+
+    model = train_logistic(features[~test], labels[~test], l2=args.l2)
+    model.save(args.out)
+
+    print(f"{len(features):,} labelled samples, {labels.mean():.1%} followed by an incident starting "
+          f"within {args.horizon_minutes:g} min; {test.sum():,} held out")
+    for name, metrics in evaluate([BaselineRiskModel(), model], features[test], labels[test]).items():
+        print(f"  {name:<10} AUC {metrics['auc']:.3f}   log loss {metrics['log_loss']:.3f}")
+    print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
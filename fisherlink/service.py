@@ -0,0 +1,286 @@
+"""Shared fleet simulation running on its own thread.
+
+One :class:`FleetService` per process owns the fleet, steps it on a fixed
+schedule and publishes an immutable :class:`FleetSnapshot` after every
+tick. Dashboard sessions only read snapshots, so the simulation costs the
+same with one viewer or twenty, and every viewer sees the same fleet.
+Sessions that refresh on a timer can use :meth:`FleetService.fresh_snapshot`
+to block until the next tick is pushed to them when it is only moments
+away, instead of rendering the older snapshot.
+"""
+import dataclasses
+import logging
+import threading
+import time
+
+from fisherlink.fleet import FleetState, VesselRecords, generate_fleet, reported_rows, step_fleet, unreported_fleet
+from fisherlink.history import HistoryBuffer
+from fisherlink.parallel import ParallelStepper
+from fisherlink.stats import FleetStats, fleet_stats
+
+logger = logging.getLogger(__name__)
+
+# Seconds between simulation ticks
+TICK_INTERVAL_S = 5.0
+
+
+@dataclasses.dataclass(frozen=True)
+class FleetSnapshot:
+    """Fleet state as of one tick.
+
+    ``fleet`` is a copy whose arrays are read-only; ``boats`` gives
+    dict-style access to its rows and ``stats`` the fleet-wide aggregates
+    built from it. ``history`` reads the service's live history, so it may
+    already include ticks newer than ``version``. When the fleet is driven
+    by telemetry, ``fleet`` holds only the vessels that have reported and
+    ``unreported`` counts the rest.
+    """
+    version: int
+    published: float
+    fleet: FleetState
+    boats: VesselRecords
+    stats: FleetStats
+    history: "HistoryReader"
+    unreported: int = 0
+
+
+def _frozen_copy(fleet, rows=None):
+    # Copy every array (or its ``rows``) and lock it; the snapshot cannot be stepped (no rng)
+    fields = {}
+    for field in dataclasses.fields(fleet):
+        value = getattr(fleet, field.name)
+        if hasattr(value, "setflags"):
+            value = value.copy() if rows is None else value[rows]
+            value.setflags(write=False)
+        fields[field.name] = value
+    fields["rng"] = None
+    return type(fleet)(**fields)
+
+
+class HistoryReader:
+    """Read-only access to a history buffer that another thread appends to.
+
+    Windows are copied under the writer's lock, so a reader never sees a
+    half-written tick. They are at most ``capacity`` samples long, which
+    keeps the copies small. With ``rows``, row ``i`` of the reader is row
+    ``rows[i]`` of the buffer, matching a snapshot of those rows.
+    """
+
+    def __init__(self, history, lock, rows=None):
+        self._history = history
+        self._lock = lock
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._history) if self._rows is None else len(self._rows)
+
+    def _row(self, i):
+        return i if self._rows is None else self._rows[i]
+
+    @property
+    def capacity(self):
+        return self._history.capacity
+
+    def count(self, i):
+        with self._lock:
+            return self._history.count(self._row(i))
+
+    def version(self, i):
+        with self._lock:
+            return self._history.version(self._row(i))
+
+    def samples(self, i, length=None):
+        """Version and windows of vessel ``i``, read in one critical section."""
+        with self._lock:
+            version, *windows = self._history.samples(self._row(i), length)
+            return (version, *(window.copy() for window in windows))
+
+    def positions(self, i, length=None):
+        with self._lock:
+            return self._history.positions(self._row(i), length).copy()
+
+    def risk_levels(self, i, length=None):
+        with self._lock:
+            return self._history.risk_levels(self._row(i), length).copy()
+
+    def timestamps(self, i, length=None):
+        with self._lock:
+            return self._history.timestamps(self._row(i), length).copy()
+
+
+class FleetService:
+    """Owns the simulated fleet and advances it every ``interval_s`` seconds.
+
+    ``archive`` is an optional :class:`fisherlink.archive.TrackArchive`
+    that receives every tick. With an ``ingestor``
+    (:class:`fisherlink.telemetry.TelemetryIngestor`) each tick also applies
+    the queued vessel reports; pass ``simulate=False`` to drive the fleet
+    from telemetry alone. The fleet then starts with no data
+    (:func:`fisherlink.fleet.unreported_fleet`), and only vessels that
+    have reported are recorded and published. ``risk_model`` (see :mod:`fisherlink.risk`) replaces the
+    weighted risk formula. With ``workers`` the simulation step runs in
+    that many processes (:class:`fisherlink.parallel.ParallelStepper`);
+    call :meth:`close` to release them. ``alerts`` is an optional
+    :class:`fisherlink.alerts.AlertEngine` evaluated after every tick.
+    Call :meth:`start` to run on a daemon thread, or :meth:`tick` to step
+    by hand.
+
+    A tick that raises is logged and skipped; the thread keeps to its
+    schedule. ``last_error`` holds the most recent exception and
+    ``failed_ticks`` the number of failures since the last good tick, so
+    :attr:`healthy` turns False while the published snapshot is going stale.
+    """
+
+    def __init__(self, num_boats=15, seed=None, interval_s=TICK_INTERVAL_S, history=None, archive=None,
+                 ingestor=None, simulate=True, risk_model=None, workers=0,
+                 alerts=None):
+        self.interval_s = interval_s
+        self.simulate = simulate
+        if simulate:
+            self._fleet = generate_fleet(num_boats, seed=seed)
+        else:
+            self._fleet = unreported_fleet(num_boats, seed=seed)
+        self._fleet.risk_model = risk_model
+        # Sector partitioning reorders the fleet, so it must happen before anything is recorded
+        self._stepper = ParallelStepper(self._fleet, workers) if workers and simulate else None
+        self._history = HistoryBuffer(num_boats) if history is None else history
+        self._archive = archive
+        self._ingestor = ingestor
+        self._alerts = alerts
+        self._lock = threading.Lock()
+        self._history_reader = HistoryReader(self._history, self._lock)
+        self._stop = threading.Event()
+        self._thread = None
+        self._published = threading.Condition()
+        self._next_tick = None
+        self.last_error = None
+        self.failed_ticks = 0
+
+        if simulate:
+            with self._lock:
+                self._history.record(self._fleet)
+        self._snapshot = self._publish()
+
+    def _publish(self):
+        if self.simulate:
+            fleet, history = _frozen_copy(self._fleet), self._history_reader
+        else:
+            rows = reported_rows(self._fleet)
+            fleet, history = _frozen_copy(self._fleet, rows), HistoryReader(self._history, self._lock, rows)
+        return FleetSnapshot(
+            version=fleet.tick,
+            published=time.time(),
+            fleet=fleet,
+            boats=VesselRecords(fleet),
+            stats=fleet_stats(fleet),
+            history=history,
+            unreported=len(self._fleet) - len(fleet),
+        )
+
+    def snapshot(self):
+        """Latest published snapshot. Never blocks on the simulation."""
+        return self._snapshot
+
+    def wait_for_snapshot(self, after_version, timeout=None):
+        """Block until a snapshot newer than ``after_version`` is published, then return it.
+
+        Returns at once if one already is. On timeout the latest snapshot is
+        returned, which may be ``after_version`` itself.
+        """
+        with self._published:
+            self._published.wait_for(lambda: self._snapshot.version > after_version, timeout)
+            return self._snapshot
+
+    def fresh_snapshot(self, max_wait_s):
+        """Latest snapshot, or the next one if the schedule has it due within ``max_wait_s``.
+
+        The wait also covers the tick's own run time, up to ``max_wait_s``
+        past its due time, so a slow tick is still waited for.
+        """
+        due_in = self.next_tick_in
+        snapshot = self._snapshot
+        if due_in is None or due_in > max_wait_s:
+            return snapshot
+        return self.wait_for_snapshot(snapshot.version, timeout=due_in + max_wait_s)
+
+    @property
+    def next_tick_in(self):
+        """Seconds until the next scheduled tick, or None when the service is not running."""
+        if not self.running or self._next_tick is None:
+            return None
+        return max(0.0, self._next_tick - time.monotonic())
+
+    def tick(self):
+        """Advance the fleet one step, apply queued telemetry and publish a new snapshot."""
+        if self._stepper is not None:
+            self._stepper.step()
+        elif self.simulate:
+            step_fleet(self._fleet)
+        rows = None
+        if self._ingestor is not None:
+            reported = self._ingestor.apply(self._fleet)
+            if not self.simulate:
+                if not len(reported):
+                    return self._snapshot
+                rows = reported
+                self._fleet.tick += 1
+
+        with self._lock:
+            self._history.record(self._fleet, rows)
+        if self._archive is not None:
+            self._archive.append(self._fleet, rows)
+        if self._alerts is not None:
+            self._alerts.evaluate(self._fleet)
+        # Replacing the reference is atomic; readers keep whichever snapshot they hold
+        snapshot = self._publish()
+        with self._published:
+            self._snapshot = snapshot
+            self._published.notify_all()
+        return snapshot
+
+    def start(self):
+        """Run :meth:`tick` on a fixed schedule in a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="fleet-service", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stop the simulation thread after its current tick."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def close(self):
+        """Stop the simulation and shut down any worker processes."""
+        self.stop()
+        if self._stepper is not None:
+            self._stepper.close()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def healthy(self):
+        """True while the thread runs and its latest tick succeeded."""
+        return self.running and self.failed_ticks == 0
+
+    def _run(self):
+        deadline = self._next_tick = time.monotonic() + self.interval_s
+        while not self._stop.wait(max(0.0, deadline - time.monotonic())):
+            try:
+                self.tick()
+            except Exception as error:
+                self.last_error = error
+                self.failed_ticks += 1
+                logger.exception("Fleet tick failed (%d in a row)", self.failed_ticks)
+            else:
+                self.failed_ticks = 0
+            # Fixed schedule; if a tick overran, skip the missed slots instead of bursting
+            deadline += self.interval_s
+            now = time.monotonic()
+            if deadline < now:
+                deadline = now + self.interval_s
+            self._next_tick = deadline
@@ -0,0 +1,155 @@
+"""Bounded-size trails and risk series for vessel charts and maps.
+
+A vessel's stored history grows with retention: 1,440 samples for a
+day at one per minute (:meth:`fisherlink.history.HistoryBuffer.for_retention`).
+The detail views draw a reduced version of it instead:
+
+* Tracks are simplified with Douglas-Peucker in a local kilometre plane,
+  the same way the geofence simplifies the coastline. The tolerance
+  follows the map zoom (:func:`zoom_tolerance_km`), so dropped points
+  move the line by less than a pixel. If a track still has more than
+  ``max_points`` points, the tolerance is doubled until it fits.
+* Risk series are downsampled with Largest-Triangle-Three-Buckets
+  (LTTB). LTTB keeps the first and last samples plus, from each bucket,
+  the point that spans the largest triangle with its neighbours, which
+  preserves peaks and drops.
+
+:class:`TrackCache` memoizes both per vessel and history version
+(:meth:`fisherlink.history.HistoryBuffer.version`), which changes on
+every append.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import shapely
+
+from fisherlink.geo import LocalProjection
+
+# Ground resolution of a Web Mercator map at zoom 0 on the equator, metres per pixel
+ZOOM0_M_PER_PX = 156543.03392
+
+# Most points drawn for one track or one risk chart
+MAX_TRACK_POINTS = 500
+MAX_SERIES_POINTS = 200
+
+# Simplified tracks and series kept; a few per vessel with an open detail panel
+MAX_ENTRIES = 1024
+
+
+def zoom_tolerance_km(zoom, lat, pixels=0.5):
+    """Ground distance of ``pixels`` screen pixels at ``zoom`` and latitude ``lat``, in km."""
+    return pixels * ZOOM0_M_PER_PX * np.cos(np.radians(lat)) / 2 ** zoom / 1000
+
+
+def douglas_peucker(points, tolerance):
+    """Indices of the points kept by Douglas-Peucker, ascending; ``points`` is ``(n, 2)``, planar.
+
+    Runs in GEOS through ``shapely.simplify``. Each point's index rides
+    along as its z coordinate, which simplification carries through
+    unchanged.
+    """
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    indexed = shapely.LineString(np.column_stack([points, np.arange(n)]))
+    kept = shapely.get_coordinates(shapely.simplify(indexed, tolerance, preserve_topology=False), include_z=True)
+    return kept[:, 2].astype(np.intp)
+
+
+def simplify_track(positions, tolerance_km, max_points=MAX_TRACK_POINTS):
+    """Simplified ``(k, 2)`` lat/lon track with ``k <= max_points``, keeping both ends."""
+    positions = np.asarray(positions, dtype=float)
+    if len(positions) <= 2:
+        return positions
+    projection = LocalProjection(*positions[-1])
+    points = np.column_stack(projection.forward(positions[:, 0], positions[:, 1]))
+    tolerance = max(float(tolerance_km), 1e-6)
+    kept = douglas_peucker(points, tolerance)
+    while len(kept) > max_points:
+        tolerance *= 2
+        kept = douglas_peucker(points, tolerance)
+    return positions[kept]
+
+
+def lttb(x, y, threshold):
+    """Indices of ``threshold`` points chosen by Largest-Triangle-Three-Buckets, ascending."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Interior points split into threshold - 2 buckets; the first and last points are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    chosen = np.empty(threshold, dtype=np.intp)
+    chosen[0], chosen[-1] = 0, n - 1
+    previous = 0
+    for b in range(threshold - 2):
+        start, stop = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            next_x = x[stop:edges[b + 2]].mean()
+            next_y = y[stop:edges[b + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Twice the triangle area formed with the previous choice and the next bucket's average
+        area = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        previous = start + int(area.argmax())
+        chosen[b + 1] = previous
+    return chosen
+
+
+class TrackCache:
+    """LRU of simplified tracks and downsampled risk series, shared between sessions.
+
+    ``history`` is a :class:`fisherlink.history.HistoryBuffer` or the
+    service's read-only view of one. Entries are keyed on the vessel, the
+    request parameters and the vessel's history version, so an entry is
+    replaced as soon as a sample is appended. A miss reads the version and
+    the samples together, so an entry never holds data newer or older than
+    its key.
+    """
+
+    def __init__(self, maxsize=MAX_ENTRIES):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _cached(self, key, history, row, build):
+        version = history.version(row)
+        with self._lock:
+            value = self._entries.get(key + version)
+            if value is not None:
+                self._entries.move_to_end(key + version)
+                self.hits += 1
+                return value
+        version, positions, risk, times = history.samples(row)
+        value = build(positions, risk, times)
+        with self._lock:
+            self.misses += 1
+            self._entries[key + version] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def track(self, history, row, vessel_id, zoom, max_points=MAX_TRACK_POINTS):
+        """Track of vessel ``row`` simplified for display at ``zoom``, oldest first."""
+        def build(positions, risk, times):
+            if not len(positions):
+                return positions
+            return simplify_track(positions, zoom_tolerance_km(zoom, positions[-1, 0]), max_points)
+
+        return self._cached(("track", vessel_id, zoom, max_points), history, row, build)
+
+    def risk_series(self, history, row, vessel_id, max_points=MAX_SERIES_POINTS):
+        """``(timestamps, risk_levels)`` of vessel ``row`` downsampled to at most ``max_points``."""
+        def build(positions, risk, times):
+            kept = lttb(times, risk, max_points)
+            return times[kept], risk[kept]
+
+        return self._cached(("risk", vessel_id, max_points), history, row, build)
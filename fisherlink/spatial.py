@@ -0,0 +1,109 @@
+"""Spatial index over the coastline for batched shore-distance queries.
+
+The legacy ``distance_to_geofence`` scans every coastal vertex with a
+geodesic call per boat. :class:`CoastIndex` projects the coastline once
+into a local kilometre plane (:class:`fisherlink.geo.LocalProjection`),
+densifies it and loads the vertices into a KD-tree, so a whole batch of
+positions is answered in one call at O(log n) per query. That keeps high
+resolution coastlines (tens of thousands of vertices) usable at the
+dashboard refresh rate.
+
+High resolution coastlines are first simplified (Douglas-Peucker) to
+``tolerance_km``. Long runs of near-collinear vertices make KD-tree
+nearest-neighbour queries from offshore positions very slow, and dropping
+them changes distances by at most the tolerance.
+
+:class:`fisherlink.geofence.GeofenceEngine` builds the geofence polygon
+on the simplified coastline and measures against this index.
+"""
+from functools import lru_cache
+
+import numpy as np
+import shapely
+from scipy.spatial import cKDTree
+
+from fisherlink.geo import COASTAL_COORDS, LocalProjection
+
+# Longest coastline segment after densification, in km. Guarantees a vertex
+# within half this distance of the true nearest point on the coastline.
+MAX_SEGMENT_KM = 0.25
+
+# Douglas-Peucker tolerance applied to the projected coastline, in km
+SIMPLIFY_TOLERANCE_KM = 0.01
+
+# Nearest vertices whose adjacent segments are tested for every position
+CANDIDATE_VERTICES = 6
+
+
+class CoastIndex:
+    """Nearest-coastline lookups for batches of positions.
+
+    Distances are to the nearest point on the coastline, found by
+    projecting each position onto the segments next to its nearest
+    vertices.
+    """
+
+    def __init__(self, coast_coords=COASTAL_COORDS, tolerance_km=SIMPLIFY_TOLERANCE_KM,
+                 max_segment_km=MAX_SEGMENT_KM):
+        coast = np.asarray(coast_coords, dtype=float)
+        self.projection = LocalProjection.around(coast)
+
+        x, y = self.projection.forward(coast[:, 0], coast[:, 1])
+        self.coastline = shapely.LineString(np.column_stack([x, y]))
+        self.simplified = shapely.simplify(self.coastline, tolerance_km, preserve_topology=False)
+
+        # Short segments keep the nearest-vertex candidates close to the true nearest segment
+        dense = shapely.segmentize(self.simplified, max_segment_km)
+        self._vertices = shapely.get_coordinates(dense)
+        self._tree = cKDTree(self._vertices)
+
+    def __len__(self):
+        return len(self._vertices)
+
+    def project(self, lat, lon):
+        """Positions as ``(x, y)`` kilometre arrays in the index's plane."""
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        lon = np.atleast_1d(np.asarray(lon, dtype=float))
+        return self.projection.forward(lat, lon)
+
+    def distance_xy(self, x, y):
+        """Distance in km from projected positions to the nearest point on the coastline."""
+        points = np.column_stack([x, y])
+        k = min(CANDIDATE_VERTICES, len(self._vertices))
+        _, nearest = self._tree.query(points, k=k, workers=-1)
+        nearest = nearest.reshape(len(points), k)
+
+        # Segments touching each candidate vertex: (v - 1, v) and (v, v + 1)
+        last_segment = len(self._vertices) - 2
+        segments = np.clip(np.concatenate([nearest - 1, nearest], axis=1), 0, last_segment)
+
+        start = self._vertices[segments]
+        direction = self._vertices[segments + 1] - start
+        offset = points[:, None, :] - start
+        length_sq = np.einsum("nkd,nkd->nk", direction, direction)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(length_sq > 0, np.einsum("nkd,nkd->nk", offset, direction) / length_sq, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+
+        foot = start + t[..., None] * direction
+        return np.sqrt(((points[:, None, :] - foot) ** 2).sum(axis=2)).min(axis=1)
+
+    def shore_distance(self, lat, lon):
+        """Distance in km from each position to the nearest point on the coastline."""
+        return self.distance_xy(*self.project(lat, lon))
+
+    def coast_position(self, lat, lon):
+        """Fraction of the way along the coastline, 0 at its first vertex, nearest to each position.
+
+        Densified vertices are evenly spaced, so this is close to the
+        fraction of the coastline's length.
+        """
+        x, y = self.project(lat, lon)
+        _, nearest = self._tree.query(np.column_stack([x, y]), workers=-1)
+        return nearest / max(len(self._vertices) - 1, 1)
+
+
+@lru_cache(maxsize=None)
+def default_coast_index():
+    """Index over ``COASTAL_COORDS``, built once per process."""
+    return CoastIndex()
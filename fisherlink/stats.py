@@ -0,0 +1,68 @@
+"""Fleet-wide statistics computed in one vectorized pass.
+
+The sidebar, Alerts and Analytics tabs all show counts and averages over
+the fleet. :func:`fleet_stats` derives every histogram, mean and total
+straight from the fleet arrays (one ``bincount`` or reduction per
+column), and :class:`fisherlink.service.FleetService` attaches the result
+to each snapshot so all sessions share a single computation per tick.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from fisherlink.fleet import HIGH_RISK, LOW_RISK, SAFETY_STATUSES, risk_band
+
+# Category labels in chart order
+RISK_CATEGORIES = (
+    f"Low Risk (0.0-{LOW_RISK})", f"Medium Risk ({LOW_RISK}-{HIGH_RISK})", f"High Risk ({HIGH_RISK}-1.0)"
+)
+FUEL_CATEGORIES = ("Critical (<10%)", "Low (10-30%)", "Medium (30-60%)", "High (60-100%)")
+FUEL_BINS = (10, 30, 60)
+
+
+@dataclass(frozen=True)
+class FleetStats:
+    """Aggregates for one fleet state; counts follow the ``*_CATEGORIES`` order."""
+    vessels: int
+    risk_counts: tuple
+    fuel_counts: tuple
+    safety_counts: tuple
+    mean_risk: float
+    mean_fuel: float
+    total_fish: float
+    total_crew: int
+    high_risk_rows: np.ndarray
+
+    @property
+    def risk_categories(self):
+        return dict(zip(RISK_CATEGORIES, self.risk_counts))
+
+    @property
+    def fuel_categories(self):
+        return dict(zip(FUEL_CATEGORIES, self.fuel_counts))
+
+    @property
+    def safety_categories(self):
+        return dict(zip(SAFETY_STATUSES, self.safety_counts))
+
+
+def fleet_stats(fleet):
+    """Every dashboard histogram, mean and total for ``fleet``."""
+    n = len(fleet)
+    bands = risk_band(fleet.risk_level)
+    fuel = np.digitize(fleet.fuel_level, FUEL_BINS)
+
+    def counts(codes, size):
+        return tuple(int(c) for c in np.bincount(codes, minlength=size)[:size])
+
+    return FleetStats(
+        vessels=n,
+        risk_counts=counts(bands, len(RISK_CATEGORIES)),
+        fuel_counts=counts(fuel, len(FUEL_CATEGORIES)),
+        safety_counts=counts(fleet.safety_status, len(SAFETY_STATUSES)),
+        mean_risk=float(fleet.risk_level.mean()) if n else 0.0,
+        mean_fuel=float(fleet.fuel_level.mean()) if n else 0.0,
+        total_fish=float(fleet.fish_caught.sum()),
+        total_crew=int(fleet.crew_size.sum(dtype=np.int64)),
+        high_risk_rows=np.flatnonzero(bands == 2),
+    )
@@ -0,0 +1,270 @@
+"""Vessel telemetry ingestion over MQTT.
+
+Vessels publish fixed-size binary reports (:data:`REPORT_DTYPE`, 41 bytes)
+to ``fisherlink/vessels/<id>/telemetry``. The transport callback only
+enqueues the raw payload on a bounded queue. :meth:`TelemetryIngestor.apply`
+drains it in batches, decodes the whole batch with one ``np.frombuffer``
+call, writes each vessel's latest report into the fleet arrays, and
+re-runs the risk and safety assessment for the vessels that reported.
+
+When the queue is full, the ``"block"`` policy makes the transport thread
+wait. With paho that stalls the network loop and so pushes back on the
+broker. The ``"drop"`` policy discards new reports and counts them, which
+suits a lossy link where the next report supersedes the last one anyway.
+
+:class:`FakeTransport` delivers published messages in-process and stands
+in for a broker in tests and benchmarks.
+"""
+import queue
+import threading
+import time
+
+import numpy as np
+import paho.mqtt.client as mqtt
+
+from fisherlink.fleet import COMM_ACTIVE, ENGINE_STATUSES, assess_risk
+from fisherlink.geofence import default_geofence
+
+TOPIC_PREFIX = "fisherlink/vessels"
+TOPIC_FILTER = f"{TOPIC_PREFIX}/+/telemetry"
+
+REPORT_DTYPE = np.dtype([
+    ("vessel_id", "<u4"),
+    ("timestamp", "<f8"),  # epoch seconds
+    ("lat", "<f8"),
+    ("lon", "<f8"),
+    ("speed", "<f4"),
+    ("heading", "<f4"),
+    ("fuel_level", "<f4"),
+    ("engine_status", "u1"),  # fisherlink.fleet.ENGINE_* code
+])
+
+MAX_QUEUE = 50_000
+BATCH_SIZE = 10_000
+
+# How long the "block" policy waits for queue space before giving up on a report
+PUT_TIMEOUT_S = 1.0
+
+# Accepted range of each numeric report field, inclusive; anything else is malformed
+FIELD_RANGES = {
+    "lat": (-90.0, 90.0),
+    "lon": (-180.0, 180.0),
+    "speed": (0.0, 100.0),  # knots
+    "heading": (0.0, 360.0),
+    "fuel_level": (0.0, 100.0),  # percent
+}
+
+
+def topic_for(vessel_id):
+    return f"{TOPIC_PREFIX}/{vessel_id}/telemetry"
+
+
+def encode_report(vessel_id, lat, lon, speed, heading, fuel_level, engine_status, timestamp=None):
+    """Pack one report into its wire format."""
+    report = np.zeros(1, dtype=REPORT_DTYPE)
+    report[0] = (vessel_id, time.time() if timestamp is None else timestamp,
+                 lat, lon, speed, heading, fuel_level, engine_status)
+    return report.tobytes()
+
+
+def valid_reports(reports):
+    """Mask of the reports whose fields are finite, in :data:`FIELD_RANGES` and a known engine code."""
+    valid = np.isfinite(reports["timestamp"]) & (reports["engine_status"] < len(ENGINE_STATUSES))
+    for field, (low, high) in FIELD_RANGES.items():
+        # NaN fails both comparisons, infinities fail one
+        valid &= (reports[field] >= low) & (reports[field] <= high)
+    return valid
+
+
+def decode_reports(payloads):
+    """Decode a batch of payloads into a structured array.
+
+    Returns ``(reports, malformed)``. Payloads of the wrong size and
+    reports that fail :func:`valid_reports` are skipped and counted in
+    ``malformed``.
+    """
+    size = REPORT_DTYPE.itemsize
+    sized = [payload for payload in payloads if len(payload) == size]
+    reports = np.frombuffer(b"".join(sized), dtype=REPORT_DTYPE)
+    reports = reports[valid_reports(reports)]
+    return reports, len(payloads) - len(reports)
+
+
+class FakeTransport:
+    """In-process stand-in for an MQTT connection; ``publish`` delivers synchronously."""
+
+    def __init__(self):
+        self._subscriptions = []
+
+    def subscribe(self, topic, callback):
+        self._subscriptions.append((topic, callback))
+
+    def publish(self, topic, payload):
+        for subscription, callback in self._subscriptions:
+            if mqtt.topic_matches_sub(subscription, topic):
+                callback(topic, payload)
+
+    def start(self):
+        return self
+
+    def close(self):
+        self._subscriptions.clear()
+
+
+class MqttTransport:
+    """paho-mqtt connection that forwards messages on subscribed topics to callbacks."""
+
+    def __init__(self, host="localhost", port=1883, client_id="", qos=0, keepalive=60):
+        self.host = host
+        self.port = port
+        self.qos = qos
+        self.keepalive = keepalive
+        self._subscriptions = []
+        self._client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=client_id)
+        self._client.on_connect = self._on_connect
+        self._client.on_message = self._on_message
+
+    def subscribe(self, topic, callback):
+        self._subscriptions.append((topic, callback))
+        if self._client.is_connected():
+            self._client.subscribe(topic, self.qos)
+
+    def _on_connect(self, client, userdata, flags, reason_code, properties):
+        # (Re)subscribe on every connect so a dropped connection recovers its topics
+        for topic, _ in self._subscriptions:
+            client.subscribe(topic, self.qos)
+
+    def _on_message(self, client, userdata, message):
+        for subscription, callback in self._subscriptions:
+            if mqtt.topic_matches_sub(subscription, message.topic):
+                callback(message.topic, message.payload)
+
+    def publish(self, topic, payload):
+        self._client.publish(topic, payload, self.qos)
+
+    def start(self):
+        """Connect and run the network loop on paho's background thread."""
+        self._client.connect(self.host, self.port, self.keepalive)
+        self._client.loop_start()
+        return self
+
+    def close(self):
+        self._client.loop_stop()
+        self._client.disconnect()
+
+
+class TelemetryIngestor:
+    """Bounded queue between a transport and the fleet state.
+
+    Counters (``received``, ``dropped``, ``malformed``, ``unknown``,
+    ``stale``, ``applied``) are plain integers for the dashboard and
+    benchmarks. ``malformed`` covers payloads of the wrong size and
+    reports rejected by :func:`valid_reports`; ``unknown`` covers reports
+    from ids that are not in the fleet.
+    """
+
+    def __init__(self, transport, topic=TOPIC_FILTER, max_queue=MAX_QUEUE, policy="block",
+                 put_timeout_s=PUT_TIMEOUT_S):
+        if policy not in ("block", "drop"):
+            raise ValueError(f"Unknown backpressure policy: {policy!r}")
+        self.policy = policy
+        self.put_timeout_s = put_timeout_s
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self.received = 0
+        self.dropped = 0
+        self.malformed = 0
+        self.unknown = 0
+        self.stale = 0
+        self.applied = 0
+        self._ids = None
+        self._order = None
+        transport.subscribe(topic, self._on_message)
+
+    def _on_message(self, topic, payload):
+        try:
+            if self.policy == "block":
+                self._queue.put(payload, timeout=self.put_timeout_s)
+            else:
+                self._queue.put_nowait(payload)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            return
+        with self._stats_lock:
+            self.received += 1
+
+    def pending(self):
+        """Reports waiting to be applied."""
+        return self._queue.qsize()
+
+    def drain(self, max_messages=BATCH_SIZE):
+        """Take up to ``max_messages`` raw payloads off the queue without waiting."""
+        payloads = []
+        try:
+            while len(payloads) < max_messages:
+                payloads.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return payloads
+
+    def _rows(self, fleet, vessel_ids):
+        # Sorted id index, rebuilt only if the fleet's ids change
+        if self._ids is None or not np.array_equal(self._ids, fleet.ids):
+            self._ids = fleet.ids.copy()
+            self._order = np.argsort(self._ids, kind="stable")
+        sorted_ids = self._ids[self._order]
+        pos = np.clip(np.searchsorted(sorted_ids, vessel_ids), 0, len(sorted_ids) - 1)
+        known = sorted_ids[pos] == vessel_ids
+        return self._order[pos], known
+
+    def apply(self, fleet, max_messages=BATCH_SIZE):
+        """Apply one batch of queued reports to ``fleet``; returns the rows that changed.
+
+        Only each vessel's newest report in the batch is kept, and only if
+        it is newer than the vessel's current state. Risk and
+        safety status are recomputed for those rows alone. Engine status
+        is taken from the report, and a vessel that reports is by
+        definition in contact. Operation time counts from the vessel's
+        first report and advances by the time between its reports.
+        """
+        reports, malformed = decode_reports(self.drain(max_messages))
+        rows, known = self._rows(fleet, reports["vessel_id"].astype(np.int64))
+        unknown = int((~known).sum())
+        reports, rows = reports[known], rows[known]
+
+        # Newest report per vessel: order by (row, timestamp) and keep each row's last entry
+        order = np.lexsort((reports["timestamp"], rows))
+        reports, rows = reports[order], rows[order]
+        last = np.append(rows[1:] != rows[:-1], True) if len(rows) else np.zeros(0, dtype=bool)
+        reports, rows = reports[last], rows[last]
+
+        # Reports older than what the fleet already holds arrived out of order
+        # A vessel that never reported has a NaN last_update, so any report is fresh
+        fresh = ~(reports["timestamp"] < fleet.last_update[rows])
+        stale = int((~fresh).sum())
+        reports, rows = reports[fresh], rows[fresh]
+
+        with self._stats_lock:
+            self.malformed += malformed
+            self.unknown += unknown
+            self.stale += stale
+            self.applied += len(rows)
+        if not len(rows):
+            return rows
+
+        fleet.lat[rows] = reports["lat"]
+        fleet.lon[rows] = reports["lon"]
+        fleet.speed[rows] = reports["speed"]
+        fleet.heading[rows] = reports["heading"]
+        fleet.fuel_level[rows] = reports["fuel_level"]
+        fleet.engine_status[rows] = reports["engine_status"]
+        fleet.communication_status[rows] = COMM_ACTIVE
+        previous = fleet.last_update[rows]
+        fleet.operation_time[rows] = np.where(
+            np.isnan(previous), 0.0, fleet.operation_time[rows] + (reports["timestamp"] - previous) / 3600
+        )
+        fleet.last_update[rows] = reports["timestamp"]
+        fleet.geofence_distance[rows] = default_geofence().signed_distance(reports["lat"], reports["lon"])
+        assess_risk(fleet, rows)
+        return rows
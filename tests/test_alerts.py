@@ -0,0 +1,145 @@
+import pytest
+
+from fisherlink.alerts import (
+    CLEARED, EMERGENCY, INFO, RAISED, RESOLVED_TYPE, WARNING, AlertEngine, AlertRule, AlertStore,
+)
+from fisherlink.fleet import generate_fleet
+
+RULE = AlertRule(
+    "high_risk", "risk_level", above=True, enter=0.8, exit=0.7, type="Warning", severity=WARNING,
+    message="{name} high", cleared_message="{name} cleared", cooldown_s=300,
+)
+
+
+@pytest.fixture
+def fleet():
+    fleet = generate_fleet(3, seed=0)
+    fleet.risk_level[:] = 0.1
+    return fleet
+
+
+@pytest.fixture
+def engine():
+    return AlertEngine(AlertStore(":memory:"), rules=[RULE])
+
+
+def states(events):
+    return [(event.state, event.vessel_id) for event in events]
+
+
+def test_hysteresis_raises_once_and_clears_below_exit(fleet, engine):
+    fleet.risk_level[0] = 0.85
+    assert states(engine.evaluate(fleet, now=0)) == [(RAISED, 1)]
+
+    # Between exit and enter: still in alert, nothing new
+    for risk in (0.79, 0.81, 0.75):
+        fleet.risk_level[0] = risk
+        assert engine.evaluate(fleet, now=10) == []
+    assert engine.active("high_risk").tolist() == [0]
+
+    fleet.risk_level[0] = 0.65
+    events = engine.evaluate(fleet, now=20)
+    assert states(events) == [(CLEARED, 1)]
+    assert events[0].type == RESOLVED_TYPE and events[0].severity == INFO
+    assert not len(engine.active("high_risk"))
+
+
+def test_reentry_within_cooldown_is_silent(fleet, engine):
+    fleet.risk_level[1] = 0.9
+    engine.evaluate(fleet, now=0)
+    fleet.risk_level[1] = 0.5
+    engine.evaluate(fleet, now=60)
+
+    # Back above enter within the cooldown: tracked, but neither raised nor later cleared
+    fleet.risk_level[1] = 0.9
+    assert engine.evaluate(fleet, now=120) == []
+    assert engine.active("high_risk").tolist() == [1]
+    fleet.risk_level[1] = 0.5
+    assert engine.evaluate(fleet, now=180) == []
+
+    # After the cooldown it raises again
+    fleet.risk_level[1] = 0.9
+    assert states(engine.evaluate(fleet, now=400)) == [(RAISED, 2)]
+
+
+def test_cleared_events_are_stored_but_not_counted(fleet, engine):
+    fleet.risk_level[:] = 0.9
+    engine.evaluate(fleet, now=0)
+    fleet.risk_level[:] = 0.1
+    engine.evaluate(fleet, now=10)
+
+    store = engine.store
+    assert store.type_counts() == {"Warning": 3}
+    assert store.severity_counts() == {WARNING: 3}
+    assert len(store) == 3
+    assert [alert.state for alert in store.recent(10)] == [CLEARED] * 3 + [RAISED] * 3
+
+
+def test_counts_survive_reopen_and_prune(tmp_path):
+    path = str(tmp_path / "alerts.sqlite")
+    store = AlertStore(path)
+    store.add("Warning", "old", WARNING, now=0)
+    store.add(RESOLVED_TYPE, "old cleared", INFO, state=CLEARED, now=0)
+    # A year past the retention period; this add prunes the two older alerts
+    store.add("Emergency", "new", now=400 * 86400.0)
+    store.close()
+
+    store = AlertStore(path)
+    assert store.type_counts() == {"Emergency": 1}
+    assert len(store) == 1
+
+
+def test_page_walks_every_alert_newest_first_without_gaps():
+    store = AlertStore(":memory:")
+    for i in range(25):
+        store.add("Warning" if i % 2 else "Info", f"alert {i}", WARNING if i % 2 else INFO, vessel_id=i % 3,
+                  now=1000.0 + i)
+
+    seen, cursor = [], None
+    while True:
+        page = store.page(limit=10, cursor=cursor)
+        seen.extend(alert.id for alert in page.alerts)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 25
+
+
+def test_page_is_stable_when_new_alerts_arrive():
+    store = AlertStore(":memory:")
+    for i in range(15):
+        store.add("Warning", f"alert {i}", WARNING, now=1000.0 + i)
+    first = store.page(limit=5)
+    store.add("Warning", "newest", WARNING, now=2000.0)
+
+    second = store.page(limit=5, cursor=first.next_cursor)
+    assert [alert.id for alert in second.alerts] == list(range(10, 5, -1))
+
+
+def test_page_filters_combine_with_the_cursor():
+    store = AlertStore(":memory:")
+    for i in range(30):
+        store.add("Warning", f"alert {i}", WARNING if i % 3 else INFO, vessel_id=i % 2, now=1000.0 + i)
+
+    page = store.page(limit=4, vessel_id=1, severity=WARNING, since=1005.0)
+    expected = [i + 1 for i in range(29, 4, -1) if i % 2 == 1 and i % 3]
+    ids = [alert.id for alert in page.alerts]
+    while page.next_cursor is not None:
+        page = store.page(limit=4, cursor=page.next_cursor, vessel_id=1, severity=WARNING, since=1005.0)
+        ids.extend(alert.id for alert in page.alerts)
+    assert ids == expected
+
+
+def test_prune_keeps_the_newest_max_rows_alerts():
+    store = AlertStore(":memory:", max_rows=5)
+    for i in range(8):
+        store.add("Emergency" if i % 2 else "Warning", f"alert {i}", EMERGENCY if i % 2 else WARNING,
+                  now=1000.0 + i)
+
+    store.prune(now=1010.0)
+
+    assert [alert.id for alert in store.recent(10)] == [8, 7, 6, 5, 4]
+    assert store.type_counts() == {"Emergency": 3, "Warning": 2}
+    assert len(store) == 5
+    assert [alert.id for alert in store.page(alert_type="Emergency").alerts] == [8, 6, 4]
@@ -0,0 +1,149 @@
+import json
+import os
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+from fisherlink.archive import MARKER, TrackArchive
+from fisherlink.fleet import generate_fleet
+
+DAY = 86400.0
+START = 20_000 * DAY  # midnight UTC, 2024-10-04
+VESSELS = 6
+
+
+def fill(archive, ticks, start=START, interval_s=600.0, seed=0):
+    """One report per vessel every ``interval_s``; returns the reference rows."""
+    fleet = generate_fleet(VESSELS, seed=seed)
+    rows = []
+    for tick in range(ticks):
+        now = start + tick * interval_s
+        fleet.lat += 0.01
+        fleet.last_update[:] = now
+        archive.append(fleet, now=now)
+        rows.extend(zip(fleet.ids.tolist(), [now] * VESSELS, fleet.lat.tolist(), fleet.lon.tolist()))
+    archive.flush()
+    return rows
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return TrackArchive(str(tmp_path / "tracks"), flush_rows=4 * VESSELS, compact_rows=10)
+
+
+def parquet_files(archive, day):
+    directory = archive._day_dir(day)
+    return sorted(name for name in os.listdir(directory) if name.endswith(".parquet"))
+
+
+def test_round_trip(archive):
+    rows = fill(archive, 20)
+
+    tracks = archive.tracks(START, START + DAY)
+    assert len(tracks) == len(rows)
+    assert list(zip(tracks.vessel_id, tracks.timestamp, tracks.lat, tracks.lon)) == sorted(rows)
+
+
+def test_vessel_track_is_one_vessel_in_time_order(archive):
+    fill(archive, 20)
+
+    track = archive.vessel_track(3, START + 3000, START + 6000)
+    assert set(track.vessel_id) == {3}
+    assert track.timestamp.tolist() == [START + t for t in (3000, 3600, 4200, 4800, 5400, 6000)]
+
+
+def test_vessels_in_bbox_uses_each_vessels_latest_report(archive):
+    fleet = generate_fleet(2, seed=0)
+    fleet.lat[:], fleet.lon[:] = 10.0, 80.0
+    fleet.last_update[:] = START
+    archive.append(fleet, now=START)
+    # Vessel 1 leaves the box before t; vessel 2 stays
+    fleet.lat[0] = 11.0
+    fleet.last_update[:] = START + 30
+    archive.append(fleet, now=START + 30)
+    archive.flush()
+
+    bbox = (9.5, 79.5, 10.5, 80.5)
+    assert archive.vessels_in_bbox(bbox, START + 10).vessel_id.tolist() == [1, 2]
+    assert archive.vessels_in_bbox(bbox, START + 40).vessel_id.tolist() == [2]
+    assert archive.vessels_in_bbox(bbox, START + 1000).empty
+
+
+def test_appends_leave_compaction_to_maintenance(archive):
+    fill(archive, 2 * 144)  # two days of reports at 10-minute intervals
+    first, second = archive.days()
+    assert len(parquet_files(archive, first)) > 1
+
+    archive.maintain(now=START + 2 * DAY)
+
+    assert parquet_files(archive, first) == [f"day-{first}.parquet"]
+    assert parquet_files(archive, second) == [f"day-{second}.parquet"]
+    tracks = archive.tracks(START, START + 2 * DAY)
+    assert len(tracks) == 2 * 144 * VESSELS
+    assert not tracks.duplicated(["vessel_id", "timestamp"]).any()
+    # The compacted file itself is sorted by vessel then time, across bucket boundaries
+    day_file = pq.read_table(os.path.join(archive._day_dir(first), f"day-{first}.parquet")).to_pandas()
+    assert day_file.equals(day_file.sort_values(["vessel_id", "timestamp"], ignore_index=True))
+
+
+def test_late_reports_are_merged_into_the_day_file(archive):
+    fill(archive, 144)
+    archive.maintain(now=START + DAY)
+    fill(archive, 3, start=START + 3600, interval_s=1.0, seed=1)
+
+    archive.maintain(now=START + DAY)
+
+    day = archive.days()[0]
+    assert parquet_files(archive, day) == [f"day-{day}.parquet"]
+    assert len(archive.tracks(START, START + DAY)) == (144 + 3) * VESSELS
+
+
+def test_a_swap_interrupted_after_the_rename_hides_the_replaced_files(archive):
+    rows = fill(archive, 144)
+    day = archive.days()[0]
+    directory = archive._day_dir(day)
+    sources = parquet_files(archive, day)
+
+    # Crash between renaming the day file into place and deleting the batch files
+    archive._finish = lambda directory, marker: None
+    archive.compact(day)
+    assert set(parquet_files(archive, day)) == set(sources) | {f"day-{day}.parquet"}
+    assert os.path.exists(os.path.join(directory, MARKER))
+    assert len(archive.tracks(START, START + DAY)) == len(rows)
+
+    del archive._finish
+    archive.maintain(now=START + DAY)
+    assert parquet_files(archive, day) == [f"day-{day}.parquet"]
+    assert not os.path.exists(os.path.join(directory, MARKER))
+    assert len(archive.tracks(START, START + DAY)) == len(rows)
+
+
+def test_a_swap_interrupted_before_the_rename_is_rolled_back(archive):
+    rows = fill(archive, 144)
+    day = archive.days()[0]
+    directory = archive._day_dir(day)
+    sources = parquet_files(archive, day)
+    # Staged day file and marker written, rename never happened
+    archive._sort_into([os.path.join(directory, name) for name in sources],
+                       os.path.join(directory, "_compact-crashed.parquet"))
+    with open(os.path.join(directory, MARKER), "w") as f:
+        json.dump({"staging": "_compact-crashed.parquet", "target": f"day-{day}.parquet", "sources": sources}, f)
+
+    assert len(archive.tracks(START, START + DAY)) == len(rows)
+    archive.maintain(now=START + DAY)
+    assert parquet_files(archive, day) == [f"day-{day}.parquet"]
+    assert os.listdir(directory) == [f"day-{day}.parquet"]
+    assert len(archive.tracks(START, START + DAY)) == len(rows)
+
+
+def test_retention_deletes_expired_days(tmp_path):
+    archive = TrackArchive(str(tmp_path / "tracks"), retention_days=2)
+    for day in range(4):
+        fill(archive, 1, start=START + day * DAY)
+    assert len(archive.days()) == 4
+
+    archive.maintain(now=START + 4 * DAY)
+
+    assert archive.days() == [str(np.datetime64(int(START + d * DAY), "s").astype("datetime64[D]")) for d in (2, 3)]
+    assert archive.tracks(START, START + 2 * DAY - 1).empty
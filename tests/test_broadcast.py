@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from fisherlink.broadcast import ALERT_FILTER, Broadcaster, Delivery, FakeVessels, ack_topic, encode_ack
+from fisherlink.telemetry import FakeTransport
+
+VESSEL_IDS = np.arange(1, 21)
+
+
+@pytest.fixture
+def transport():
+    return FakeTransport()
+
+
+@pytest.fixture
+def broadcaster(transport):
+    broadcaster = Broadcaster(transport, batch_size=8, ack_timeout_s=0.05, max_attempts=4)
+    yield broadcaster
+    broadcaster.close()
+
+
+def finish(delivery):
+    assert delivery.done.wait(5)
+    return delivery.summary()
+
+
+def test_fleet_wide_alert_is_one_message(transport, broadcaster):
+    FakeVessels(transport, VESSEL_IDS)
+    summary = finish(broadcaster.send("Tsunami", "evacuate", VESSEL_IDS, fleet_wide=True))
+
+    assert summary["acked"] == len(VESSEL_IDS)
+    assert summary["messages_sent"] == 1
+    assert summary["max_attempts_used"] == 1
+
+
+def test_targeted_alert_goes_to_each_recipient_once(transport, broadcaster):
+    topics = []
+    transport.subscribe(ALERT_FILTER, lambda topic, payload: topics.append(topic))
+    FakeVessels(transport, VESSEL_IDS)
+    summary = finish(broadcaster.send("Warning", "storm", [3, 5, 5, 7]))
+
+    assert summary["recipients"] == 3
+    assert summary["acked"] == 3
+    assert sorted(topics) == sorted(f"fisherlink/vessels/{i}/alerts" for i in (3, 5, 7))
+
+
+def test_lost_alerts_are_retried(transport, broadcaster):
+    FakeVessels(transport, VESSEL_IDS, loss=0.5, seed=3)
+    delivery = broadcaster.send("Warning", "storm", VESSEL_IDS)
+    summary = finish(delivery)
+
+    assert summary["max_attempts_used"] > 1
+    assert summary["messages_sent"] > len(VESSEL_IDS)
+    # Only vessels still pending are resent, so no vessel gets more than max_attempts sends
+    assert delivery.attempts.max() <= broadcaster.max_attempts
+
+
+def test_unreachable_vessels_time_out(transport, broadcaster):
+    FakeVessels(transport, VESSEL_IDS, loss=1.0)
+    delivery = broadcaster.send("Warning", "storm", VESSEL_IDS[:4])
+    summary = finish(delivery)
+
+    assert summary["acked"] == 0
+    assert summary["unreached"] == 4
+    assert summary["messages_sent"] == 4 * broadcaster.max_attempts
+    assert summary["reach_all_s"] is None
+
+
+def test_empty_and_stray_acks_are_ignored(transport, broadcaster):
+    empty = broadcaster.send("Warning", "nobody in the region", [])
+    finish(empty)
+    targeted = broadcaster.send("Warning", "storm", [4])
+    for vessel_id in (4, 4, 9):
+        transport.publish(ack_topic(vessel_id), encode_ack(empty.id, vessel_id))
+        transport.publish(ack_topic(vessel_id), encode_ack(targeted.id, vessel_id))
+
+    summary = finish(targeted)
+    assert summary["recipients"] == 1
+    assert summary["acked"] == 1
+    assert empty.acked == 0
+    assert broadcaster._thread.is_alive()
+
+
+def test_duplicate_acks_keep_the_first_time():
+    delivery = Delivery(1, "Warning", "storm", 0, [2, 4, 6], fleet_wide=False)
+    assert delivery._ack(np.array([4, 4, 99]), now=10.0) == 1
+    assert delivery._ack(np.array([4, 6]), now=20.0) == 1
+    assert delivery.acked_at[1] == 10.0
+    assert delivery.acked == 2
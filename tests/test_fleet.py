@@ -0,0 +1,84 @@
+import copy
+
+import numpy as np
+
+from benchmarks.legacy import fleet_to_boats, update_boat
+from fisherlink.cards import risk_class
+from fisherlink.deckmap import RISK_COLORS, vessel_frame
+from fisherlink.fleet import (
+    COMMUNICATION_STATUSES,
+    ENGINE_NORMAL,
+    ENGINE_STATUSES,
+    ENGINE_WARNING,
+    ENV_RISK_RANGE,
+    FUEL_BURN_RANGE,
+    HIGH_RISK,
+    LOW_RISK,
+    SAFETY_STATUSES,
+    generate_fleet,
+    risk_band,
+    step_fleet,
+)
+from fisherlink.geofence import default_geofence
+from fisherlink.mapview import risk_style
+from fisherlink.stats import fleet_stats
+
+EDGES = [0.0, LOW_RISK - 1e-9, LOW_RISK, 0.5, HIGH_RISK, HIGH_RISK + 1e-9, 1.0]
+BANDS = [0, 0, 1, 1, 1, 2, 2]
+
+
+def test_band_edges():
+    assert risk_band(EDGES).tolist() == BANDS
+    assert [int(risk_band(risk)) for risk in EDGES] == BANDS
+
+
+def test_every_view_uses_the_same_bands():
+    fleet = generate_fleet(len(EDGES), seed=0)
+    fleet.risk_level[:] = EDGES
+
+    assert list(fleet_stats(fleet).risk_counts) == np.bincount(BANDS, minlength=3).tolist()
+    assert [risk_style(risk)[0] for risk in EDGES] == [("green", "orange", "red")[band] for band in BANDS]
+    assert [risk_class(risk) for risk in EDGES] == [("low", "medium", "high")[band] for band in BANDS]
+    frame = vessel_frame(fleet)
+    assert frame[["r", "g", "b"]].to_numpy().tolist() == RISK_COLORS[BANDS].tolist()
+
+
+# Draws in the order step_fleet and assess_fleet take them from fleet.rng
+STEP_DRAWS = [
+    ("heading", -15, 15), ("speed", -0.5, 0.5), ("catch", 0, 5), ("catch_chance", 0, 1),
+    ("fuel", *FUEL_BURN_RANGE), ("env", *ENV_RISK_RANGE), ("engine_warning", 0, 1),
+    ("engine_critical", 0, 1), ("comm_intermittent", 0, 1), ("comm_lost", 0, 1),
+]
+
+
+def test_step_fleet_matches_the_per_boat_rules():
+    fleet = generate_fleet(300, seed=3)
+    # Spread the fleet over every risk band and both sides of the geofence
+    fleet.fuel_level[:] = fleet.rng.uniform(0, 100, len(fleet))
+    fleet.operation_time[:] = fleet.rng.uniform(0, 24, len(fleet))
+    fleet.lon += fleet.rng.uniform(0, 0.35, len(fleet))
+    boats = fleet_to_boats(fleet)
+    geofence = default_geofence()
+
+    for _ in range(5):
+        rng = copy.deepcopy(fleet.rng)
+        draws = {name: rng.uniform(low, high, len(fleet)) for name, low, high in STEP_DRAWS}
+        step_fleet(fleet)
+
+        for i, boat in enumerate(boats):
+            update_boat(
+                boat,
+                draw=lambda name, low=0.0, high=1.0: draws[name][i],
+                geofence_distance=lambda lat, lon: float(geofence.signed_distance(lat, lon)[0]),
+            )
+
+        for key, labels in [("engine_status", ENGINE_STATUSES), ("communication_status", COMMUNICATION_STATUSES),
+                            ("safety_status", SAFETY_STATUSES)]:
+            assert [boat[key] for boat in boats] == [labels[code] for code in getattr(fleet, key)]
+        for key in ["lat", "lon", "speed", "heading", "fuel_level", "fish_caught", "risk_level"]:
+            np.testing.assert_allclose([boat[key] for boat in boats], getattr(fleet, key), rtol=1e-9)
+
+    # The comparison covered all four safety statuses. Critical is unreachable in
+    # both: any risk above HIGH_RISK takes the Warning branch first.
+    assert set(fleet.engine_status) == {ENGINE_NORMAL, ENGINE_WARNING}
+    assert len(set(fleet.safety_status)) == len(SAFETY_STATUSES)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from fisherlink.fleet import SAFETY_STATUSES, VesselRecords, generate_fleet, step_fleet
+from fisherlink.fleetindex import RISK_BANDS, FleetIndex, NameIndex
+
+
+def scan(boats, risk=None, status=None, search=None):
+    """The Boat Details filter chain the index replaces."""
+    filtered = boats
+    if risk == "High Risk":
+        filtered = [b for b in filtered if b["risk_level"] > 0.7]
+    elif risk == "Medium Risk":
+        filtered = [b for b in filtered if 0.3 <= b["risk_level"] <= 0.7]
+    elif risk == "Low Risk":
+        filtered = [b for b in filtered if b["risk_level"] < 0.3]
+    if status is not None:
+        filtered = [b for b in filtered if b["safety_status"] == status]
+    if search:
+        filtered = [b for b in filtered if search.lower() in b["name"].lower() or search == str(b["id"])]
+    return [b["id"] for b in filtered]
+
+
+@pytest.fixture(scope="module")
+def fleet():
+    fleet = generate_fleet(500, seed=4)
+    for _ in range(30):
+        step_fleet(fleet)
+    return fleet
+
+
+@pytest.fixture(scope="module")
+def index(fleet):
+    return FleetIndex(fleet, NameIndex(fleet.names))
+
+
+@pytest.fixture(scope="module")
+def boats(fleet):
+    return list(VesselRecords(fleet))
+
+
+@pytest.mark.parametrize("risk", [None, *RISK_BANDS])
+@pytest.mark.parametrize("status", [None, *SAFETY_STATUSES])
+def test_filters_match_a_linear_scan(fleet, index, boats, risk, status):
+    assert fleet.ids[index.query(risk, status)].tolist() == scan(boats, risk, status)
+
+
+@pytest.mark.parametrize("search", [
+    "s", "SE", "sea", "Sea Explorer", "explorer-1", "r-42", "ea p", "zzz", "-", "7", "42", "02", "006", "500",
+])
+def test_search_matches_a_linear_scan(fleet, index, boats, search):
+    assert fleet.ids[index.query(search=search)].tolist() == scan(boats, search=search)
+    assert fleet.ids[index.query("Low Risk", None, search)].tolist() == scan(boats, "Low Risk", None, search)
+
+
+def test_id_search_needs_the_exact_id(fleet, index):
+    assert 6 in fleet.ids[index.query(search="6")]
+    assert 6 not in fleet.ids[index.query(search="06")]
+
+
+def test_row_lookup(fleet, index):
+    for row in (0, 17, len(fleet) - 1):
+        assert index.row(int(fleet.ids[row])) == row
+    assert index.row(0) is None
+    assert index.row(10_000) is None
+    # Nothing selected on the Large fleet map
+    assert index.row(None) is None
+
+
+def test_sparse_ids_fall_back_to_a_dict():
+    fleet = generate_fleet(20, seed=1)
+    fleet.ids = fleet.ids * 1_000_003
+    index = FleetIndex(fleet)
+
+    assert index.row(int(fleet.ids[5])) == 5
+    assert index.row(5) is None
+    assert index.query(search=str(fleet.ids[3])).tolist() == [3]
+
+
+def test_rejects_a_name_index_for_another_fleet(fleet):
+    with pytest.raises(ValueError):
+        FleetIndex(fleet, NameIndex(np.array(["one", "two"])))
@@ -0,0 +1,59 @@
+import numpy as np
+
+from fisherlink.history import HistoryBuffer
+
+
+def append_samples(history, times, rows=None):
+    for t in times:
+        history.append(lat=t, lon=-t, risk=t / 100, timestamp=t, rows=rows)
+
+
+def test_window_wraps_around_the_ring():
+    history = HistoryBuffer(2, capacity=4)
+    append_samples(history, range(1, 11))
+
+    assert history.count(0) == 4
+    np.testing.assert_array_equal(history.timestamps(0), [7, 8, 9, 10])
+    np.testing.assert_array_equal(history.positions(1), [[7, -7], [8, -8], [9, -9], [10, -10]])
+    np.testing.assert_allclose(history.risk_levels(0), [0.07, 0.08, 0.09, 0.10], rtol=1e-6)
+
+
+def test_every_head_position_gives_a_contiguous_window():
+    history = HistoryBuffer(1, capacity=5)
+    for t in range(1, 13):
+        append_samples(history, [t])
+        expected = np.arange(max(1, t - 4), t + 1)
+        np.testing.assert_array_equal(history.timestamps(0), expected)
+        np.testing.assert_array_equal(history.timestamps(0, 2), expected[-2:])
+
+
+def test_partial_window_before_the_buffer_fills():
+    history = HistoryBuffer(1, capacity=8)
+    append_samples(history, [1, 2, 3])
+
+    assert history.count(0) == 3
+    np.testing.assert_array_equal(history.timestamps(0), [1, 2, 3])
+    np.testing.assert_array_equal(history.timestamps(0, 10), [1, 2, 3])
+
+
+def test_rows_fill_independently():
+    history = HistoryBuffer(3, capacity=3)
+    append_samples(history, [1, 2, 3, 4])
+    append_samples(history, [5, 6], rows=[1])
+
+    np.testing.assert_array_equal(history.timestamps(0), [2, 3, 4])
+    np.testing.assert_array_equal(history.timestamps(1), [4, 5, 6])
+
+
+def test_resolution_overwrites_the_newest_slot():
+    history = HistoryBuffer(1, capacity=3, resolution_s=60)
+    append_samples(history, [0, 30, 59, 60, 150])
+
+    np.testing.assert_array_equal(history.timestamps(0), [59, 60, 150])
+
+
+def test_out_of_order_samples_are_dropped():
+    history = HistoryBuffer(1, capacity=3)
+    append_samples(history, [10, 5, 20])
+
+    np.testing.assert_array_equal(history.timestamps(0), [10, 20])
@@ -0,0 +1,37 @@
+from fisherlink.fleet import ENGINE_CRITICAL, ENGINE_STATUSES, generate_fleet
+from fisherlink.livemap import DETAIL_FIELDS, STATUS_FIELDS, MapDeltaFeed, tile_layers
+
+POPUP_FIELDS = [*DETAIL_FIELDS, *STATUS_FIELDS, "last_update"]
+
+
+def test_snapshot_carries_every_popup_field():
+    fleet = generate_fleet(4, seed=0)
+    message = MapDeltaFeed().message(fleet)
+
+    assert message["full"]
+    for field in [*POPUP_FIELDS, "crew_size"]:
+        assert len(message[field]) == 4
+    assert message["statuses"]["engine_status"] == list(ENGINE_STATUSES)
+
+
+def test_delta_lists_moved_vessels_and_status_changes():
+    fleet = generate_fleet(4, seed=0)
+    feed = MapDeltaFeed()
+    feed.message(fleet)
+
+    fleet.tick += 1
+    fleet.lat[1] += 0.01
+    fleet.engine_status[3] = ENGINE_CRITICAL
+    message = feed.message(fleet)
+
+    assert message["base"] == message["version"] - 1
+    assert message["ids"] == [int(fleet.ids[1]), int(fleet.ids[3])]
+    assert message["engine_status"][1] == ENGINE_CRITICAL
+    for field in POPUP_FIELDS:
+        assert len(message[field]) == 2
+
+
+def test_tile_layers_are_url_templates():
+    layers = tile_layers()
+    assert layers[0]["name"] == "Dark Map (Default)"
+    assert all("{z}" in layer["url"] for layer in layers)
@@ -0,0 +1,59 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from fisherlink.fleet import generate_fleet
+from fisherlink.parallel import ParallelStepper
+
+FIELDS = ("lat", "lon", "speed", "heading", "operation_time", "fish_caught", "fuel_level", "risk_level",
+          "engine_status", "communication_status", "safety_status", "geofence_distance")
+
+
+class FailingRiskModel:
+    name = "failing"
+
+    def score(self, **features):
+        raise RuntimeError("model failed")
+
+
+class CrashingRiskModel:
+    name = "crashing"
+
+    def score(self, **features):
+        os._exit(1)
+
+
+def stepped(workers, steps=3):
+    fleet = generate_fleet(500, seed=7)
+    with ParallelStepper(fleet, workers=workers, sectors=8) as stepper:
+        for _ in range(steps):
+            stepper.step()
+    return fleet
+
+
+def test_results_do_not_depend_on_the_worker_count():
+    one, several = stepped(1), stepped(3)
+
+    assert one.tick == several.tick == 3
+    assert one.names.tolist() == several.names.tolist()
+    for name in FIELDS:
+        np.testing.assert_array_equal(getattr(one, name), getattr(several, name), err_msg=name)
+
+
+@pytest.mark.parametrize("model, error", [(FailingRiskModel(), RuntimeError), (CrashingRiskModel(), BrokenProcessPool)])
+def test_shared_memory_is_unlinked_when_a_worker_fails(model, error):
+    fleet = generate_fleet(100, seed=0)
+    fleet.risk_model = model
+
+    with pytest.raises(error):
+        with ParallelStepper(fleet, workers=2, sectors=4) as stepper:
+            name = stepper._shm.name
+            stepper.step()
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+    # The fleet keeps private copies of its arrays
+    assert fleet.lat.base is None
@@ -0,0 +1,37 @@
+import pytest
+import shapely
+
+from fisherlink.fleet import generate_fleet
+from fisherlink.regions import PolygonRegion, RadiusRegion, VesselIndex
+
+
+def test_parse_polygon():
+    region = PolygonRegion.parse("12.5, 80.4\n\n12.7, 80.4\n 12.7 , 80.7 \n12.5, 80.7\n")
+    assert region.points == ((12.5, 80.4), (12.7, 80.4), (12.7, 80.7), (12.5, 80.7))
+
+
+@pytest.mark.parametrize("text, problem", [
+    ("12.5, 80.4, 1\n12.7, 80.4\n12.7, 80.7", "vertex 1"),
+    ("12.5, 80.4\n12.7\n12.7, 80.7", "vertex 2"),
+    ("12.5, 80.4\n12.7, 80.4\n12.7, east", "vertex 3"),
+    ("12.5, 80.4\n12.7, nan\n12.7, 80.7", "vertex 2"),
+    ("12.5, 80.4\n95, 80.4\n12.7, 80.7", "vertex 2"),
+    ("12.5, 80.4\n12.7, 80.4", "at least 3"),
+])
+def test_parse_rejects_bad_vertices(text, problem):
+    with pytest.raises(ValueError, match=problem):
+        PolygonRegion.parse(text)
+
+
+@pytest.mark.parametrize("region", [
+    RadiusRegion(12.8, 80.4, 15),
+    PolygonRegion(((12.5, 80.3), (12.9, 80.3), (12.9, 80.6), (12.5, 80.6))),
+])
+def test_inside_matches_a_test_of_every_vessel(region):
+    fleet = generate_fleet(300, seed=2)
+    index = VesselIndex(fleet)
+
+    x, y = index.projection.forward(fleet.lat, fleet.lon)
+    expected = shapely.contains_xy(region.geometry(index.projection), x, y).nonzero()[0]
+    assert len(expected)
+    assert index.inside(region).tolist() == expected.tolist()
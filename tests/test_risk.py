@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fisherlink.fleet import SAFETY_SAFE, SAFETY_WARNING
+from fisherlink.risk import FEATURES, LogisticRiskModel, RiskModel, label_tracks
+
+
+def track(vessel_id, safety, fuel=None, step_s=600):
+    n = len(safety)
+    return pd.DataFrame({
+        "vessel_id": [vessel_id] * n,
+        "timestamp": [i * step_s for i in range(n)],
+        "safety_status": safety,
+        "engine_status": [0] * n,
+        "fuel_level": fuel or [50.0] * n,
+    })
+
+
+def test_labels_incident_onset_and_skips_samples_in_an_incident():
+    S, W = SAFETY_SAFE, SAFETY_WARNING
+    tracks = track(1, [S, S, S, S, W, W, S, S, S, S, S])
+
+    labels, known = label_tracks(tracks, horizon_s=1800)
+
+    # Samples within 30 min before the incident starts at t=2400 are positive
+    assert labels.tolist() == [False, True, True, True] + [False] * 7
+    # Samples during the incident are not labelled
+    assert not known[4] and not known[5]
+    assert known[:4].all()
+    # The last samples have no incident after them and too little track left to say
+    assert known[6:8].all() and not known[8:].any()
+
+
+def test_incidents_of_another_vessel_do_not_count():
+    S, W = SAFETY_SAFE, SAFETY_WARNING
+    tracks = pd.concat([track(1, [S] * 6), track(2, [W, S, S, S, S, S])], ignore_index=True)
+
+    labels, known = label_tracks(tracks, horizon_s=1800)
+
+    assert not labels.any()
+    assert known[:3].all() and not known[6]
+
+
+def test_risk_model_is_abstract():
+    with pytest.raises(TypeError):
+        RiskModel()
+
+
+def test_shipped_model_uses_every_feature():
+    model = LogisticRiskModel.load()
+    assert len(model.weights) == len(FEATURES)
+    assert np.all(model.weights != 0)
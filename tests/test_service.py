@@ -0,0 +1,67 @@
+import time
+
+from fisherlink.service import FleetService
+from fisherlink.telemetry import FakeTransport, TelemetryIngestor, encode_report, topic_for
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_failed_tick_keeps_the_thread_running(monkeypatch):
+    service = FleetService(5, seed=0, interval_s=0.02)
+    tick = service.tick
+    failures = iter([RuntimeError("archive flush failed")])
+
+    def flaky_tick():
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        return tick()
+
+    monkeypatch.setattr(service, "tick", flaky_tick)
+    service.start()
+    try:
+        assert wait_until(lambda: service.snapshot().version >= 2)
+        assert service.running
+        assert service.healthy
+        assert isinstance(service.last_error, RuntimeError)
+    finally:
+        service.stop()
+
+
+def test_repeated_failures_mark_the_service_unhealthy(monkeypatch):
+    service = FleetService(5, seed=0, interval_s=0.02)
+
+    def broken_tick():
+        raise ValueError("bad report")
+
+    monkeypatch.setattr(service, "tick", broken_tick)
+    service.start()
+    try:
+        assert wait_until(lambda: service.failed_ticks >= 3)
+        assert service.running
+        assert not service.healthy
+    finally:
+        service.stop()
+
+
+def test_telemetry_service_publishes_only_vessels_that_reported():
+    transport = FakeTransport()
+    service = FleetService(4, ingestor=TelemetryIngestor(transport), simulate=False)
+    assert len(service.snapshot().fleet) == 0
+    assert service.snapshot().unreported == 4
+
+    for timestamp in (1000.0, 1060.0):
+        transport.publish(topic_for(3), encode_report(3, 12.5, 80.3, 6.0, 90.0, 60.0, 0, timestamp))
+        snapshot = service.tick()
+
+    assert snapshot.fleet.ids.tolist() == [3]
+    assert snapshot.unreported == 3
+    assert snapshot.stats.vessels == 1
+    assert snapshot.history.timestamps(0).tolist() == [1000.0, 1060.0]
@@ -0,0 +1,26 @@
+import threading
+
+import numpy as np
+
+from fisherlink.history import HistoryBuffer
+from fisherlink.service import HistoryReader
+from fisherlink.simplify import TrackCache
+
+
+def test_cache_sees_appends_to_a_full_ring():
+    history = HistoryBuffer(1, capacity=3, resolution_s=60)
+    for t in (0, 60, 120, 180):
+        history.append(lat=12.0, lon=80.0 + t / 1000, risk=0.1, timestamp=t)
+    cache = TrackCache()
+    reader = HistoryReader(history, threading.Lock())
+    times, risk = cache.risk_series(reader, 0, vessel_id=1)
+    assert cache.risk_series(reader, 0, vessel_id=1)[1] is risk
+
+    # Same sample count and newest timestamp: only the write index moves
+    history.append(lat=12.0, lon=80.5, risk=0.9, timestamp=180)
+
+    times, risk = cache.risk_series(reader, 0, vessel_id=1)
+    assert times.tolist() == [60, 120, 180]
+    assert risk[-1] == np.float32(0.9)
+    assert cache.track(reader, 0, vessel_id=1, zoom=8)[-1, 1] == 80.5
+    assert (cache.hits, cache.misses) == (1, 3)
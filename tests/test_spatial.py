@@ -0,0 +1,26 @@
+import numpy as np
+import shapely
+
+from fisherlink.geo import COASTAL_COORDS
+from fisherlink.spatial import CoastIndex
+
+
+def test_shore_distance_matches_an_exact_point_to_line_distance():
+    index = CoastIndex()
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(11.8, 13.2, 2000)
+    lon = rng.uniform(79.7, 80.8, 2000)
+
+    x, y = index.project(lat, lon)
+    exact = shapely.distance(index.coastline, shapely.points(x, y))
+    # Simplification moves the coastline by at most its tolerance
+    np.testing.assert_allclose(index.shore_distance(lat, lon), exact, atol=0.011)
+
+
+def test_coast_position_runs_from_the_first_vertex_to_the_last():
+    index = CoastIndex()
+    first, last = COASTAL_COORDS[0], COASTAL_COORDS[-1]
+    position = index.coast_position([first[0], last[0]], [first[1], last[1]])
+
+    np.testing.assert_allclose(position, [0.0, 1.0])
+    assert len(index) > len(COASTAL_COORDS)
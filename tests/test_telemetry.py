@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from fisherlink.fleet import ENGINE_WARNING, Vessel, generate_fleet, reported_rows, unreported_fleet
+from fisherlink.telemetry import FakeTransport, TelemetryIngestor, encode_report, topic_for
+
+
+@pytest.fixture
+def fleet():
+    return generate_fleet(5, seed=1)
+
+
+@pytest.fixture
+def transport():
+    return FakeTransport()
+
+
+def publish(transport, vessel_id, lat=13.0, lon=80.5, speed=6.0, heading=90.0, fuel_level=60.0,
+            engine_status=0, timestamp=None):
+    payload = encode_report(vessel_id, lat, lon, speed, heading, fuel_level, engine_status, timestamp)
+    transport.publish(topic_for(vessel_id), payload)
+
+
+def test_apply_writes_the_newest_report(fleet, transport):
+    ingestor = TelemetryIngestor(transport)
+    now = fleet.last_update.max()
+    publish(transport, 3, lat=13.1, timestamp=now + 1)
+    publish(transport, 3, lat=13.2, engine_status=ENGINE_WARNING, timestamp=now + 2)
+
+    rows = ingestor.apply(fleet)
+
+    assert rows.tolist() == [2]
+    assert fleet.lat[2] == pytest.approx(13.2)
+    assert fleet.last_update[2] == now + 2
+    assert Vessel(fleet, 2)["engine_status"] == "Warning"
+    assert ingestor.received == 2
+    assert ingestor.applied == 1
+
+
+def test_out_of_order_report_is_stale(fleet, transport):
+    ingestor = TelemetryIngestor(transport)
+    publish(transport, 1, timestamp=fleet.last_update[0] - 10)
+
+    assert not len(ingestor.apply(fleet))
+    assert ingestor.stale == 1
+
+
+def test_unknown_vessel_is_counted(fleet, transport):
+    ingestor = TelemetryIngestor(transport)
+    publish(transport, 99)
+
+    assert not len(ingestor.apply(fleet))
+    assert ingestor.unknown == 1
+
+
+@pytest.mark.parametrize("field, value", [
+    ("lat", float("nan")),
+    ("lat", 91.0),
+    ("lon", float("inf")),
+    ("speed", -1.0),
+    ("heading", 400.0),
+    ("fuel_level", float("nan")),
+    ("engine_status", 7),
+])
+def test_invalid_report_is_rejected(fleet, transport, field, value):
+    ingestor = TelemetryIngestor(transport)
+    before = fleet.lat.copy()
+    publish(transport, 2, **{field: value})
+
+    assert not len(ingestor.apply(fleet))
+    assert ingestor.malformed == 1
+    np.testing.assert_array_equal(fleet.lat, before)
+    dict(Vessel(fleet, 1))
+
+
+def test_wrong_size_payload_is_malformed(fleet, transport):
+    ingestor = TelemetryIngestor(transport)
+    transport.publish(topic_for(1), b"short")
+    publish(transport, 1)
+
+    assert ingestor.apply(fleet).tolist() == [0]
+    assert ingestor.malformed == 1
+
+
+def test_drop_policy_counts_overflow(transport):
+    ingestor = TelemetryIngestor(transport, max_queue=2, policy="drop")
+    for vessel_id in range(1, 5):
+        publish(transport, vessel_id)
+
+    assert ingestor.pending() == 2
+    assert ingestor.dropped == 2
+
+
+def test_operation_time_counts_from_the_first_report(transport):
+    fleet = unreported_fleet(3)
+    ingestor = TelemetryIngestor(transport)
+    assert not len(reported_rows(fleet))
+
+    publish(transport, 2, timestamp=1000.0)
+    ingestor.apply(fleet)
+    publish(transport, 2, timestamp=1000.0 + 5400)
+    ingestor.apply(fleet)
+
+    assert reported_rows(fleet).tolist() == [1]
+    assert fleet.operation_time[1] == pytest.approx(1.5)
+    assert np.isnan(fleet.lat[[0, 2]]).all()